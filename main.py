@@ -1,40 +1,327 @@
 from module.comparison import DataStructureComparison
+from module.btree import BTree
+from module.concurrent_btree import ConcurrentBTree
 import time
 import os
+import tracemalloc
 from module.result_exporter import ResultExporter
+from module.workload import WORKLOADS, KEY_CHOOSERS
 
-def run_comparison(file_path, operations=1000, concurrent=False, max_workers=4):
+def run_comparison(file_path, operations=1000, concurrent=False, max_workers=4, btree_class=BTree,
+                   btree_degree=3, columnar=False, measure_memory=False, chunk_size=None, lazy=False,
+                   export=True):
     print(f"\nRunning comparison with dataset: {os.path.basename(file_path)}")
     print("=" * 50)
     
+    if measure_memory:
+        # Tracing slows every allocation, so timings from this run are not comparable
+        print("Memory tracing enabled: operation timings will be inflated")
+        tracemalloc.start()
+
     start_time = time.time()
-    comparison = DataStructureComparison()
+    comparison = DataStructureComparison(btree_class, btree_degree=btree_degree, columnar=columnar, lazy=lazy)
     
     # Load data
     print("Loading data...")
-    comparison.load_data(file_path)
+    comparison.load_data(file_path, chunk_size=chunk_size)
     load_time = time.time() - start_time
     print(f"Data loading time: {load_time:.2f} seconds")
+
+    memory_info = None
+    if measure_memory:
+        print("\nMeasuring structure memory...")
+        memory_info = {"structures": comparison.measure_memory()}
+        load_phase = comparison.memory_phases.get('load')
+        if load_phase:
+            # Traced allocations: the number to compare between columnar, lazy and dict records
+            print(f"Traced load memory: {load_phase['current_bytes'] / 1024 / 1024:.2f} MB "
+                  f"(peak {load_phase['peak_bytes'] / 1024 / 1024:.2f} MB)")
+        for name, memory in memory_info["structures"].items():
+            print(f"{name}: {memory['total_bytes'] / 1024 / 1024:.2f} MB")
     
     # Run benchmarks
     print("\nRunning benchmarks...")
     results = comparison.benchmark_operations(operations, concurrent, max_workers)
+
+    if measure_memory:
+        memory_info["phases"] = comparison.memory_phases
+        tracemalloc.stop()
+    if not export:
+        comparison.close()
+        return results
     
     # Export results
     exporter = ResultExporter()
     dataset_info = {
         "file_path": file_path,
         "size": len(comparison.array_data),
-        "fields": comparison.data_columns
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
     }
     benchmark_config = {
         "concurrent": concurrent,
         "operations": operations,
-        "max_workers": max_workers
+        "max_workers": max_workers,
+        "btree_impl": btree_class.__name__,
+        "btree_degree": btree_degree,
+        "columnar": columnar,
+        "lazy": lazy,
+        "measure_memory": measure_memory
     }
-    result_file = exporter.export_benchmark_results(dataset_info, benchmark_config, results)
+    structure_info = comparison.structure_info()
+    if 'indexed_array' in structure_info:
+        index_info = structure_info['indexed_array']
+        print(f"\nHash index memory: {index_info['index_memory_bytes'] / 1024 / 1024:.2f} MB "
+              f"({index_info['index_overhead_ratio']:.2f}x the array slots)")
+    if 'records' in structure_info:
+        record_info = structure_info['records']
+        print(f"Columnar records: {record_info['columnar_bytes'] / 1024 / 1024:.2f} MB vs "
+              f"{record_info['dict_bytes'] / 1024 / 1024:.2f} MB as dicts, "
+              f"{record_info['saved_bytes'] / 1024 / 1024:.2f} MB saved ({record_info['saved_ratio']:.0%}), "
+              f"interned columns: {', '.join(record_info['pooled_columns']) or 'none'}")
+    if 'lazy_records' in structure_info:
+        record_info = structure_info['lazy_records']
+        print(f"Lazy records: {record_info['file_bytes'] / 1024 / 1024:.2f} MB mapped, "
+              f"{record_info['added_records']} added records in memory")
+    result_file = exporter.export_benchmark_results(dataset_info, benchmark_config, results, structure_info,
+                                                    memory_info, comparison.run_stats)
     print(f"\nResults exported to: {result_file}")
     
+    comparison.close()
+    return results
+
+def run_batch_comparison(file_path, operations=1000, batch_sizes=(1, 10, 100, 1000)):
+    print(f"\nRunning batch comparison with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    results = comparison.benchmark_batch_operations(operations, batch_sizes)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "operations": operations,
+        "batch_sizes": batch_sizes
+    }
+    result_file = exporter.export_batch_results(dataset_info, benchmark_config, results)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
+    return results
+
+def get_batch_options():
+    """Get batch benchmark configuration from user"""
+    operations = 1000
+    batch_sizes = (1, 10, 100, 1000)
+    try:
+        ops = int(input("Enter number of keys per batch size (default=1000): ") or "1000")
+        if ops > 0:
+            operations = ops
+    except ValueError:
+        print("Using default value of 1000 keys")
+    try:
+        sizes = input("Enter batch sizes separated by commas (default=1,10,100,1000): ")
+        if sizes.strip():
+            batch_sizes = tuple(int(size) for size in sizes.split(",") if int(size) > 0)
+    except ValueError:
+        print("Using default batch sizes")
+    return operations, batch_sizes
+
+def run_degree_sweep(file_path, operations=1000, degrees=(2, 3, 4, 8, 16, 32, 64, 128)):
+    print(f"\nRunning B-tree degree sweep with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    sweep = comparison.benchmark_degree_sweep(degrees, operations)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "operations": operations,
+        "degrees": degrees
+    }
+    result_file = exporter.export_degree_sweep_results(dataset_info, benchmark_config, sweep)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
+    return sweep
+
+def run_paged_comparison(file_path, operations=1000, cache_pages=256, page_size=4096):
+    print(f"\nRunning paged B-tree benchmark with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    results, cache_info = comparison.benchmark_paged_btree(operations, cache_pages, page_size)
+
+    print("\nPage cache statistics:")
+    for name, stats in cache_info.items():
+        hit_ratio = stats["hits"] / (stats["hits"] + stats["misses"]) if stats["hits"] + stats["misses"] else 0
+        print(f"{name}: hit ratio {hit_ratio:.2%}, {stats['page_reads']} page reads, "
+              f"{stats['page_writes']} page writes, file {stats['file_bytes'] / 1024 / 1024:.2f} MB")
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "concurrent": False,
+        "mode": "paged",
+        "operations": operations,
+        "btree_degree": comparison.btree.t,
+        "cache_pages": cache_pages,
+        "page_size": page_size
+    }
+    exporter.export_benchmark_results(dataset_info, benchmark_config, results, cache_info)
+
+    comparison.close()
+    return results
+
+def run_worker_scaling(file_path, operations=2000, worker_counts=(1, 2, 4, 8)):
+    print(f"\nRunning worker scaling benchmark with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    mix = {'search': 0.7, 'insert': 0.1, 'update': 0.1, 'delete': 0.1}
+    results = comparison.benchmark_worker_scaling(worker_counts, operations, mix)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "operations": operations,
+        "worker_counts": worker_counts,
+        "mix": mix
+    }
+    result_file = exporter.export_scaling_results(dataset_info, benchmark_config, results)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
+    return results
+
+def run_sharded_comparison(file_path, operations=1000, shard_counts=(1, 2, 4), batch_size=100):
+    print(f"\nRunning sharded engine comparison with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    results = comparison.benchmark_sharded(shard_counts, operations, batch_size)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "operations": operations,
+        "shard_counts": shard_counts,
+        "batch_size": batch_size
+    }
+    result_file = exporter.export_sharding_results(dataset_info, benchmark_config, results)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
+    return results
+
+def run_open_loop(file_path, rates=(1000, 2000, 5000, 10000, 20000, 50000, 100000), duration=1.0,
+                  arrival='poisson', operation='search'):
+    print(f"\nRunning open-loop benchmark with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    results = comparison.benchmark_open_loop(rates, duration, arrival, operation)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "rates": rates,
+        "duration": duration,
+        "arrival": arrival,
+        "operation": operation
+    }
+    result_file = exporter.export_open_loop_results(dataset_info, benchmark_config, results)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
+    return results
+
+def run_workload(file_path, workload='read_mostly', distribution='zipfian', operations=1000, seed=0):
+    print(f"\nRunning workload {workload} with dataset: {os.path.basename(file_path)}")
+    print("=" * 50)
+
+    comparison = DataStructureComparison()
+
+    print("Loading data...")
+    comparison.load_data(file_path)
+
+    results = comparison.benchmark_workload(workload, distribution, operations, seed)
+
+    exporter = ResultExporter()
+    dataset_info = {
+        "file_path": file_path,
+        "size": len(comparison.array_data),
+        "fields": comparison.data_columns,
+        "load_stats": comparison.load_stats
+    }
+    benchmark_config = {
+        "concurrent": False,
+        "mode": f"workload_{workload}_{distribution}",
+        "operations": operations,
+        "workload": workload,
+        "mix": WORKLOADS.get(workload, workload),
+        "distribution": distribution,
+        "seed": seed
+    }
+    result_file = exporter.export_benchmark_results(dataset_info, benchmark_config, results)
+    print(f"\nResults exported to: {result_file}")
+
+    comparison.close()
     return results
 
 def select_dataset():
@@ -141,13 +428,14 @@ def direct_test():
                 for field, val in value.items():
                     print(f"{field}: {val}")
                 
+                stored_value = comparison.store_record(value)
                 print("\nPerforming insert operation...")
                 start_time = time.perf_counter()
-                comparison.array_insert(key, value)
+                comparison.array_insert(key, stored_value)
                 array_time = time.perf_counter() - start_time
                 
                 start_time = time.perf_counter()
-                comparison.btree.insert(key, value)
+                comparison.btree.insert(key, stored_value)
                 btree_time = time.perf_counter() - start_time
                 
                 results = {
@@ -177,13 +465,14 @@ def direct_test():
                 for field, val in new_value.items():
                     print(f"{field}: {val}")
                 
+                stored_value = comparison.store_record(new_value)
                 print("\nPerforming update operation...")
                 start_time = time.perf_counter()
-                success_array = comparison.array_update(key, new_value)
+                success_array = comparison.array_update(key, stored_value)
                 array_time = time.perf_counter() - start_time
                 
                 start_time = time.perf_counter()
-                success_btree = comparison.btree.update(key, new_value)
+                success_btree = comparison.btree.update(key, stored_value)
                 btree_time = time.perf_counter() - start_time
                 
                 results = {
@@ -251,6 +540,10 @@ def direct_test():
                 btree_result = comparison.btree.search(key)
                 btree_time = time.perf_counter() - start_time
                 
+                # Records are only materialized once the timing is done
+                array_result = comparison.read_record(array_result)
+                btree_result = comparison.read_record(btree_result)
+                
                 results = {
                     "array_time": array_time,
                     "btree_time": btree_time,
@@ -295,10 +588,17 @@ def main():
         print("\n=== Data Structure Comparison Tool ===")
         print("1. Run Benchmark")
         print("2. Direct Test")
-        print("3. Exit")
+        print("3. Batch Benchmark")
+        print("4. B-tree Degree Sweep")
+        print("5. Paged B-tree Benchmark")
+        print("6. B-tree Worker Scaling")
+        print("7. Sharded Engine Benchmark")
+        print("8. Open-loop Rate Sweep")
+        print("9. Workload Mix (YCSB-style)")
+        print("10. Exit")
         
         try:
-            choice = int(input("\nEnter your choice (1-3): "))
+            choice = int(input("\nEnter your choice (1-10): "))
             
             if choice == 1:
                 # Select dataset
@@ -306,14 +606,100 @@ def main():
                 
                 # Get benchmark options
                 concurrent, max_workers, operations = get_benchmark_options()
+                measure_memory = input("Measure memory footprint (slows the run)? (y/N): ").strip().lower() == 'y'
+                try:
+                    chunk_size = int(input("Stream the CSV in chunks of N rows (press Enter to parse it whole): ")
+                                     or "0") or None
+                except ValueError:
+                    print("Invalid input. Parsing the whole file.")
+                    chunk_size = None
                 
-                # Run benchmark
-                results = run_comparison(file_path, operations, concurrent, max_workers)
+                # Run benchmark; concurrent runs use the latched B-tree so it needs no global lock
+                btree_class = ConcurrentBTree if concurrent else BTree
+                results = run_comparison(file_path, operations, concurrent, max_workers, btree_class,
+                                         measure_memory=measure_memory, chunk_size=chunk_size)
                 
             elif choice == 2:
                 direct_test()
                 
             elif choice == 3:
+                file_path = select_dataset()
+                operations, batch_sizes = get_batch_options()
+                run_batch_comparison(file_path, operations, batch_sizes)
+                
+            elif choice == 4:
+                file_path = select_dataset()
+                try:
+                    operations = int(input("Enter number of operations per degree (default=1000): ") or "1000")
+                except ValueError:
+                    print("Using default value of 1000 operations")
+                    operations = 1000
+                run_degree_sweep(file_path, max(operations, 1))
+                
+            elif choice == 5:
+                file_path = select_dataset()
+                try:
+                    operations = int(input("Enter number of operations (default=1000): ") or "1000")
+                    cache_pages = int(input("Enter page cache size in pages (default=256): ") or "256")
+                except ValueError:
+                    print("Using defaults of 1000 operations and 256 cached pages")
+                    operations, cache_pages = 1000, 256
+                run_paged_comparison(file_path, max(operations, 1), max(cache_pages, 1))
+                
+            elif choice == 6:
+                file_path = select_dataset()
+                try:
+                    operations = int(input("Enter number of operations per run (default=2000): ") or "2000")
+                except ValueError:
+                    print("Using default value of 2000 operations")
+                    operations = 2000
+                run_worker_scaling(file_path, max(operations, 1))
+                
+            elif choice == 7:
+                file_path = select_dataset()
+                try:
+                    operations = int(input("Enter number of operations (default=1000): ") or "1000")
+                    shards = int(input(f"Enter maximum number of shards (default={os.cpu_count() or 4}): ")
+                                 or str(os.cpu_count() or 4))
+                except ValueError:
+                    print("Using defaults of 1000 operations and 4 shards")
+                    operations, shards = 1000, 4
+                shards = max(shards, 1)
+                shard_counts = tuple(n for n in (1, 2, 4, 8, 16, 32) if n < shards) + (shards,)
+                run_sharded_comparison(file_path, max(operations, 1), shard_counts)
+                
+            elif choice == 8:
+                file_path = select_dataset()
+                arrival = input("Arrival process, poisson or constant (default=poisson): ").strip().lower() or "poisson"
+                if arrival not in ("poisson", "constant"):
+                    print("Using poisson arrivals")
+                    arrival = "poisson"
+                operation = input("Operation, search or update (default=search): ").strip().lower() or "search"
+                if operation not in ("search", "update"):
+                    print("Using search operations")
+                    operation = "search"
+                run_open_loop(file_path, arrival=arrival, operation=operation)
+                
+            elif choice == 9:
+                file_path = select_dataset()
+                workload = input(f"Workload ({', '.join(WORKLOADS)}; default=read_mostly): ").strip() or "read_mostly"
+                if workload not in WORKLOADS:
+                    print("Using read_mostly workload")
+                    workload = "read_mostly"
+                distribution = input(f"Key distribution ({', '.join(KEY_CHOOSERS)}; default=zipfian): ").strip() \
+                    or "zipfian"
+                if distribution not in KEY_CHOOSERS:
+                    print("Using zipfian keys")
+                    distribution = "zipfian"
+                try:
+                    operations = int(input("Enter number of operations (default=1000): ") or "1000")
+                    seed = int(input("Enter random seed (default=0): ") or "0")
+                except ValueError:
+                    print("Using defaults of 1000 operations and seed 0")
+                    operations, seed = 1000, 0
+                run_workload(file_path, workload, distribution, max(operations, 1), seed)
+                
+            elif choice == 10:
                 print("\nGoodbye!")
                 break
                 
@@ -0,0 +1,268 @@
+from bisect import bisect_left, bisect_right
+
+class BPlusLeaf:
+    __slots__ = ('keys', 'values', 'next')
+    leaf = True
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.next = None  # Right sibling, for in-order scans
+
+class BPlusInternal:
+    __slots__ = ('keys', 'children')
+    leaf = False
+
+    def __init__(self):
+        self.keys = []  # keys[i] is the smallest key under children[i + 1]
+        self.children = []
+
+class BPlusTree:
+    """B+ tree: values live only in the leaves, which are linked left to right"""
+
+    def __init__(self, t=3):  # t is the minimum degree
+        self.root = BPlusLeaf()
+        self.t = t
+
+    def _find_leaf(self, key):
+        node = self.root
+        while not node.leaf:
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def search(self, key):
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return None
+
+    def update(self, key, new_value):
+        """Update value for existing key"""
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            leaf.values[i] = new_value
+            return True
+        return False
+
+    def range_scan(self, lo=None, hi=None):
+        """Yield (key, value) pairs with lo <= key <= hi in key order
+
+        Either bound may be None for an open range. Only the first leaf is
+        found by descent; the rest are reached through the sibling links.
+        """
+        node = self.root
+        if lo is None:
+            while not node.leaf:
+                node = node.children[0]
+            i = 0
+        else:
+            while not node.leaf:
+                node = node.children[bisect_left(node.keys, lo)]
+            i = bisect_left(node.keys, lo)
+
+        while node is not None:
+            keys = node.keys
+            values = node.values
+            while i < len(keys):
+                key = keys[i]
+                if hi is not None and key > hi:
+                    return
+                yield key, values[i]
+                i += 1
+            node = node.next
+            i = 0
+
+    def insert(self, key, value):
+        max_keys = 2 * self.t - 1
+        node = self.root
+        if len(node.keys) == max_keys:
+            new_root = BPlusInternal()
+            new_root.children.append(node)
+            self._split_child(new_root, 0)
+            self.root = new_root
+            node = new_root
+
+        # Split full children on the way down so the leaf always has room
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            if len(node.children[i].keys) == max_keys:
+                self._split_child(node, i)
+                if key >= node.keys[i]:
+                    i += 1
+            node = node.children[i]
+
+        i = bisect_right(node.keys, key)
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+
+    def _split_child(self, parent, index):
+        t = self.t
+        child = parent.children[index]
+
+        if child.leaf:
+            new_node = BPlusLeaf()
+            new_node.keys = child.keys[t:]
+            new_node.values = child.values[t:]
+            del child.keys[t:]
+            del child.values[t:]
+            new_node.next = child.next
+            child.next = new_node
+            separator = new_node.keys[0]
+        else:
+            new_node = BPlusInternal()
+            separator = child.keys[t - 1]
+            new_node.keys = child.keys[t:]
+            new_node.children = child.children[t:]
+            del child.keys[t - 1:]
+            del child.children[t:]
+
+        parent.keys.insert(index, separator)
+        parent.children.insert(index + 1, new_node)
+
+    def delete(self, key):
+        """Delete key from the tree, returns True if it was found"""
+        t = self.t
+        node = self.root
+
+        # Top up each child to at least t keys before descending into it
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            if len(node.children[i].keys) < t:
+                self._fill(node, i)
+                i = bisect_right(node.keys, key)
+            node = node.children[i]
+
+        found = False
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            del node.keys[i]
+            del node.values[i]
+            found = True
+
+        if not self.root.leaf and len(self.root.keys) == 0:
+            self.root = self.root.children[0]
+        return found
+
+    def _fill(self, node, index):
+        children = node.children
+        if index != 0 and len(children[index - 1].keys) >= self.t:
+            self._borrow_from_prev(node, index)
+        elif index != len(node.keys) and len(children[index + 1].keys) >= self.t:
+            self._borrow_from_next(node, index)
+        elif index != len(node.keys):
+            self._merge(node, index)
+        else:
+            self._merge(node, index - 1)
+
+    def _borrow_from_prev(self, node, index):
+        child = node.children[index]
+        sibling = node.children[index - 1]
+
+        if child.leaf:
+            child.keys.insert(0, sibling.keys.pop())
+            child.values.insert(0, sibling.values.pop())
+            node.keys[index - 1] = child.keys[0]
+        else:
+            child.keys.insert(0, node.keys[index - 1])
+            child.children.insert(0, sibling.children.pop())
+            node.keys[index - 1] = sibling.keys.pop()
+
+    def _borrow_from_next(self, node, index):
+        child = node.children[index]
+        sibling = node.children[index + 1]
+
+        if child.leaf:
+            child.keys.append(sibling.keys.pop(0))
+            child.values.append(sibling.values.pop(0))
+            node.keys[index] = sibling.keys[0]
+        else:
+            child.keys.append(node.keys[index])
+            child.children.append(sibling.children.pop(0))
+            node.keys[index] = sibling.keys.pop(0)
+
+    def _merge(self, node, index):
+        child = node.children[index]
+        sibling = node.children[index + 1]
+
+        if child.leaf:
+            child.keys.extend(sibling.keys)
+            child.values.extend(sibling.values)
+            child.next = sibling.next
+        else:
+            child.keys.append(node.keys[index])
+            child.keys.extend(sibling.keys)
+            child.children.extend(sibling.children)
+
+        del node.keys[index]
+        del node.children[index + 1]
+
+    def bulk_load(self, sorted_pairs, fill_factor=0.7):
+        """Replace the tree contents with (key, value) pairs, built bottom-up
+        Args:
+            sorted_pairs: Iterable of (key, value) pairs, ideally sorted by key.
+                Unsorted input is sorted first.
+            fill_factor: Fraction of the maximum 2t-1 keys to put in each node
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be in (0, 1]")
+
+        keys = []
+        values = []
+        for key, value in sorted_pairs:
+            keys.append(key)
+            values.append(value)
+
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = [keys[i] for i in order]
+            values = [values[i] for i in order]
+
+        t = self.t
+        per_node = max(t - 1, min(2 * t - 1, int(fill_factor * (2 * t - 1))))
+
+        # Pack and link the leaves
+        count = self._bulk_group_count(len(keys), per_node, t - 1, 2 * t - 1)
+        nodes = []
+        mins = []  # Smallest key under each node, used as separators above it
+        pos = 0
+        for size in self._bulk_group_sizes(len(keys), count):
+            leaf = BPlusLeaf()
+            leaf.keys = keys[pos:pos + size]
+            leaf.values = values[pos:pos + size]
+            if nodes:
+                nodes[-1].next = leaf
+            nodes.append(leaf)
+            mins.append(keys[pos] if size else None)
+            pos += size
+
+        # Group children into internal nodes until a single root remains
+        while len(nodes) > 1:
+            count = self._bulk_group_count(len(nodes), per_node + 1, t, 2 * t)
+            parents = []
+            parent_mins = []
+            pos = 0
+            for size in self._bulk_group_sizes(len(nodes), count):
+                parent = BPlusInternal()
+                parent.children = nodes[pos:pos + size]
+                parent.keys = mins[pos + 1:pos + size]
+                parents.append(parent)
+                parent_mins.append(mins[pos])
+                pos += size
+            nodes, mins = parents, parent_mins
+
+        self.root = nodes[0]
+
+    def _bulk_group_count(self, n, per_group, fewest_per_group, most_per_group):
+        """Number of groups to split n items into, keeping each group within bounds"""
+        if n <= most_per_group:
+            return 1
+        count = n // per_group
+        fewest = -(-n // most_per_group)
+        most = n // fewest_per_group
+        return min(max(count, fewest), most)
+
+    def _bulk_group_sizes(self, n, count):
+        base, extra = divmod(n, count)
+        return [base + 1 if j < extra else base for j in range(count)]
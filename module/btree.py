@@ -1,4 +1,10 @@
+import sys
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
 class BTreeNode:
+    __slots__ = ('leaf', 'keys', 'children', 'values')
+
     def __init__(self, leaf=True):
         self.leaf = leaf
         self.keys = []
@@ -6,148 +12,482 @@ class BTreeNode:
         self.values = []  # Store actual data values
 
 class BTree:
+    node_class = BTreeNode  # Subclasses may use a node type with extra slots
+
     def __init__(self, t=3):  # t is the minimum degree
-        self.root = BTreeNode(True)
+        self.root = self.node_class(True)
         self.t = t
 
+    def stats(self):
+        """Shape and size of the tree: height, node and key counts, and memory
+        used by the nodes and their key/value/child lists (not the records)"""
+        height = 1
+        nodes = 0
+        keys = 0
+        memory_bytes = 0
+        level = [self.root]
+        while level:
+            next_level = []
+            for node in level:
+                nodes += 1
+                keys += len(node.keys)
+                memory_bytes += (sys.getsizeof(node) + sys.getsizeof(node.keys)
+                                 + sys.getsizeof(node.values) + sys.getsizeof(node.children))
+                next_level.extend(node.children)
+            if next_level:
+                height += 1
+            level = next_level
+        return {
+            "height": height,
+            "nodes": nodes,
+            "keys": keys,
+            "memory_bytes": memory_bytes
+        }
+
     def search(self, key):
-        return self._search(self.root, key)
-
-    def _search(self, node, key):
-        i = 0
-        while i < len(node.keys) and key > node.keys[i]:
-            i += 1
-        
-        if i < len(node.keys) and key == node.keys[i]:
-            return node.values[i]
-        
-        if node.leaf:
-            return None
-        
-        return self._search(node.children[i], key)
+        node = self.root
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                return node.values[i]
+            if node.leaf:
+                return None
+            node = node.children[i]
 
     def update(self, key, new_value):
         """Update value for existing key"""
-        return self._update(self.root, key, new_value)
-
-    def _update(self, node, key, new_value):
-        i = 0
-        while i < len(node.keys) and key > node.keys[i]:
-            i += 1
-        
-        if i < len(node.keys) and key == node.keys[i]:
-            node.values[i] = new_value
-            return True
-        
-        if node.leaf:
-            return False
-        
-        return self._update(node.children[i], key, new_value)
+        node = self.root
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                node.values[i] = new_value
+                return True
+            if node.leaf:
+                return False
+            node = node.children[i]
+
+    def search_many(self, keys):
+        """Look up many keys in one pass, returns values (or None) in input order
+
+        Keys are visited in sorted order and each lookup resumes from the
+        deepest node on the previous path whose key range still covers it,
+        so shared path prefixes are only walked once.
+        """
+        found = {}
+        # Stack frames are (node, lower, upper): exclusive bounds of the keys under node
+        stack = [(self.root, None, None)]
+        for key in sorted(set(keys)):
+            while len(stack) > 1 and not self._covers(stack[-1], key):
+                stack.pop()
+            node, lower, upper = stack[-1]
+            while True:
+                node_keys = node.keys
+                i = bisect_left(node_keys, key)
+                if i < len(node_keys) and node_keys[i] == key:
+                    found[key] = node.values[i]
+                    break
+                if node.leaf:
+                    break
+                if i > 0:
+                    lower = node_keys[i - 1]
+                if i < len(node_keys):
+                    upper = node_keys[i]
+                node = node.children[i]
+                stack.append((node, lower, upper))
+        return [found.get(key) for key in keys]
+
+    @staticmethod
+    def _covers(frame, key):
+        _, lower, upper = frame
+        return (lower is None or key > lower) and (upper is None or key < upper)
+
+    def min(self):
+        """Smallest (key, value) pair, or None if the tree is empty"""
+        node = self.root
+        while not node.leaf:
+            node = node.children[0]
+        if not node.keys:
+            return None
+        return node.keys[0], node.values[0]
+
+    def max(self):
+        """Largest (key, value) pair, or None if the tree is empty"""
+        node = self.root
+        while not node.leaf:
+            node = node.children[-1]
+        if not node.keys:
+            return None
+        return node.keys[-1], node.values[-1]
+
+    def successor(self, key):
+        """First (key, value) pair with a key greater than key, or None"""
+        return next(self._iter_forward(key, inclusive=False), None)
+
+    def predecessor(self, key):
+        """Last (key, value) pair with a key less than key, or None"""
+        return next(self._iter_backward(key, inclusive=False), None)
+
+    def items(self, lo=None, hi=None):
+        """Lazily yield (key, value) pairs with lo <= key <= hi in key order
+
+        Either bound may be None for an open range.
+        """
+        for key, value in self._iter_forward(lo, inclusive=True):
+            if hi is not None and key > hi:
+                return
+            yield key, value
+
+    def count_range(self, lo=None, hi=None):
+        """Number of keys with lo <= key <= hi"""
+        count = 0
+        for _ in self.items(lo, hi):
+            count += 1
+        return count
+
+    def _iter_forward(self, start, inclusive):
+        """In-order iterator from start, using one descent and an explicit stack
+
+        Each stack frame is [node, i]: the next key to yield from node is
+        keys[i], once everything in children[i] has been yielded.
+        """
+        stack = []
+        node = self.root
+        while True:
+            if start is None:
+                i = 0
+            elif inclusive:
+                i = bisect_left(node.keys, start)
+            else:
+                i = bisect_right(node.keys, start)
+            stack.append([node, i])
+            if node.leaf:
+                break
+            node = node.children[i]
+
+        while stack:
+            frame = stack[-1]
+            node, i = frame
+            if i >= len(node.keys):
+                stack.pop()
+                continue
+            frame[1] = i + 1
+            yield node.keys[i], node.values[i]
+            if not node.leaf:
+                child = node.children[i + 1]
+                while True:
+                    stack.append([child, 0])
+                    if child.leaf:
+                        break
+                    child = child.children[0]
+
+    def _iter_backward(self, start, inclusive):
+        """Reverse in-order iterator from start, mirroring _iter_forward
+
+        Each stack frame is [node, i]: the next key to yield from node is
+        keys[i - 1], once everything in children[i] has been yielded.
+        """
+        stack = []
+        node = self.root
+        while True:
+            if start is None:
+                i = len(node.keys)
+            elif inclusive:
+                i = bisect_right(node.keys, start)
+            else:
+                i = bisect_left(node.keys, start)
+            stack.append([node, i])
+            if node.leaf:
+                break
+            node = node.children[i]
+
+        while stack:
+            frame = stack[-1]
+            node, i = frame
+            if i == 0:
+                stack.pop()
+                continue
+            i -= 1
+            frame[1] = i
+            yield node.keys[i], node.values[i]
+            if not node.leaf:
+                child = node.children[i]
+                while True:
+                    stack.append([child, len(child.keys)])
+                    if child.leaf:
+                        break
+                    child = child.children[-1]
 
     def insert(self, key, value):
-        root = self.root
-        if len(root.keys) == (2 * self.t) - 1:
-            new_root = BTreeNode(False)
-            new_root.children.append(root)
+        max_keys = 2 * self.t - 1
+        node = self.root
+        if len(node.keys) == max_keys:
+            new_root = self.node_class(False)
+            new_root.children.append(node)
             self._split_child(new_root, 0)
             self.root = new_root
-            self._insert_non_full(new_root, key, value)
-        else:
-            self._insert_non_full(root, key, value)
-
-    def _insert_non_full(self, node, key, value):
-        i = len(node.keys) - 1
-        
-        if node.leaf:
-            while i >= 0 and key < node.keys[i]:
-                i -= 1
-            node.keys.insert(i + 1, key)
-            node.values.insert(i + 1, value)
-        else:
-            while i >= 0 and key < node.keys[i]:
-                i -= 1
-            i += 1
-            
-            if len(node.children[i].keys) == (2 * self.t) - 1:
+            node = new_root
+
+        # Split full children on the way down so the leaf always has room
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            if len(node.children[i].keys) == max_keys:
                 self._split_child(node, i)
                 if key > node.keys[i]:
                     i += 1
-            
-            self._insert_non_full(node.children[i], key, value)
+            node = node.children[i]
+
+        i = bisect_right(node.keys, key)
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+
+    def insert_many(self, pairs):
+        """Insert many (key, value) pairs in one pass over the tree
+
+        Pairs are inserted in key order, each descent resuming from the deepest
+        non-full node on the previous path that covers the key. An empty tree
+        is bulk-loaded instead.
+        """
+        pairs = sorted(pairs, key=itemgetter(0))
+        if not pairs:
+            return
+        if self.root.leaf and not self.root.keys:
+            self.bulk_load(pairs)
+            return
+
+        max_keys = 2 * self.t - 1
+        stack = [(self.root, None, None)]
+        for key, value in pairs:
+            while stack and (len(stack[-1][0].keys) == max_keys or not self._covers(stack[-1], key)):
+                stack.pop()
+            if not stack:
+                if len(self.root.keys) == max_keys:
+                    new_root = self.node_class(False)
+                    new_root.children.append(self.root)
+                    self._split_child(new_root, 0)
+                    self.root = new_root
+                stack.append((self.root, None, None))
+
+            node, lower, upper = stack[-1]
+            while not node.leaf:
+                i = bisect_right(node.keys, key)
+                if len(node.children[i].keys) == max_keys:
+                    self._split_child(node, i)
+                    if key > node.keys[i]:
+                        i += 1
+                if i > 0:
+                    lower = node.keys[i - 1]
+                if i < len(node.keys):
+                    upper = node.keys[i]
+                node = node.children[i]
+                stack.append((node, lower, upper))
+
+            i = bisect_right(node.keys, key)
+            node.keys.insert(i, key)
+            node.values.insert(i, value)
+
+    def bulk_load(self, sorted_pairs, fill_factor=0.7):
+        """Replace the tree contents with (key, value) pairs, built bottom-up
+        Args:
+            sorted_pairs: Iterable of (key, value) pairs, ideally sorted by key.
+                Unsorted input is sorted first.
+            fill_factor: Fraction of the maximum 2t-1 keys to put in each node,
+                leaving slack so later inserts don't split straight away
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be in (0, 1]")
+
+        keys = []
+        values = []
+        for key, value in sorted_pairs:
+            keys.append(key)
+            values.append(value)
+
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = [keys[i] for i in order]
+            values = [values[i] for i in order]
+
+        max_keys = 2 * self.t - 1
+        per_node = max(self.t - 1, min(max_keys, int(fill_factor * max_keys)))
+
+        # Each pass packs one level: the keys between nodes are promoted and
+        # become the keys of the next level up, until a single root remains
+        children = None
+        while True:
+            count = self._bulk_node_count(len(keys), per_node)
+            base, extra = divmod(len(keys) - count + 1, count)
+            nodes = []
+            parent_keys = []
+            parent_values = []
+            pos = 0
+            child_pos = 0
+
+            for j in range(count):
+                size = base + 1 if j < extra else base
+                node = self.node_class(children is None)
+                node.keys = keys[pos:pos + size]
+                node.values = values[pos:pos + size]
+                if children is not None:
+                    node.children = children[child_pos:child_pos + size + 1]
+                    child_pos += size + 1
+                pos += size
+                if j < count - 1:
+                    parent_keys.append(keys[pos])
+                    parent_values.append(values[pos])
+                    pos += 1
+                nodes.append(node)
+
+            if count == 1:
+                self.root = nodes[0]
+                return
+            keys, values, children = parent_keys, parent_values, nodes
+
+    def _bulk_node_count(self, n, per_node):
+        """Number of nodes to spread n keys over, keeping every node within t-1..2t-1 keys"""
+        t = self.t
+        if n <= 2 * t - 1:
+            return 1
+        count = (n + 1) // (per_node + 1)
+        fewest = -(-(n + 1) // (2 * t))
+        most = (n + 1) // t
+        return min(max(count, fewest), most)
 
     def _split_child(self, parent, index):
         t = self.t
         child = parent.children[index]
-        new_node = BTreeNode(child.leaf)
-        
+        new_node = self.node_class(child.leaf)
+
         parent.children.insert(index + 1, new_node)
         parent.keys.insert(index, child.keys[t - 1])
         parent.values.insert(index, child.values[t - 1])
-        
+
         new_node.keys = child.keys[t:]
         new_node.values = child.values[t:]
-        child.keys = child.keys[:t - 1]
-        child.values = child.values[:t - 1]
-        
+        del child.keys[t - 1:]
+        del child.values[t - 1:]
+
         if not child.leaf:
             new_node.children = child.children[t:]
-            child.children = child.children[:t]
+            del child.children[t:]
 
     def delete(self, key):
-        self._delete(self.root, key)
-        if len(self.root.keys) == 0 and not self.root.leaf:
-            self.root = self.root.children[0]
-
-    def _delete(self, node, key):
+        """Delete key from the tree, returns True if it was found"""
         t = self.t
-        i = 0
-        
-        while i < len(node.keys) and key > node.keys[i]:
-            i += 1
-            
-        if i < len(node.keys) and key == node.keys[i]:
-            if node.leaf:
-                node.keys.pop(i)
-                node.values.pop(i)
-            else:
-                self._delete_from_non_leaf(node, i)
-        else:
+        node = self.root
+        found = False
+
+        # Top-down deletion: every child we descend into is first topped up
+        # to at least t keys, so removing from a leaf never needs a fix-up pass
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+
+            if i < len(keys) and keys[i] == key:
+                if node.leaf:
+                    del keys[i]
+                    del node.values[i]
+                    found = True
+                    break
+
+                left = node.children[i]
+                right = node.children[i + 1]
+                if len(left.keys) >= t:
+                    key, node.values[i] = self._get_predecessor(left)
+                    keys[i] = key
+                    node = left
+                elif len(right.keys) >= t:
+                    key, node.values[i] = self._get_successor(right)
+                    keys[i] = key
+                    node = right
+                else:
+                    self._merge(node, i)
+                    node = left
+                continue
+
             if node.leaf:
-                return
-            
+                break
+
             if len(node.children[i].keys) < t:
                 self._fill(node, i)
-                
-            if i > len(node.keys):
-                i -= 1
-                
-            self._delete(node.children[i], key)
-
-    def _delete_from_non_leaf(self, node, index):
-        key = node.keys[index]
-        
-        if len(node.children[index].keys) >= self.t:
-            predecessor = self._get_predecessor(node, index)
-            node.keys[index] = predecessor[0]
-            node.values[index] = predecessor[1]
-            self._delete(node.children[index], predecessor[0])
-        elif len(node.children[index + 1].keys) >= self.t:
-            successor = self._get_successor(node, index)
-            node.keys[index] = successor[0]
-            node.values[index] = successor[1]
-            self._delete(node.children[index + 1], successor[0])
-        else:
-            self._merge(node, index)
-            self._delete(node.children[index], key)
+                if i > len(keys):
+                    i -= 1
+            node = node.children[i]
 
-    def _get_predecessor(self, node, index):
-        current = node.children[index]
+        if len(self.root.keys) == 0 and not self.root.leaf:
+            self.root = self.root.children[0]
+        return found
+
+    def delete_many(self, keys):
+        """Delete many keys in one pass, returns how many were found
+
+        Keys are deleted in sorted order, each descent resuming from the
+        deepest node on the previous path that covers the key and still has
+        at least t keys, as a fresh top-down delete would require.
+        """
+        t = self.t
+        deleted = 0
+        stack = [(self.root, None, None)]
+        for key in sorted(keys):
+            while len(stack) > 1 and (len(stack[-1][0].keys) < t or not self._covers(stack[-1], key)):
+                stack.pop()
+            node, lower, upper = stack[-1]
+
+            while True:
+                node_keys = node.keys
+                i = bisect_left(node_keys, key)
+
+                if i < len(node_keys) and node_keys[i] == key:
+                    if node.leaf:
+                        del node_keys[i]
+                        del node.values[i]
+                        deleted += 1
+                        break
+
+                    left = node.children[i]
+                    right = node.children[i + 1]
+                    if len(left.keys) >= t:
+                        key, node.values[i] = self._get_predecessor(left)
+                        node_keys[i] = key
+                        node = left
+                    elif len(right.keys) >= t:
+                        key, node.values[i] = self._get_successor(right)
+                        node_keys[i] = key
+                        i += 1
+                        node = right
+                    else:
+                        self._merge(node, i)
+                        node = left
+                else:
+                    if node.leaf:
+                        break
+                    if len(node.children[i].keys) < t:
+                        self._fill(node, i)
+                        if i > len(node_keys):
+                            i -= 1
+                    node = node.children[i]
+
+                # node is now children[i] of the previous node
+                if i > 0:
+                    lower = node_keys[i - 1]
+                if i < len(node_keys):
+                    upper = node_keys[i]
+                stack.append((node, lower, upper))
+
+            if len(self.root.keys) == 0 and not self.root.leaf:
+                self.root = self.root.children[0]
+                stack = [(self.root, None, None)]
+        return deleted
+
+    def _get_predecessor(self, node):
+        current = node
         while not current.leaf:
             current = current.children[-1]
         return current.keys[-1], current.values[-1]
 
-    def _get_successor(self, node, index):
-        current = node.children[index + 1]
+    def _get_successor(self, node):
+        current = node
         while not current.leaf:
             current = current.children[0]
         return current.keys[0], current.values[0]
@@ -166,42 +506,42 @@ class BTree:
     def _borrow_from_prev(self, node, index):
         child = node.children[index]
         sibling = node.children[index - 1]
-        
+
         child.keys.insert(0, node.keys[index - 1])
         child.values.insert(0, node.values[index - 1])
-        
+
         if not child.leaf:
             child.children.insert(0, sibling.children.pop())
-            
+
         node.keys[index - 1] = sibling.keys.pop()
         node.values[index - 1] = sibling.values.pop()
 
     def _borrow_from_next(self, node, index):
         child = node.children[index]
         sibling = node.children[index + 1]
-        
+
         child.keys.append(node.keys[index])
         child.values.append(node.values[index])
-        
+
         if not child.leaf:
             child.children.append(sibling.children.pop(0))
-            
+
         node.keys[index] = sibling.keys.pop(0)
         node.values[index] = sibling.values.pop(0)
 
     def _merge(self, node, index):
         child = node.children[index]
         sibling = node.children[index + 1]
-        
+
         child.keys.append(node.keys[index])
         child.values.append(node.values[index])
-        
+
         child.keys.extend(sibling.keys)
         child.values.extend(sibling.values)
-        
+
         if not child.leaf:
             child.children.extend(sibling.children)
-            
-        node.keys.pop(index)
-        node.values.pop(index)
-        node.children.pop(index + 1) 
\ No newline at end of file
+
+        del node.keys[index]
+        del node.values[index]
+        del node.children[index + 1]
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import shutil
+from array import array
+import numpy as np
+
+# Text columns are stored as one UTF-8 blob with values separated by this character
+_TEXT_SEPARATOR = '\x00'
+META_FILE = "meta.json"
+# array.array typecodes of the numeric column kinds
+_TYPECODES = {'int64': 'q', 'float64': 'd'}
+
+def _column_kind(values):
+    """Storage kind of a column of converted values: int64, float64, text or object"""
+    if all(type(v) is int for v in values):
+        return 'int64'
+    if all(type(v) is float for v in values):
+        return 'float64'
+    if all(type(v) is str and _TEXT_SEPARATOR not in v for v in values):
+        return 'text'
+    return 'object'
+
+def write_column_cache(directory, data_columns, columns, meta=None):
+    """Write converted columns to a cache directory, one file per column
+
+    Integer and float columns become .npy arrays, text columns a UTF-8 blob,
+    anything else (mixed types, missing values in text columns) a pickled
+    .npy object array. meta is stored next to them in meta.json.
+    The directory is replaced as a whole, so readers never see a partial cache.
+    """
+    temp_directory = directory + ".tmp"
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+    kinds = []
+    for i, values in enumerate(columns):
+        kind = _column_kind(values)
+        if kind == 'int64':
+            try:
+                np.save(os.path.join(temp_directory, f"{i}.npy"), np.array(values, dtype=np.int64))
+            except OverflowError:
+                kind = 'object'
+        elif kind == 'float64':
+            np.save(os.path.join(temp_directory, f"{i}.npy"), np.array(values, dtype=np.float64))
+        elif kind == 'text':
+            with open(os.path.join(temp_directory, f"{i}.utf8"), 'wb') as f:
+                f.write(_TEXT_SEPARATOR.join(values).encode('utf-8'))
+        if kind == 'object':
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            np.save(os.path.join(temp_directory, f"{i}.npy"), column, allow_pickle=True)
+        kinds.append(kind)
+
+    payload = dict(meta or {})
+    payload.update({
+        "data_columns": list(data_columns),
+        "kinds": kinds,
+        "rows": len(columns[0]) if columns else 0
+    })
+    with open(os.path.join(temp_directory, META_FILE), 'w') as f:
+        json.dump(payload, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+    return directory
+
+def read_column_meta(directory):
+    with open(os.path.join(directory, META_FILE)) as f:
+        return json.load(f)
+
+def read_column_cache(directory, meta=None):
+    """Read a cache written by write_column_cache
+    Returns:
+        Tuple of (meta, columns). Numeric columns are read-only numpy arrays
+        memory-mapped from their .npy files, so no value is read or copied
+        until used; text and object columns are lists of Python values.
+    """
+    meta = meta or read_column_meta(directory)
+    columns = []
+    for i, kind in enumerate(meta["kinds"]):
+        if kind == 'text':
+            with open(os.path.join(directory, f"{i}.utf8"), 'rb') as f:
+                text = f.read().decode('utf-8')
+            columns.append(text.split(_TEXT_SEPARATOR) if meta["rows"] else [])
+        elif kind == 'object':
+            columns.append(np.load(os.path.join(directory, f"{i}.npy"), allow_pickle=True).tolist())
+        else:
+            columns.append(np.load(os.path.join(directory, f"{i}.npy"), mmap_mode='r'))
+    return meta, columns
+
+def typed_array(column):
+    """Copy a numeric column read by read_column_cache into an array.array as raw bytes,
+    without creating a Python object per value"""
+    typed = array(_TYPECODES[column.dtype.name])
+    typed.frombytes(memoryview(column).cast('B'))
+    return typed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CSV datasets to the binary column cache load_data uses")
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+
+    from module.comparison import DataStructureComparison
+    for file_path in args.files:
+        DataStructureComparison().cache_csv(file_path)
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,461 @@
 import time
 import pandas as pd
 from module.btree import BTree
+from module.sorted_array import SortedArray
+from module.indexed_array import IndexedArray
+from module.bplustree import BPlusTree
+from module.paged_btree import PagedBTree
+from module.concurrent_btree import ConcurrentBTree
+from module.sharded_engine import ShardedEngine
+from module.open_loop import OpenLoopDriver
+from module.workload import generate_workload
+from module.latency_histogram import LatencyHistogram
+from module.record_store import ColumnarRecordStore
+from module.lazy_records import LazyRecordStore
+from module.column_cache import META_FILE, write_column_cache, read_column_meta, read_column_cache, typed_array
+from module.memory_usage import deep_sizeof, array_memory, btree_memory
 import concurrent.futures
+import contextlib
+import gc
 import threading
-from module.data_config import generate_record
+import tracemalloc
+import os
+import shutil
+import tempfile
+import hashlib
+import random
+from collections import deque
+from module.data_config import generate_records
+import numpy as np
+
+# Dataset snapshots (binary column caches) written by save_snapshot, in this directory next to the CSV
+SNAPSHOT_DIR = "snapshots"
 
 class DataStructureComparison:
-    def __init__(self):
+    def __init__(self, btree_class=BTree, hash_index=True, btree_degree=3, columnar=False, lazy=False,
+                 seed=0):
+        if columnar and lazy:
+            raise ValueError("Records can be columnar or lazy, not both")
         self.array_data = []
-        self.btree = BTree(t=3)  # t=3 for a 2-3 tree
+        # With columnar=True the structures hold row ids into record_store instead of dicts
+        self.columnar = columnar
+        # With lazy=True they hold line offsets into the memory-mapped CSV instead
+        self.lazy = lazy
+        self.record_store = None
+        self.seed = seed
+        # Test payloads come from one seeded generator, so runs with the same seed match
+        self.record_rng = np.random.default_rng(seed)
+        # btree_class lets benchmarks run against LegacyBTree for comparison
+        self.btree = btree_class(t=btree_degree)  # t=3 by default
+        self.bplustree = BPlusTree(t=btree_degree)  # Same fanout as the B-tree
+        self.sorted_array = SortedArray()
+        # Optional array store with a key -> position hash index
+        self.indexed_array = IndexedArray() if hash_index else None
         self.data_columns = None  # Store column names
         self.array_lock = threading.Lock()  # Lock for array operations
+        self.sorted_array_lock = threading.Lock()  # Lock for sorted array operations
+        self.indexed_array_lock = threading.Lock()  # Lock for indexed array operations
+        self.bplustree_lock = threading.Lock()  # Lock for B+ tree operations
+        self.btree_lock = threading.Lock()  # Only used when the B-tree is not thread-safe
+        self.load_stats = None  # Filled in by load_data
+        self.file_path = None  # Dataset given to load_data
+        self.run_stats = None  # Setup vs operation cost of the last benchmark run
+        # tracemalloc peaks per phase, only recorded while tracemalloc is tracing
+        self.memory_phases = {}
+        self._memory_phase = None
+
+    def load_data(self, file_path, use_snapshot=True, chunk_size=None):
+        """Load data from CSV file, or from its snapshot when one is up to date
+        Args:
+            use_snapshot: Reload from a snapshot newer than the CSV when there is one,
+                and save a snapshot after parsing the CSV otherwise
+            chunk_size: Stream the CSV this many rows at a time instead of parsing it whole.
+                Snapshots are neither read nor written then, as writing one would hold
+                every column in memory at once.
+        Returns:
+            Dictionary with load statistics (rows, timings and rows per second)
+        """
+        self.file_path = file_path
+        if self.lazy:
+            return self._load_lazy(file_path)
+        if chunk_size:
+            return self._load_csv_chunked(file_path, chunk_size)
+        if use_snapshot and self.load_snapshot(file_path):
+            return self.load_stats
 
-    def load_data(self, file_path):
-        """Load data from CSV file"""
+        self._begin_memory_phase('load')
+        start_time = time.perf_counter()
         df = pd.read_csv(file_path)
         self.data_columns = df.columns.tolist()
-        
-        # Convert DataFrame to list of dictionaries with proper data types
-        for _, row in df.iterrows():
-            # Convert row to dictionary with proper data types
-            record = {}
-            for col in self.data_columns:
-                value = row[col]
-                # Convert numeric strings to appropriate type
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    value = float(value) if '.' in str(value) else int(value)
-                record[col] = value
-            
-            key = record[self.data_columns[0]]  # First column as key
-            self.array_data.append((key, record))
-            self.btree.insert(key, record)
+        parse_time = time.perf_counter() - start_time
+
+        # Convert one whole column at a time instead of checking every cell
+        build_start = time.perf_counter()
+        columns = [self._column_values(df[col]) for col in self.data_columns]
+        del df
+        rows = self._build_structures(columns)
+        build_time = time.perf_counter() - build_start
+
+        total_time = time.perf_counter() - start_time
+        self._end_memory_phase()
+        self.load_stats = {
+            "source": "csv",
+            "rows": rows,
+            "parse_time": parse_time,
+            "build_time": build_time,
+            "total_time": total_time,
+            "rows_per_second": rows / total_time if total_time > 0 else 0
+        }
+        print(f"Loaded {rows} rows in {total_time:.2f} seconds "
+              f"({self.load_stats['rows_per_second']:.0f} rows/s)")
+
+        if use_snapshot:
+            self._write_snapshot(file_path, columns)
+        return self.load_stats
+
+    def _csv_chunks(self, file_path, chunk_size):
+        """Yield the CSV as lists of converted columns, chunk_size rows at a time"""
+        with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+            for df in reader:
+                if self.data_columns is None:
+                    self.data_columns = df.columns.tolist()
+                yield [self._column_values(df[col]) for col in self.data_columns]
+
+    def _load_csv_chunked(self, file_path, chunk_size):
+        """Stream the CSV chunk by chunk, adding each chunk to every structure as it is read
+
+        Only one chunk is held as a DataFrame at a time, so peak memory is the
+        structures themselves plus a chunk rather than the whole parsed file.
+        The first chunk is bulk loaded, later ones are inserted.
+        """
+        self._begin_memory_phase('load')
+        file_size = os.path.getsize(file_path)
+        start_time = time.perf_counter()
+        rows = 0
+        chunks = 0
+        build_time = 0
+        for columns in self._csv_chunks(file_path, chunk_size):
+            build_start = time.perf_counter()
+            added = self._append_records(columns)
+            if chunks == 0:
+                self._bulk_load_structures()
+            else:
+                self._insert_structures(self.array_data[len(self.array_data) - added:])
+            build_time += time.perf_counter() - build_start
+            rows += added
+            chunks += 1
+            elapsed = time.perf_counter() - start_time
+            print(f"Progress: {rows} rows in {chunks} chunks "
+                  f"({rows / elapsed if elapsed > 0 else 0:.0f} rows/s)")
+        parse_time = time.perf_counter() - start_time - build_time
+
+        total_time = time.perf_counter() - start_time
+        self._end_memory_phase()
+        self.load_stats = {
+            "source": "csv_chunked",
+            "rows": rows,
+            "chunk_size": chunk_size,
+            "chunks": chunks,
+            "parse_time": parse_time,
+            "build_time": build_time,
+            "total_time": total_time,
+            "rows_per_second": rows / total_time if total_time > 0 else 0,
+            "megabytes_per_second": file_size / 1024 / 1024 / total_time if total_time > 0 else 0
+        }
+        print(f"Loaded {rows} rows in {chunks} chunks in {total_time:.2f} seconds "
+              f"({self.load_stats['rows_per_second']:.0f} rows/s, "
+              f"{self.load_stats['megabytes_per_second']:.1f} MB/s)")
+        return self.load_stats
+
+    def _load_lazy(self, file_path):
+        """Index every row's key -> line offset in the memory-mapped CSV, decoding nothing else
+
+        Snapshots are not used: scanning for keys already skips the parsing they save.
+        """
+        self._begin_memory_phase('load')
+        start_time = time.perf_counter()
+        self.close()  # A store from an earlier load would keep its file mapped
+        self.record_store = LazyRecordStore(file_path)
+        self.data_columns = self.record_store.fields
+        keys, offsets = self.record_store.scan()
+        self.array_data.extend(zip(keys, offsets))
+        del keys, offsets
+        scan_time = time.perf_counter() - start_time
+
+        build_start = time.perf_counter()
+        self._bulk_load_structures()
+        build_time = time.perf_counter() - build_start
+
+        total_time = time.perf_counter() - start_time
+        self._end_memory_phase()
+        rows = len(self.array_data)
+        self.load_stats = {
+            "source": "lazy_mmap",
+            "rows": rows,
+            "scan_time": scan_time,
+            "build_time": build_time,
+            "total_time": total_time,
+            "rows_per_second": rows / total_time if total_time > 0 else 0
+        }
+        print(f"Indexed {rows} rows of the mapped file in {total_time:.2f} seconds "
+              f"({self.load_stats['rows_per_second']:.0f} rows/s)")
+        return self.load_stats
+
+    def close(self):
+        """Release the memory-mapped dataset file of lazy records; other stores hold nothing to release"""
+        if isinstance(self.record_store, LazyRecordStore):
+            self.record_store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _build_structures(self, columns):
+        """Add converted columns (first column as key) to every structure, returns the row count"""
+        rows = self._append_records(columns)
+        self._bulk_load_structures()
+        return rows
+
+    def _append_records(self, columns):
+        """Append converted columns (first column as key) to the array, returns the row count"""
+        keys = columns[0]  # First column as key
+        if self.columnar:
+            if self.record_store is None:
+                self.record_store = ColumnarRecordStore(self.data_columns)
+            records = self.record_store.extend_columns(columns)
+        else:
+            records = [dict(zip(self.data_columns, row)) for row in zip(*columns)]
+        self.array_data.extend(zip(keys, records))
+        return len(records)
+
+    def _bulk_load_structures(self):
+        """Build every other structure from the array's (key, record) pairs"""
+        # Build the B-tree in one bottom-up pass instead of one insert per row
+        if hasattr(self.btree, 'bulk_load'):
+            self.btree.bulk_load(self.array_data)
+        else:
+            for key, record in self.array_data:
+                self.btree.insert(key, record)
+        self.bplustree.bulk_load(self.array_data)
+        self.sorted_array.bulk_load(self.array_data)
+        if self.indexed_array is not None:
+            self.indexed_array.bulk_load(self.array_data)
+
+    def _insert_structures(self, pairs):
+        """Add (key, record) pairs to every other structure on top of what it already holds"""
+        if hasattr(self.btree, 'insert_many'):
+            self.btree.insert_many(pairs)
+        else:
+            for key, record in pairs:
+                self.btree.insert(key, record)
+        for key, record in pairs:
+            self.bplustree.insert(key, record)
+        self.sorted_array.insert_many(pairs)
+        if self.indexed_array is not None:
+            self.indexed_array.insert_many(pairs)
+
+    def _snapshot_path(self, file_path):
+        """Snapshot directory for the CSV, named after its checksum and kept beside the CSV"""
+        checksum = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                checksum.update(chunk)
+        checksum = checksum.hexdigest()
+        name = f"{os.path.basename(file_path)}.{checksum[:16]}.columns"
+        return os.path.join(os.path.dirname(file_path), SNAPSHOT_DIR, name), checksum
+
+    def save_snapshot(self, file_path):
+        """Save the loaded dataset as a binary column cache keyed by the CSV's checksum
+
+        Records are written column by column in the order they were loaded.
+        Returns the snapshot path.
+        """
+        if not self.array_data:
+            raise ValueError("No data loaded")
+        # One record is materialized at a time, so columnar stores aren't expanded to dicts whole
+        columns = [[] for _ in self.data_columns]
+        for _, value in self.array_data:
+            record = self.read_record(value)
+            for column, col in zip(columns, self.data_columns):
+                column.append(record[col])
+        return self._write_snapshot(file_path, columns)
+
+    def cache_csv(self, file_path):
+        """Parse the CSV and write its column cache without building any structure"""
+        start_time = time.perf_counter()
+        df = pd.read_csv(file_path)
+        self.data_columns = df.columns.tolist()
+        columns = [self._column_values(df[col]) for col in self.data_columns]
+        del df
+        parse_time = time.perf_counter() - start_time
+        self.load_stats = {
+            "source": "csv",
+            "rows": len(columns[0]) if columns else 0,
+            "parse_time": parse_time,
+            "total_time": parse_time
+        }
+        print(f"Parsed {file_path} in {parse_time:.2f} seconds")
+        return self._write_snapshot(file_path, columns)
+
+    def _csv_load_time(self):
+        if self.load_stats is None:
+            return None
+        if self.load_stats["source"] in ("csv", "csv_chunked"):
+            return self.load_stats["total_time"]
+        return self.load_stats.get("csv_load_time")
+
+    def _csv_parse_time(self):
+        if self.load_stats is None:
+            return None
+        if self.load_stats["source"] in ("csv", "csv_chunked"):
+            return self.load_stats["parse_time"]
+        return self.load_stats.get("csv_parse_time")
+
+    def _write_snapshot(self, file_path, columns):
+        start_time = time.perf_counter()
+        snapshot_path, checksum = self._snapshot_path(file_path)
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        meta = {
+            "checksum": checksum,
+            "csv_load_time": self._csv_load_time(),
+            "csv_parse_time": self._csv_parse_time()
+        }
+        write_column_cache(snapshot_path, self.data_columns, columns, meta)
+        print(f"Snapshot saved to {snapshot_path} in {time.perf_counter() - start_time:.2f} seconds")
+        return snapshot_path
+
+    def load_snapshot(self, file_path):
+        """Load the dataset from its column cache if one exists and is newer than the CSV
+
+        The structures are rebuilt from the cached columns with their bulk
+        loaders, which skips CSV parsing and type conversion. Numeric columns
+        are memory-mapped; with columnar storage they are never turned into
+        Python objects, except for the keys the structures hold.
+        Returns True if the snapshot was used.
+        """
+        snapshot_path, checksum = self._snapshot_path(file_path)
+        meta_path = os.path.join(snapshot_path, META_FILE)
+        if not os.path.exists(meta_path) or os.path.getmtime(meta_path) <= os.path.getmtime(file_path):
+            return False
+
+        self._begin_memory_phase('load')
+        start_time = time.perf_counter()
+        meta = read_column_meta(snapshot_path)
+        if meta.get("checksum") != checksum:
+            print(f"Ignoring {snapshot_path}: checksum does not match {file_path}")
+            self._end_memory_phase()
+            return False
+        _, columns = read_column_cache(snapshot_path, meta)
+        # Numeric columns come memory-mapped: a columnar store copies them into its typed
+        # arrays as raw bytes, dict records need them as Python values
+        columns = [(typed_array(column) if self.columnar else column.tolist())
+                   if isinstance(column, np.ndarray) else column for column in columns]
+        self.data_columns = meta["data_columns"]
+        read_time = time.perf_counter() - start_time
+
+        build_start = time.perf_counter()
+        rows = self._build_structures(columns)
+        build_time = time.perf_counter() - build_start
+
+        total_time = time.perf_counter() - start_time
+        self._end_memory_phase()
+        csv_load_time = meta.get("csv_load_time")
+        csv_parse_time = meta.get("csv_parse_time")
+        self.load_stats = {
+            "source": "snapshot",
+            "rows": rows,
+            "snapshot_path": snapshot_path,
+            "snapshot_read_time": read_time,
+            "build_time": build_time,
+            "total_time": total_time,
+            "rows_per_second": rows / total_time if total_time > 0 else 0,
+            "csv_load_time": csv_load_time,
+            "csv_parse_time": csv_parse_time
+        }
+        message = f"Loaded {rows} rows from snapshot in {total_time:.2f} seconds"
+        if csv_parse_time is not None:
+            message += f" (cached read {read_time:.2f} s vs CSV parse {csv_parse_time:.2f} s)"
+        print(message)
+        return True
+
+    def _begin_memory_phase(self, phase):
+        """Attribute tracemalloc peak memory from now on to phase (no-op unless tracing)"""
+        self._end_memory_phase()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_phase = phase
+
+    def _end_memory_phase(self):
+        if self._memory_phase is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_phases[self._memory_phase] = {"current_bytes": current, "peak_bytes": peak}
+        self._memory_phase = None
+
+    def measure_memory(self):
+        """Deep size of each structure, with a breakdown for the array and the B-tree
+
+        Record payloads are shared between structures, so each structure's
+        payload_bytes/total_bytes is what it would cost on its own.
+        """
+        memory = {
+            'array': array_memory(self.array_data),
+            'btree': btree_memory(self.btree),
+            'bplustree': {"total_bytes": deep_sizeof(self.bplustree)},
+            'sorted_array': {"total_bytes": deep_sizeof(self.sorted_array)}
+        }
+        if self.indexed_array is not None:
+            memory['indexed_array'] = {"total_bytes": deep_sizeof(self.indexed_array)}
+        return memory
+
+    def _column_values(self, series):
+        """Convert a DataFrame column to a list of Python values with proper data types"""
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+            return series.astype('int64').tolist()
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype('float64').tolist()
+        return series.tolist()
 
     def generate_test_data(self, key):
         """Generate test data using the data configuration"""
-        return generate_record(key)
+        return generate_records([key], self.record_rng)[0]
+
+    def generate_test_values(self, keys, updated=False):
+        """Generate test data for many keys in one vectorized batch
+        Args:
+            updated: Mark every record with 'updated': True, as update payloads are
+        Returns:
+            The values the structures should hold, in key order
+        """
+        records = generate_records(keys, self.record_rng)
+        if updated:
+            for record in records:
+                record['updated'] = True
+        return [self.store_record(record) for record in records]
+
+    def store_record(self, record):
+        """Prepare a record for insertion, returns the value the structures should hold
+
+        In columnar or lazy mode the record is appended to the record store and
+        its id is returned. Rows replaced by updates or deletes are not reclaimed.
+        """
+        if self.record_store is not None:
+            return self.record_store.append(record)
+        return record
+
+    def read_record(self, value):
+        """Materialize a value returned by a structure as a record dict"""
+        if self.record_store is not None and value is not None:
+            return self.record_store.get(value)
+        return value
+
+    def _validate_record(self, value):
+        # Row ids were validated by the record store when the record was appended
+        if self.record_store is not None:
+            return
+        if not all(col in value for col in self.data_columns):
+            raise ValueError("Missing required fields in data")
 
     def array_search(self, key):
         """Search in array using linear search"""
@@ -46,8 +467,7 @@ class DataStructureComparison:
     def array_insert(self, key, value):
         """Insert into array with data validation"""
         # Validate that all required fields are present
-        if not all(col in value for col in self.data_columns):
-            raise ValueError("Missing required fields in data")
+        self._validate_record(value)
         self.array_data.append((key, value))
 
     def array_delete(self, key):
@@ -58,11 +478,14 @@ class DataStructureComparison:
                 return True
         return False
 
+    def array_range(self, lo, hi):
+        """Range query over the array by filtering every element"""
+        return ((k, v) for k, v in self.array_data if lo <= k <= hi)
+
     def array_update(self, key, new_value):
         """Update value in array with data validation"""
         # Validate that all required fields are present
-        if not all(col in new_value for col in self.data_columns):
-            raise ValueError("Missing required fields in data")
+        self._validate_record(new_value)
             
         for i, (k, _) in enumerate(self.array_data):
             if k == key:
@@ -70,18 +493,177 @@ class DataStructureComparison:
                 return True
         return False
 
-    def benchmark_concurrent_operations(self, operations=100, max_workers=4):
+    def array_search_many(self, keys):
+        """Search many keys in one scan of the array, returns values (or None) in input order"""
+        pending = set(keys)
+        found = {}
+        for k, v in self.array_data:
+            if k in pending:
+                found[k] = v
+                pending.discard(k)
+                if not pending:
+                    break
+        return [found.get(key) for key in keys]
+
+    def array_insert_many(self, pairs):
+        """Insert many (key, value) pairs into the array with data validation"""
+        pairs = list(pairs)
+        for _, value in pairs:
+            self._validate_record(value)
+        self.array_data.extend(pairs)
+
+    def array_delete_many(self, keys):
+        """Delete many keys in one scan of the array, returns how many were found"""
+        pending = set(keys)
+        kept = []
+        deleted = 0
+        for item in self.array_data:
+            if item[0] in pending:
+                pending.discard(item[0])
+                deleted += 1
+            else:
+                kept.append(item)
+        self.array_data[:] = kept
+        return deleted
+
+    def _benchmark_structures(self):
+        """Operations of every structure under test, keyed by result name"""
+        structures = {
+            'array': {
+                'search': self.array_search,
+                'insert': self.array_insert,
+                'update': self.array_update,
+                'delete': self.array_delete,
+                'range': self.array_range
+            },
+            'btree': {
+                'search': self.btree.search,
+                'insert': self.btree.insert,
+                'update': self.btree.update,
+                'delete': self.btree.delete
+            },
+            'bplustree': {
+                'search': self.bplustree.search,
+                'insert': self.bplustree.insert,
+                'update': self.bplustree.update,
+                'delete': self.bplustree.delete,
+                'range': self.bplustree.range_scan
+            },
+            'sorted_array': {
+                'search': self.sorted_array.search,
+                'insert': self.sorted_array.insert,
+                'update': self.sorted_array.update,
+                'delete': self.sorted_array.delete,
+                'range': self.sorted_array.range
+            }
+        }
+        # Ordered iteration is not available on LegacyBTree
+        if hasattr(self.btree, 'items'):
+            structures['btree']['range'] = self.btree.items
+        if self.indexed_array is not None:
+            structures['indexed_array'] = {
+                'search': self.indexed_array.search,
+                'insert': self.indexed_array.insert,
+                'update': self.indexed_array.update,
+                'delete': self.indexed_array.delete,
+                'range': self.indexed_array.range
+            }
+        return structures
+
+    def structure_info(self):
+        """Extra per-structure details reported next to the timings"""
+        info = {}
+        if self.indexed_array is not None:
+            info['indexed_array'] = self.indexed_array.memory_usage()
+        if self.record_store is not None:
+            info['lazy_records' if self.lazy else 'records'] = self.record_store.memory_usage()
+        return info
+
+    def _operation_plan(self, operations, range_queries=0, range_size=100):
+        """Arguments of every benchmark operation, built before any timing starts
+        Returns:
+            Dictionary of phase -> list of argument tuples, in execution order
+        """
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1  # New keys never collide with existing ones
+        keys = [existing_keys[i % len(existing_keys)] for i in range(operations)]
+
+        plan = {
+            'search': [(key,) for key in keys],
+            'range': [(lo, lo + range_size) for lo in
+                      (existing_keys[i % len(existing_keys)] for i in range(range_queries))],
+            'insert': list(zip(range(next_key, next_key + operations),
+                               self.generate_test_values(range(next_key, next_key + operations)))),
+            'update': list(zip(keys, self.generate_test_values(keys, updated=True))),
+            'delete': [(key,) for key in keys]
+        }
+        return plan
+
+    def _calibrate_timer(self, samples=10000):
+        """Median cost of an empty perf_counter() start/stop pair, subtracted from every timing"""
+        overheads = []
+        for _ in range(samples):
+            start_time = time.perf_counter()
+            overheads.append(time.perf_counter() - start_time)
+        overheads.sort()
+        return overheads[len(overheads) // 2]
+
+    @contextlib.contextmanager
+    def _timed_region(self, disable_gc=True):
+        """Collect garbage up front and keep the collector from running while operations are timed"""
+        enabled = gc.isenabled()
+        if disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            yield
+        finally:
+            if disable_gc and enabled:
+                gc.enable()
+
+    def _start_run_stats(self, plan_start, disable_gc):
+        """Record setup cost (planning, timer calibration) apart from operation cost"""
+        plan_time = time.perf_counter() - plan_start
+        timer_overhead = self._calibrate_timer()
+        self.run_stats = {
+            "setup_time": plan_time,
+            "timer_overhead": timer_overhead,
+            "gc_disabled": disable_gc
+        }
+        return timer_overhead
+
+    def _finish_run_stats(self, results):
+        self.run_stats["operation_time"] = sum(times.total for by_operation in results.values()
+                                               for times in by_operation.values())
+        print(f"\nSetup time: {self.run_stats['setup_time']:.3f} seconds, "
+              f"operation time: {self.run_stats['operation_time']:.3f} seconds "
+              f"(timer overhead {self.run_stats['timer_overhead'] * 1e9:.0f} ns subtracted per operation)")
+
+    def benchmark_concurrent_operations(self, operations=100, max_workers=4, disable_gc=True):
         """Benchmark operations with concurrent execution
         Args:
             operations: Number of operations to perform
             max_workers: Maximum number of concurrent workers
+            disable_gc: Keep the garbage collector from running inside timed phases
         """
-        results = {
-            'array': {'search': [], 'insert': [], 'update': [], 'delete': []},
-            'btree': {'search': [], 'insert': [], 'update': [], 'delete': []}
+        plan_start = time.perf_counter()
+        structures = self._benchmark_structures()
+        # Timings go into fixed-size histograms instead of growing lists
+        results = {name: {operation: LatencyHistogram() for operation in ('search', 'insert', 'update', 'delete')}
+                   for name in structures}
+        # Array-backed structures shift elements in place and must be serialized
+        locks = {
+            'array': self.array_lock,
+            'sorted_array': self.sorted_array_lock,
+            'indexed_array': self.indexed_array_lock,
+            'bplustree': self.bplustree_lock
         }
+        # ConcurrentBTree latches its own nodes; any other B-tree is serialized like the arrays
+        if not getattr(self.btree, 'thread_safe', False):
+            locks['btree'] = self.btree_lock
 
-        existing_keys = [k for k, _ in self.array_data]
+        plan = self._operation_plan(operations)
+        timer_overhead = self._start_run_stats(plan_start, disable_gc)
         
         print("\nRunning concurrent benchmarks...")
         print("=" * 50)
@@ -90,117 +672,31 @@ class DataStructureComparison:
         print(f"Number of concurrent workers: {max_workers}")
         print(f"Fields: {', '.join(self.data_columns)}")
 
-        def array_search_worker(key):
-            with self.array_lock:
-                start_time = time.perf_counter()
-                result = self.array_search(key)
-                end_time = time.perf_counter()
-                return end_time - start_time
-
-        def btree_search_worker(key):
-            start_time = time.perf_counter()
-            result = self.btree.search(key)
-            end_time = time.perf_counter()
-            return end_time - start_time
-
-        def array_insert_worker(i):
-            key = max(existing_keys) + i + 1
-            value = self.generate_test_data(key)
-            with self.array_lock:
+        def timed(name, operation, args):
+            # Only the operation itself is timed: lock waits happen before the clock starts
+            func = structures[name][operation]
+            lock = locks.get(name)
+            if lock is None:
                 start_time = time.perf_counter()
-                self.array_insert(key, value)
+                func(*args)
                 end_time = time.perf_counter()
-                return end_time - start_time
-
-        def btree_insert_worker(i):
-            key = max(existing_keys) + i + 1
-            value = self.generate_test_data(key)
-            start_time = time.perf_counter()
-            self.btree.insert(key, value)
-            end_time = time.perf_counter()
-            return end_time - start_time
-
-        def array_update_worker(key):
-            new_value = self.generate_test_data(key)
-            new_value['updated'] = True
-            with self.array_lock:
+                return max(end_time - start_time - timer_overhead, 0.0)
+            with lock:
                 start_time = time.perf_counter()
-                self.array_update(key, new_value)
+                func(*args)
                 end_time = time.perf_counter()
-                return end_time - start_time
+                return max(end_time - start_time - timer_overhead, 0.0)
 
-        def btree_update_worker(key):
-            new_value = self.generate_test_data(key)
-            new_value['updated'] = True
-            start_time = time.perf_counter()
-            self.btree.update(key, new_value)
-            end_time = time.perf_counter()
-            return end_time - start_time
-
-        def array_delete_worker(key):
-            with self.array_lock:
-                start_time = time.perf_counter()
-                self.array_delete(key)
-                end_time = time.perf_counter()
-                return end_time - start_time
+        for operation in ('search', 'insert', 'update', 'delete'):
+            self._begin_memory_phase(operation)
+            print(f"\nBenchmarking Concurrent {operation.capitalize()} Operations:")
+            with self._timed_region(disable_gc):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for name in structures:
+                        futures = [executor.submit(timed, name, operation, args) for args in plan[operation]]
+                        results[name][operation].extend(f.result() for f in futures)
 
-        def btree_delete_worker(key):
-            start_time = time.perf_counter()
-            self.btree.delete(key)
-            end_time = time.perf_counter()
-            return end_time - start_time
-
-        # Benchmark concurrent search
-        print("\nBenchmarking Concurrent Search Operations:")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Array search
-            array_futures = [executor.submit(array_search_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['array']['search'] = [f.result() for f in array_futures]
-
-            # B-tree search
-            btree_futures = [executor.submit(btree_search_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['btree']['search'] = [f.result() for f in btree_futures]
-
-        # Benchmark concurrent insert
-        print("\nBenchmarking Concurrent Insert Operations:")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Array insert
-            array_futures = [executor.submit(array_insert_worker, i) 
-                           for i in range(operations)]
-            results['array']['insert'] = [f.result() for f in array_futures]
-
-            # B-tree insert
-            btree_futures = [executor.submit(btree_insert_worker, i) 
-                           for i in range(operations)]
-            results['btree']['insert'] = [f.result() for f in btree_futures]
-
-        # Benchmark concurrent update
-        print("\nBenchmarking Concurrent Update Operations:")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Array update
-            array_futures = [executor.submit(array_update_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['array']['update'] = [f.result() for f in array_futures]
-
-            # B-tree update
-            btree_futures = [executor.submit(btree_update_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['btree']['update'] = [f.result() for f in btree_futures]
-
-        # Benchmark concurrent delete
-        print("\nBenchmarking Concurrent Delete Operations:")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Array delete
-            array_futures = [executor.submit(array_delete_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['array']['delete'] = [f.result() for f in array_futures]
-
-            # B-tree delete
-            btree_futures = [executor.submit(btree_delete_worker, existing_keys[i % len(existing_keys)]) 
-                           for i in range(operations)]
-            results['btree']['delete'] = [f.result() for f in btree_futures]
+        self._end_memory_phase()
 
         # Calculate and print detailed statistics
         print("\nDetailed Results (Concurrent Operations):")
@@ -210,10 +706,10 @@ class DataStructureComparison:
             for operation in results[structure]:
                 times = results[structure][operation]
                 if times:  # Check if we have any results
-                    avg_time = sum(times) / len(times)
-                    min_time = min(times)
-                    max_time = max(times)
-                    total_time = sum(times)
+                    avg_time = times.mean()
+                    min_time = times.min
+                    max_time = times.max
+                    total_time = times.total
                     ops_per_second = len(times) / total_time if total_time > 0 else 0
                     
                     print(f"{operation.capitalize()}:")
@@ -222,32 +718,45 @@ class DataStructureComparison:
                     print(f"  Maximum time: {max_time:.9f} seconds")
                     print(f"  Total time: {total_time:.9f} seconds")
                     print(f"  Operations per second: {ops_per_second:.2f}")
+                    print(f"  p99 time: {times.percentile(99):.9f} seconds")
                 else:
                     print(f"{operation.capitalize()}: No results available")
 
+        self._finish_run_stats(results)
         return results
 
-    def benchmark_operations(self, operations=None, concurrent=False, max_workers=4):
-        """Benchmark operations for both data structures
+    def benchmark_operations(self, operations=None, concurrent=False, max_workers=4,
+                             range_queries=None, range_size=100, disable_gc=True):
+        """Benchmark operations for all data structures
         Args:
             operations: Number of operations to perform. If None, use 10% of dataset size
             concurrent: Whether to run operations concurrently
             max_workers: Maximum number of concurrent workers (if concurrent=True)
+            range_queries: Number of range queries to run. If None, use min(operations, 100)
+            range_size: Width of each range query, in key units
+            disable_gc: Keep the garbage collector from running inside timed phases
         """
         if concurrent:
-            return self.benchmark_concurrent_operations(operations, max_workers)
+            return self.benchmark_concurrent_operations(operations, max_workers, disable_gc)
             
         # If operations not specified, use 10% of dataset size
         if operations is None:
             operations = max(100, len(self.array_data) // 10)
+        if range_queries is None:
+            range_queries = min(operations, 100)
         
-        results = {
-            'array': {'search': [], 'insert': [], 'update': [], 'delete': []},
-            'btree': {'search': [], 'insert': [], 'update': [], 'delete': []}
-        }
+        plan_start = time.perf_counter()
+        structures = self._benchmark_structures()
+        # Timings go into fixed-size histograms instead of growing lists
+        results = {name: {operation: LatencyHistogram() for operation in ('search', 'insert', 'update', 'delete')}
+                   for name in structures}
+        for name, ops in structures.items():
+            if 'range' in ops:
+                results[name]['range'] = LatencyHistogram()
 
-        # Get existing keys from dataset
-        existing_keys = [k for k, _ in self.array_data]
+        # Every key and payload is prepared here, so the timed loops only run operations
+        plan = self._operation_plan(operations, range_queries, range_size)
+        timer_overhead = self._start_run_stats(plan_start, disable_gc)
         
         print("\nRunning benchmarks...")
         print("=" * 50)
@@ -255,96 +764,37 @@ class DataStructureComparison:
         print(f"Number of operations: {operations}")
         print(f"Fields: {', '.join(self.data_columns)}")
 
-        # Benchmark search
-        print("\nBenchmarking Search Operations:")
-        for i in range(operations):
-            if i % 100 == 0:
-                print(f"Progress: {i}/{operations} operations")
-            
-            # Use existing keys for search
-            key = existing_keys[i % len(existing_keys)]
-            
-            # Array search
-            start_time = time.perf_counter()
-            self.array_search(key)
-            end_time = time.perf_counter()
-            results['array']['search'].append(end_time - start_time)
-
-            # B-tree search
-            start_time = time.perf_counter()
-            self.btree.search(key)
-            end_time = time.perf_counter()
-            results['btree']['search'].append(end_time - start_time)
-
-        # Benchmark insert
-        print("\nBenchmarking Insert Operations:")
-        for i in range(operations):
-            if i % 100 == 0:
-                print(f"Progress: {i}/{operations} operations")
-                
-            # Generate new key that doesn't exist
-            while True:
-                key = max(existing_keys) + i + 1
-                if key not in existing_keys:
-                    break
-            
-            value = self.generate_test_data(key)
-
-            # Array insert
-            start_time = time.perf_counter()
-            self.array_insert(key, value)
-            end_time = time.perf_counter()
-            results['array']['insert'].append(end_time - start_time)
-
-            # B-tree insert
-            start_time = time.perf_counter()
-            self.btree.insert(key, value)
-            end_time = time.perf_counter()
-            results['btree']['insert'].append(end_time - start_time)
-
-        # Benchmark update
-        print("\nBenchmarking Update Operations:")
-        for i in range(operations):
-            if i % 100 == 0:
-                print(f"Progress: {i}/{operations} operations")
-                
-            # Use existing keys for update
-            key = existing_keys[i % len(existing_keys)]
-            new_value = self.generate_test_data(key)
-            new_value['updated'] = True
-
-            # Array update
-            start_time = time.perf_counter()
-            self.array_update(key, new_value)
-            end_time = time.perf_counter()
-            results['array']['update'].append(end_time - start_time)
+        titles = {
+            'search': "Search Operations",
+            'range': "Range Scan Operations",
+            'insert': "Insert Operations",
+            'update': "Update Operations",
+            'delete': "Delete Operations"
+        }
+        for operation in ('search', 'range', 'insert', 'update', 'delete'):
+            self._begin_memory_phase(operation)
+            print(f"\nBenchmarking {titles[operation]}:")
+            requests = plan[operation]
+            with self._timed_region(disable_gc):
+                for i, args in enumerate(requests):
+                    if i % 100 == 0:
+                        print(f"Progress: {i}/{len(requests)} operations")
 
-            # B-tree update
-            start_time = time.perf_counter()
-            self.btree.update(key, new_value)
-            end_time = time.perf_counter()
-            results['btree']['update'].append(end_time - start_time)
-
-        # Benchmark delete
-        print("\nBenchmarking Delete Operations:")
-        for i in range(operations):
-            if i % 100 == 0:
-                print(f"Progress: {i}/{operations} operations")
-                
-            # Use existing keys for delete
-            key = existing_keys[i % len(existing_keys)]
-            
-            # Array delete
-            start_time = time.perf_counter()
-            self.array_delete(key)
-            end_time = time.perf_counter()
-            results['array']['delete'].append(end_time - start_time)
+                    for name, ops in structures.items():
+                        if operation not in ops:
+                            continue
+                        func = ops[operation]
+                        if operation == 'range':
+                            start_time = time.perf_counter()
+                            deque(func(*args), maxlen=0)  # Consume the whole range
+                            end_time = time.perf_counter()
+                        else:
+                            start_time = time.perf_counter()
+                            func(*args)
+                            end_time = time.perf_counter()
+                        results[name][operation].append(max(end_time - start_time - timer_overhead, 0.0))
 
-            # B-tree delete
-            start_time = time.perf_counter()
-            self.btree.delete(key)
-            end_time = time.perf_counter()
-            results['btree']['delete'].append(end_time - start_time)
+        self._end_memory_phase()
 
         # Calculate and print detailed statistics
         print("\nDetailed Results:")
@@ -353,13 +803,516 @@ class DataStructureComparison:
             print(f"\n{structure.upper()} Structure:")
             for operation in results[structure]:
                 times = results[structure][operation]
-                avg_time = sum(times) / len(times)
-                min_time = min(times)
-                max_time = max(times)
+                avg_time = times.mean()
+                min_time = times.min
+                max_time = times.max
                 print(f"{operation.capitalize()}:")
                 print(f"  Average time: {avg_time:.9f} seconds")
                 print(f"  Minimum time: {min_time:.9f} seconds")
                 print(f"  Maximum time: {max_time:.9f} seconds")
-                print(f"  Total time: {sum(times):.9f} seconds")
+                print(f"  Total time: {times.total:.9f} seconds")
+                print(f"  p99 time: {times.percentile(99):.9f} seconds")
+
+        self._finish_run_stats(results)
+        return results 
+
+    def benchmark_batch_operations(self, operations=1000, batch_sizes=(1, 10, 100, 1000)):
+        """Benchmark batched search/insert/delete and report the cost per key
+        Args:
+            operations: Number of keys processed for each batch size
+            batch_sizes: Batch sizes to compare
+        Returns:
+            Dictionary of structure -> operation -> batch size -> seconds per key
+        """
+        structures = {
+            'array': {
+                'search': self.array_search_many,
+                'insert': self.array_insert_many,
+                'delete': self.array_delete_many
+            },
+            'btree': {
+                'search': self.btree.search_many,
+                'insert': self.btree.insert_many,
+                'delete': self.btree.delete_many
+            }
+        }
+        results = {name: {'search': {}, 'insert': {}, 'delete': {}} for name in structures}
+
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1
+
+        print("\nRunning batch benchmarks...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Keys per batch size: {operations}")
+        print(f"Batch sizes: {', '.join(str(size) for size in batch_sizes)}")
+
+        for batch_size in batch_sizes:
+            print(f"\nBenchmarking batch size {batch_size}:")
+            batches = max(1, operations // batch_size)
+            search_batches = [[existing_keys[(b * batch_size + j) % len(existing_keys)]
+                               for j in range(batch_size)]
+                              for b in range(batches)]
+            # Fresh keys for inserts, deleted again afterwards so every batch size sees the same data
+            insert_batches = []
+            for _ in range(batches):
+                keys = range(next_key, next_key + batch_size)
+                insert_batches.append(list(zip(keys, self.generate_test_values(keys))))
+                next_key += batch_size
+            delete_batches = [[key for key, _ in batch] for batch in insert_batches]
+
+            for name, ops in structures.items():
+                for operation, batch_list in (('search', search_batches),
+                                              ('insert', insert_batches),
+                                              ('delete', delete_batches)):
+                    total_time = 0
+                    for batch in batch_list:
+                        start_time = time.perf_counter()
+                        ops[operation](batch)
+                        end_time = time.perf_counter()
+                        total_time += end_time - start_time
+                    per_key = total_time / (batches * batch_size)
+                    results[name][operation][batch_size] = per_key
+                    print(f"  {name} {operation}: {per_key:.9f} seconds per key")
+
+        return results
+
+    def benchmark_degree_sweep(self, degrees=(2, 3, 4, 8, 16, 32, 64, 128), operations=1000, weights=None):
+        """Benchmark BTree for a range of minimum degrees on the loaded dataset
+        Args:
+            degrees: Minimum degree values (t) to try
+            operations: Number of operations per operation type and degree
+            weights: Share of each operation in the target workload, used to pick
+                the recommended degree. Defaults to equal weights.
+        Returns:
+            Dictionary with one entry per degree and the recommended degree
+        """
+        if weights is None:
+            weights = {'search': 1, 'insert': 1, 'update': 1, 'delete': 1}
+
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1
+
+        # Same keys and payloads for every degree, generated outside the timed loops
+        search_keys = [existing_keys[i % len(existing_keys)] for i in range(operations)]
+        insert_keys = range(next_key, next_key + operations)
+        insert_pairs = list(zip(insert_keys, self.generate_test_values(insert_keys)))
+        update_pairs = list(zip(search_keys, self.generate_test_values(search_keys, updated=True)))
+
+        print("\nRunning B-tree degree sweep...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Number of operations: {operations}")
+        print(f"Degrees: {', '.join(str(t) for t in degrees)}")
+
+        curve = []
+        for t in degrees:
+            tree = BTree(t=t)
+            start_time = time.perf_counter()
+            tree.bulk_load(self.array_data)
+            build_time = time.perf_counter() - start_time
+            point = {"t": t, "build_time": build_time}
+            point.update(tree.stats())
+
+            timings = {'search': [], 'insert': [], 'update': [], 'delete': []}
+            for key in search_keys:
+                start_time = time.perf_counter()
+                tree.search(key)
+                timings['search'].append(time.perf_counter() - start_time)
+            for key, value in insert_pairs:
+                start_time = time.perf_counter()
+                tree.insert(key, value)
+                timings['insert'].append(time.perf_counter() - start_time)
+            for key, value in update_pairs:
+                start_time = time.perf_counter()
+                tree.update(key, value)
+                timings['update'].append(time.perf_counter() - start_time)
+            for key in search_keys:
+                start_time = time.perf_counter()
+                tree.delete(key)
+                timings['delete'].append(time.perf_counter() - start_time)
+
+            for operation, times in timings.items():
+                point[f"{operation}_time"] = sum(times) / len(times)
+            total_weight = sum(weights.values())
+            point["weighted_time"] = sum(point[f"{op}_time"] * w for op, w in weights.items()) / total_weight
+            curve.append(point)
+
+            print(f"t={t}: height {point['height']}, {point['nodes']} nodes, "
+                  f"{point['memory_bytes'] / 1024 / 1024:.2f} MB, "
+                  f"weighted time {point['weighted_time']:.9f} seconds")
+
+        best = min(curve, key=lambda point: point["weighted_time"])
+        print(f"\nRecommended minimum degree: t={best['t']}")
+
+        return {
+            "weights": weights,
+            "curve": curve,
+            "recommended_t": best["t"]
+        }
+
+    def benchmark_paged_btree(self, operations=1000, cache_pages=256, page_size=4096, directory=None):
+        """Benchmark the disk-resident PagedBTree against the in-memory BTree
+        Args:
+            operations: Number of operations per operation type
+            cache_pages: Page cache size of the paged trees
+            page_size: Size of a page in bytes
+            directory: Where to put the tree files, a temporary directory by default
+        Returns:
+            Tuple of (results, cache_info): timings per structure and operation,
+            and the page cache counters of each paged tree
+        """
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1
+
+        search_keys = [existing_keys[i % len(existing_keys)] for i in range(operations)]
+        insert_keys = range(next_key, next_key + operations)
+        insert_pairs = list(zip(insert_keys, self.generate_test_values(insert_keys)))
+        update_pairs = list(zip(search_keys, self.generate_test_values(search_keys, updated=True)))
+
+        temporary = directory is None
+        if temporary:
+            directory = tempfile.mkdtemp(prefix="paged_btree_")
+
+        print("\nRunning paged B-tree benchmark...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Number of operations: {operations}")
+        print(f"Page size: {page_size} bytes, cache: {cache_pages} pages")
+
+        in_memory = BTree(t=self.btree.t)
+        in_memory.bulk_load(self.array_data)
+        trees = {'btree': in_memory}
+        for name in ('paged_btree_warm', 'paged_btree_cold'):
+            file_path = os.path.join(directory, f"{name}.db")
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            tree = PagedBTree(file_path, page_size=page_size, cache_pages=cache_pages)
+            start_time = time.perf_counter()
+            tree.bulk_load(self.array_data)
+            print(f"{name}: built {tree.page_count} pages in {time.perf_counter() - start_time:.2f} seconds")
+            trees[name] = tree
+
+        # Warm cache: touch every search path once before timing.
+        # Cold cache: empty the page cache (and the OS cache where possible) before each operation.
+        for key in search_keys:
+            trees['paged_btree_warm'].search(key)
+        before = {'paged_btree_cold': trees['paged_btree_cold'].drop_cache}
+
+        workload = [
+            ('search', [(key,) for key in search_keys], 'search'),
+            ('insert', insert_pairs, 'insert'),
+            ('update', update_pairs, 'update'),
+            ('delete', [(key,) for key in search_keys], 'delete')
+        ]
+        results = {name: {operation: LatencyHistogram() for operation in ('search', 'insert', 'update', 'delete')}
+                   for name in trees}
+        for operation, arguments, method in workload:
+            print(f"\nTesting {operation} operations...")
+            for name, tree in trees.items():
+                call = getattr(tree, method)
+                prepare = before.get(name)
+                for args in arguments:
+                    if prepare is not None:
+                        prepare()
+                    start_time = time.perf_counter()
+                    call(*args)
+                    results[name][operation].append(time.perf_counter() - start_time)
 
-        return results 
\ No newline at end of file
+        cache_info = {}
+        for name, tree in trees.items():
+            if name != 'btree':
+                cache_info[name] = tree.cache_stats()
+                tree.close()
+        if temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        return results, cache_info
+
+    def benchmark_worker_scaling(self, worker_counts=(1, 2, 4, 8), operations=2000, mix=None):
+        """Measure B-tree throughput under a mixed workload as the number of threads grows
+        Args:
+            worker_counts: Numbers of concurrent workers to try
+            operations: Total number of operations per run, split across the workers
+            mix: Share of each operation in the workload, defaults to 70% search and
+                10% each of insert, update and delete
+        Returns:
+            Dictionary of structure -> worker count -> elapsed time, throughput,
+            speedup over the first worker count and whether the tree checked out correct
+        """
+        if mix is None:
+            mix = {'search': 0.7, 'insert': 0.1, 'update': 0.1, 'delete': 0.1}
+
+        # One seeded workload shared by every run: inserts use new keys,
+        # deletes remove distinct existing keys
+        rng = random.Random(0)
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1
+        kinds = rng.choices(list(mix), weights=list(mix.values()), k=operations)
+        delete_keys = iter(rng.sample(existing_keys, min(kinds.count('delete'), len(existing_keys))))
+        workload = []
+        for kind in kinds:
+            if kind == 'insert':
+                workload.append(['insert', next_key])
+                next_key += 1
+            elif kind == 'delete':
+                key = next(delete_keys, None)
+                if key is not None:
+                    workload.append(('delete', key))
+            elif kind == 'update':
+                workload.append(['update', rng.choice(existing_keys)])
+            else:
+                workload.append(('search', rng.choice(existing_keys)))
+        # Payloads for all inserts and all updates are generated in two batches
+        for kind, updated in (('insert', False), ('update', True)):
+            pending = [op for op in workload if op[0] == kind]
+            for op, value in zip(pending, self.generate_test_values([op[1] for op in pending], updated)):
+                op.append(value)
+        workload = [tuple(op) for op in workload]
+        inserted = [op[1] for op in workload if op[0] == 'insert']
+        deleted = [op[1] for op in workload if op[0] == 'delete']
+
+        print("\nRunning B-tree worker scaling benchmark...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Number of operations: {len(workload)}")
+        print(f"Workload mix: {', '.join(f'{op} {share:.0%}' for op, share in mix.items())}")
+
+        t = self.btree.t
+        results = {'btree': {}, 'concurrent_btree': {}}
+        for name in results:
+            for workers in worker_counts:
+                tree = ConcurrentBTree(t) if name == 'concurrent_btree' else BTree(t)
+                tree.bulk_load(self.array_data)
+                # The plain B-tree is only safe behind a single tree-wide lock
+                lock = threading.Lock() if name == 'btree' else None
+                barrier = threading.Barrier(workers)
+
+                def run(chunk):
+                    barrier.wait()
+                    start_time = time.perf_counter()
+                    for operation, *args in chunk:
+                        if lock is None:
+                            getattr(tree, operation)(*args)
+                        else:
+                            with lock:
+                                getattr(tree, operation)(*args)
+                    return start_time, time.perf_counter()
+
+                with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(run, workload[w::workers]) for w in range(workers)]
+                    spans = [f.result() for f in futures]
+                elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+
+                keys = [k for k, _ in tree.items()]
+                correct = (all(keys[i] < keys[i + 1] for i in range(len(keys) - 1)) and
+                           all(tree.search(key) is not None for key in inserted) and
+                           all(tree.search(key) is None for key in deleted))
+
+                first = results[name].get(worker_counts[0])
+                results[name][workers] = {
+                    "elapsed_time": elapsed,
+                    "throughput": len(workload) / elapsed if elapsed > 0 else 0,
+                    "speedup": first["elapsed_time"] / elapsed if first and elapsed > 0 else 1.0,
+                    "correct": correct
+                }
+                print(f"{name} with {workers} workers: {results[name][workers]['throughput']:.0f} ops/s, "
+                      f"speedup {results[name][workers]['speedup']:.2f}x"
+                      f"{'' if correct else ' (TREE CHECK FAILED)'}")
+
+        return results
+
+    def benchmark_sharded(self, shard_counts=(1, 2, 4), operations=1000, batch_size=100):
+        """Benchmark the process-sharded engine against single-process benchmark_operations
+        Args:
+            shard_counts: Numbers of worker processes to try
+            operations: Number of operations per operation type
+            batch_size: Operations routed to the shards per round trip
+        Returns:
+            Dictionary with the single-process throughput per structure and operation,
+            and per shard count the sharded throughput, speedup and scaling efficiency
+            (speedup divided by the number of shards)
+        """
+        if self.file_path is None:
+            raise ValueError("No data loaded")
+        existing_keys = [k for k, _ in self.array_data]
+        next_key = max(existing_keys) + 1
+        search_keys = [existing_keys[i % len(existing_keys)] for i in range(operations)]
+        workload = {
+            'search': [('search', key) for key in search_keys],
+            'insert': [('insert', next_key + i, value) for i, value in
+                       enumerate(self.generate_test_values(range(next_key, next_key + operations)))],
+            'update': [('update', key, value) for key, value in
+                       zip(search_keys, self.generate_test_values(search_keys, updated=True))],
+            'delete': [('delete', key) for key in search_keys]
+        }
+
+        print("\nRunning sharded engine benchmark...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Number of operations: {operations}")
+        print(f"Shard counts: {', '.join(str(n) for n in shard_counts)}, batch size {batch_size}")
+
+        sharded = {'btree': {}, 'array': {}}
+        for shards in shard_counts:
+            with ShardedEngine(shards, self.btree.t) as engine:
+                engine.load(self.array_data)
+                for structure in sharded:
+                    # One untimed round trip so process and pipe start-up costs stay out of the timings
+                    engine.execute(structure, workload['search'][:batch_size], batch_size)
+                    sharded[structure][shards] = {}
+                    for operation, requests in workload.items():
+                        start_time = time.perf_counter()
+                        engine.execute(structure, requests, batch_size)
+                        elapsed = time.perf_counter() - start_time
+                        sharded[structure][shards][operation] = {
+                            "elapsed_time": elapsed,
+                            "throughput": len(requests) / elapsed if elapsed > 0 else 0
+                        }
+            print(f"{shards} shards: " + ", ".join(
+                f"{structure} search {sharded[structure][shards]['search']['throughput']:.0f} ops/s"
+                for structure in sharded))
+
+        # Single-process baseline from the regular sequential benchmark, run on a separate copy
+        # of the dataset because it mutates the structures
+        print("\nLoading a separate copy of the dataset for the single-process baseline...")
+        with DataStructureComparison(type(self.btree), self.indexed_array is not None, self.btree.t,
+                                     self.columnar, self.lazy, self.seed) as copy:
+            copy.load_data(self.file_path)
+            single = copy.benchmark_operations(operations)
+        baseline = {
+            structure: {operation: len(times) / times.total if times.total > 0 else 0
+                        for operation, times in single[structure].items() if operation in workload}
+            for structure in sharded
+        }
+
+        print("\nScaling against the single-process benchmark:")
+        for structure, by_shards in sharded.items():
+            for shards, by_operation in by_shards.items():
+                for operation, point in by_operation.items():
+                    speedup = point["throughput"] / baseline[structure][operation] if baseline[structure][operation] else 0
+                    point["speedup"] = speedup
+                    point["efficiency"] = speedup / shards
+                print(f"{structure} with {shards} shards: " + ", ".join(
+                    f"{operation} {point['speedup']:.2f}x ({point['efficiency']:.0%})"
+                    for operation, point in by_operation.items()))
+
+        return {"baseline": baseline, "sharded": sharded}
+
+    def benchmark_open_loop(self, rates=(1000, 2000, 5000, 10000, 20000, 50000, 100000), duration=1.0,
+                            arrival='poisson', operation='search', seed=0):
+        """Benchmark each structure with an open-loop driver at a sweep of arrival rates
+        Args:
+            rates: Target arrival rates in operations per second
+            duration: Seconds of arrivals per rate
+            arrival: 'poisson' or 'constant' inter-arrival times
+            operation: 'search' or 'update', applied to random existing keys
+            seed: Seed for the keys and the arrival times
+        Returns:
+            Dictionary with latency percentiles per structure and rate, and the
+            saturation rate of each structure (the highest rate it kept up with)
+        """
+        if operation not in ('search', 'update'):
+            raise ValueError("operation must be 'search' or 'update'")
+
+        existing_keys = [k for k, _ in self.array_data]
+        driver = OpenLoopDriver(arrival, seed)
+
+        print("\nRunning open-loop benchmark...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Operation: {operation}, {arrival} arrivals, {duration} seconds per rate")
+
+        curves = {}
+        saturation = {}
+        for name, operations in self._benchmark_structures().items():
+            function = operations[operation]
+            rng = random.Random(seed)
+            curves[name] = []
+            saturation[name] = None
+            print(f"\n{name}:")
+            for rate in sorted(rates):
+                keys = [rng.choice(existing_keys) for _ in range(max(1, int(rate * duration)))]
+                if operation == 'update':
+                    requests = [(function, (key, value)) for key, value in
+                                zip(keys, self.generate_test_values(keys, updated=True))]
+                else:
+                    requests = [(function, (key,)) for key in keys]
+
+                # A structure that falls far behind is cut off rather than left to drain its backlog
+                run = driver.run(requests, rate, time_limit=duration * 5)
+                latencies = run["latencies"]
+                achieved = run["completed"] / run["elapsed_time"] if run["elapsed_time"] > 0 else 0
+                point = {
+                    "rate": rate,
+                    "achieved_rate": achieved,
+                    "offered": run["offered"],
+                    "completed": run["completed"],
+                    "mean_latency": latencies.mean(),
+                    "p50_latency": latencies.percentile(50),
+                    "p90_latency": latencies.percentile(90),
+                    "p99_latency": latencies.percentile(99),
+                    "p99_9_latency": latencies.percentile(99.9),
+                    "max_latency": latencies.max or 0,
+                    "saturated": run["completed"] < run["offered"] or achieved < 0.9 * rate
+                }
+                curves[name].append(point)
+                print(f"  {rate} ops/s offered: {achieved:.0f} ops/s achieved, "
+                      f"p50 {point['p50_latency']:.9f} s, p99 {point['p99_latency']:.9f} s"
+                      f"{' (saturated)' if point['saturated'] else ''}")
+                if point["saturated"]:
+                    # Higher rates only queue up more work
+                    break
+                saturation[name] = rate
+
+        print("\nSaturation points:")
+        for name, rate in saturation.items():
+            print(f"{name}: {rate if rate is not None else f'below {min(rates)}'} ops/s")
+
+        return {"curves": curves, "saturation": saturation}
+
+    def benchmark_workload(self, workload='read_mostly', distribution='zipfian', operations=1000, seed=0):
+        """Run one seeded mixed operation stream against every structure
+        Args:
+            workload: Operation mix name from module.workload.WORKLOADS, or a dict of operation -> share
+            distribution: Key chooser: 'uniform', 'zipfian', 'latest' or 'hotspot'
+            operations: Length of the stream
+            seed: Seed for the stream, so every structure and every run sees the same operations
+        Returns:
+            Dictionary of structure -> operation -> list of times, as benchmark_operations
+        """
+        stream = generate_workload([k for k, _ in self.array_data], workload, distribution, operations, seed)
+
+        # Payloads are generated once, outside the timed loop, and shared by all structures
+        requests = [(operation, args) for operation, *args in stream]
+        for kind, updated in (('insert', False), ('update', True)):
+            pending = [args for operation, args in requests if operation == kind]
+            for args, value in zip(pending, self.generate_test_values([args[0] for args in pending], updated)):
+                args.append(value)
+        kinds = sorted({operation for operation, _ in requests})
+
+        print("\nRunning workload benchmark...")
+        print("=" * 50)
+        print(f"Dataset size: {len(self.array_data)} records")
+        print(f"Workload: {workload}, {distribution} keys, {len(requests)} operations")
+        print(f"Operation counts: {', '.join(f'{k} {sum(1 for o, _ in requests if o == k)}' for k in kinds)}")
+
+        results = {}
+        for name, ops in self._benchmark_structures().items():
+            missing = [operation for operation in kinds if operation not in ops]
+            if missing:
+                # e.g. LegacyBTree has no range scan
+                print(f"{name}: skipped, no {', '.join(missing)} operation")
+                continue
+            results[name] = {operation: LatencyHistogram() for operation in kinds}
+            for operation, args in requests:
+                start_time = time.perf_counter()
+                if operation == 'range':
+                    deque(ops['range'](*args), maxlen=0)  # Consume the whole range
+                else:
+                    ops[operation](*args)
+                results[name][operation].append(time.perf_counter() - start_time)
+            total_time = sum(times.total for times in results[name].values())
+            print(f"{name}: {len(requests) / total_time if total_time > 0 else 0:.0f} ops/s")
+
+        return results
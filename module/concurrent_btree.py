@@ -0,0 +1,272 @@
+import threading
+from bisect import bisect_left, bisect_right
+from module.btree import BTree, BTreeNode
+
+class RWLatch:
+    """Reader/writer latch: any number of readers or a single writer"""
+    __slots__ = ('_cond', '_readers', '_writer')
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+class LatchedBTreeNode(BTreeNode):
+    __slots__ = ('latch',)
+
+    def __init__(self, leaf=True):
+        super().__init__(leaf)
+        self.latch = RWLatch()
+
+class ConcurrentBTree(BTree):
+    """BTree whose search/insert/update/delete may be called from many threads
+
+    Operations descend with latch coupling: a child's latch is taken before
+    the parent's is released. Searches and updates take shared latches,
+    updates taking an exclusive one only on the node holding the key; inserts
+    and deletes take exclusive ones. Because inserts split full children and
+    deletes top up small children on the way down, a writer never goes back
+    up the tree and holds at most a parent, a child and the child's siblings
+    at once. The
+    root pointer has its own latch, acting as the root's parent.
+
+    Bulk loading, batch operations and iteration are inherited unlatched and
+    must not run alongside other operations.
+    """
+    node_class = LatchedBTreeNode
+    thread_safe = True
+
+    def __init__(self, t=3):
+        super().__init__(t)
+        self.root_latch = RWLatch()
+
+    def search(self, key):
+        self.root_latch.acquire_read()
+        node = self.root
+        node.latch.acquire_read()
+        self.root_latch.release_read()
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                value = node.values[i]
+                node.latch.release_read()
+                return value
+            if node.leaf:
+                node.latch.release_read()
+                return None
+            child = node.children[i]
+            child.latch.acquire_read()
+            node.latch.release_read()
+            node = child
+
+    def update(self, key, new_value):
+        """Update value for existing key
+
+        Descends with shared latches like search, and retakes the latch of the
+        node holding the key as exclusive. The parent stays latched meanwhile,
+        so the node can't be split or merged, but a writer already inside it may
+        have changed its keys, so they are checked again.
+        """
+        self.root_latch.acquire_read()
+        release_parent = self.root_latch.release_read
+        node = self.root
+        node.latch.acquire_read()
+        exclusive = False
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                if not exclusive:
+                    node.latch.release_read()
+                    node.latch.acquire_write()
+                    exclusive = True
+                    continue
+                node.values[i] = new_value
+                node.latch.release_write()
+                release_parent()
+                return True
+            release = node.latch.release_write if exclusive else node.latch.release_read
+            if node.leaf:
+                release()
+                release_parent()
+                return False
+            child = node.children[i]
+            child.latch.acquire_read()
+            release_parent()
+            release_parent = release
+            node = child
+            exclusive = False
+
+    def insert(self, key, value):
+        max_keys = 2 * self.t - 1
+        self.root_latch.acquire_write()
+        node = self.root
+        node.latch.acquire_write()
+        if len(node.keys) == max_keys:
+            new_root = self.node_class(False)
+            new_root.latch.acquire_write()
+            new_root.children.append(node)
+            self._split_child(new_root, 0)
+            self.root = new_root
+            node.latch.release_write()
+            node = new_root
+        self.root_latch.release_write()
+
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            child = node.children[i]
+            child.latch.acquire_write()
+            if len(child.keys) == max_keys:
+                # The new right half is only reachable through node, which we hold
+                self._split_child(node, i)
+                if key > node.keys[i]:
+                    child.latch.release_write()
+                    child = node.children[i + 1]
+                    child.latch.acquire_write()
+            node.latch.release_write()
+            node = child
+
+        i = bisect_right(node.keys, key)
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+        node.latch.release_write()
+
+    def delete(self, key):
+        """Delete key from the tree, returns True if it was found"""
+        t = self.t
+        self.root_latch.acquire_write()
+        holds_root_latch = True
+        node = self.root
+        node.latch.acquire_write()
+        found = False
+
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+
+            if i < len(keys) and keys[i] == key:
+                if node.leaf:
+                    del keys[i]
+                    del node.values[i]
+                    found = True
+                    break
+
+                left = node.children[i]
+                right = node.children[i + 1]
+                left.latch.acquire_write()
+                right.latch.acquire_write()
+                if len(left.keys) >= t:
+                    right.latch.release_write()
+                    key, node.values[i] = self._get_predecessor(left)
+                    keys[i] = key
+                    child = left
+                elif len(right.keys) >= t:
+                    left.latch.release_write()
+                    key, node.values[i] = self._get_successor(right)
+                    keys[i] = key
+                    child = right
+                else:
+                    self._merge(node, i)
+                    right.latch.release_write()
+                    child = left
+            else:
+                if node.leaf:
+                    break
+                child = self._fill_latched(node, i)
+
+            if holds_root_latch:
+                if not node.keys:
+                    # The root's last key moved into its merged child
+                    self.root = child
+                self.root_latch.release_write()
+                holds_root_latch = False
+            node.latch.release_write()
+            node = child
+
+        node.latch.release_write()
+        if holds_root_latch:
+            self.root_latch.release_write()
+        return found
+
+    def _fill_latched(self, node, index):
+        """Latch the child to descend into, topping it up to t keys first
+
+        Mirrors BTree._fill, also latching the siblings it borrows from or
+        merges with. Returns the latched child, which is the left sibling
+        when the child was merged into it.
+        """
+        child = node.children[index]
+        child.latch.acquire_write()
+        if len(child.keys) >= self.t:
+            return child
+
+        prev_sibling = node.children[index - 1] if index != 0 else None
+        next_sibling = node.children[index + 1] if index != len(node.keys) else None
+        for sibling in (prev_sibling, next_sibling):
+            if sibling is not None:
+                sibling.latch.acquire_write()
+
+        if prev_sibling is not None and len(prev_sibling.keys) >= self.t:
+            self._borrow_from_prev(node, index)
+        elif next_sibling is not None and len(next_sibling.keys) >= self.t:
+            self._borrow_from_next(node, index)
+        elif next_sibling is not None:
+            self._merge(node, index)
+        else:
+            self._merge(node, index - 1)
+            child.latch.release_write()
+            child, prev_sibling = prev_sibling, None
+
+        for sibling in (prev_sibling, next_sibling):
+            if sibling is not None:
+                sibling.latch.release_write()
+        return child
+
+    def _get_predecessor(self, node):
+        # node is latched by the caller; the path below it is crabbed with shared latches
+        current = node
+        while not current.leaf:
+            child = current.children[-1]
+            child.latch.acquire_read()
+            if current is not node:
+                current.latch.release_read()
+            current = child
+        key, value = current.keys[-1], current.values[-1]
+        if current is not node:
+            current.latch.release_read()
+        return key, value
+
+    def _get_successor(self, node):
+        current = node
+        while not current.leaf:
+            child = current.children[0]
+            child.latch.acquire_read()
+            if current is not node:
+                current.latch.release_read()
+            current = child
+        key, value = current.keys[0], current.values[0]
+        if current is not node:
+            current.latch.release_read()
+        return key, value
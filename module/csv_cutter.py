@@ -1,13 +1,196 @@
-import pandas as pd
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from module.data_config import FIELD_RULES, generate_columns
 
-# Đọc file CSV gốc
-df = pd.read_csv('customers-2000000.csv')
+# Cuts stream the input line by line, copying rows as raw lines: quoted fields
+# spanning several lines are not supported (the customer datasets have none)
 
-# Số dòng muốn cắt (ví dụ: 100)
-num_records = 1000000
+def _default_output(input_path, label):
+    name, extension = os.path.splitext(input_path)
+    return f"{name}-{label}{extension or '.csv'}"
 
-# Lấy phần cần cắt
-df_cut = df.head(num_records)
+def head(input_path, output_path, rows):
+    """Copy the header and the first rows lines, returns the number of rows written"""
+    written = 0
+    with open(input_path, 'rb') as source, open(output_path, 'wb') as target:
+        target.write(source.readline())
+        for line in source:
+            if written == rows:
+                break
+            target.write(line)
+            written += 1
+    return written
 
-# Lưu vào file mới
-df_cut.to_csv(f'customers-{num_records}.csv', index=False)
\ No newline at end of file
+def sample(input_path, output_path, rows=None, fraction=None, seed=0):
+    """Write a random sample of the rows, keeping their order in the file
+    Args:
+        rows: Exact sample size, drawn by reservoir sampling (holds rows lines in memory)
+        fraction: Keep each row with this probability instead (constant memory)
+    Returns:
+        Number of rows written
+    """
+    if (rows is None) == (fraction is None):
+        raise ValueError("Give either rows or fraction")
+    rng = random.Random(seed)
+    with open(input_path, 'rb') as source, open(output_path, 'wb') as target:
+        target.write(source.readline())
+        if fraction is not None:
+            written = 0
+            for line in source:
+                if rng.random() < fraction:
+                    target.write(line)
+                    written += 1
+            return written
+
+        reservoir = []
+        for i, line in enumerate(source):
+            if i < rows:
+                reservoir.append((i, line))
+            else:
+                j = rng.randrange(i + 1)
+                if j < rows:
+                    reservoir[j] = (i, line)
+        reservoir.sort()
+        target.writelines(line for _, line in reservoir)
+    return len(reservoir)
+
+def shuffle(input_path, output_path, seed=0, bucket_bytes=64 * 1024 * 1024):
+    """Write the rows in random order, holding about bucket_bytes of rows in memory at a time
+
+    Rows are first scattered at random into temporary bucket files, then
+    each bucket is shuffled in memory and appended to the output.
+    Returns the number of rows written.
+    """
+    rng = random.Random(seed)
+    buckets = max(1, -(-os.path.getsize(input_path) // bucket_bytes))
+    written = 0
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"bucket-{i}") for i in range(buckets)]
+        with open(input_path, 'rb') as source:
+            header = source.readline()
+            files = [open(path, 'wb') for path in paths]
+            try:
+                for line in source:
+                    if not line.endswith(b'\n'):
+                        line += b'\n'
+                    files[rng.randrange(buckets)].write(line)
+            finally:
+                for f in files:
+                    f.close()
+
+        with open(output_path, 'wb') as target:
+            target.write(header)
+            for path in paths:
+                with open(path, 'rb') as f:
+                    lines = f.readlines()
+                rng.shuffle(lines)
+                target.writelines(lines)
+                written += len(lines)
+    return written
+
+def _synth_chunk(args):
+    """CSV text for keys first_key .. first_key + rows - 1, seeded by (seed, chunk index)"""
+    first_key, rows, seed, chunk = args
+    columns = generate_columns(range(first_key, first_key + rows), seed=[seed, chunk])
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(zip(*columns.values()))
+    return buffer.getvalue()
+
+def synthesize(output_path, rows, first_key=1, chunk_size=100000, workers=None, seed=0):
+    """Write rows generated from FIELD_RULES, chunks being generated by a pool of worker processes
+
+    At most two chunks per worker are generated or waiting to be written at
+    any time, so memory stays bounded when the disk is slower than the workers.
+    Args:
+        first_key: Key of the first row; keys are consecutive
+        chunk_size: Rows generated per task
+        workers: Worker processes, defaults to the CPU count
+        seed: The output is the same for the same seed and chunk_size, whatever the worker
+            count
+    Returns:
+        Number of rows written
+    """
+    tasks = [(first_key + start, min(chunk_size, rows - start), seed, chunk)
+             for chunk, start in enumerate(range(0, rows, chunk_size))]
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    written = 0
+    with open(output_path, 'w', newline='') as target:
+        target.write(','.join(FIELD_RULES) + '\n')
+
+        def write_oldest(pending):
+            # Chunks are written in submission order, so the file comes out sorted by key
+            nonlocal written
+            chunk_rows, result = pending.popleft()
+            target.write(result.get())
+            written += chunk_rows
+            elapsed = time.perf_counter() - start_time
+            print(f"Progress: {written}/{rows} rows ({written / elapsed if elapsed > 0 else 0:.0f} rows/s)")
+
+        with multiprocessing.Pool(workers) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append((task[1], pool.apply_async(_synth_chunk, (task,))))
+                if len(pending) == workers * 2:
+                    write_oldest(pending)
+            while pending:
+                write_oldest(pending)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cut or synthesize customer CSV datasets")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    head_parser = commands.add_parser('head', help="Keep the first N rows")
+    head_parser.add_argument('input')
+    head_parser.add_argument('-n', '--rows', type=int, required=True)
+    head_parser.add_argument('-o', '--output')
+
+    sample_parser = commands.add_parser('sample', help="Keep a random sample of the rows, in file order")
+    sample_parser.add_argument('input')
+    size = sample_parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('-n', '--rows', type=int)
+    size.add_argument('--fraction', type=float)
+    sample_parser.add_argument('--seed', type=int, default=0)
+    sample_parser.add_argument('-o', '--output')
+
+    shuffle_parser = commands.add_parser('shuffle', help="Write the rows in random order")
+    shuffle_parser.add_argument('input')
+    shuffle_parser.add_argument('--seed', type=int, default=0)
+    shuffle_parser.add_argument('--bucket-mb', type=int, default=64, help="Rows held in memory at a time")
+    shuffle_parser.add_argument('-o', '--output')
+
+    synth_parser = commands.add_parser('synth', help="Generate N rows from FIELD_RULES")
+    synth_parser.add_argument('-n', '--rows', type=int, required=True)
+    synth_parser.add_argument('--first-key', type=int, default=1)
+    synth_parser.add_argument('--chunk-size', type=int, default=100000)
+    synth_parser.add_argument('--workers', type=int)
+    synth_parser.add_argument('--seed', type=int, default=0)
+    synth_parser.add_argument('-o', '--output')
+
+    args = parser.parse_args(argv)
+    start_time = time.perf_counter()
+    if args.command == 'head':
+        output = args.output or _default_output(args.input, f"head{args.rows}")
+        written = head(args.input, output, args.rows)
+    elif args.command == 'sample':
+        label = f"sample{args.rows}" if args.rows is not None else f"sample{args.fraction:g}"
+        output = args.output or _default_output(args.input, label)
+        written = sample(args.input, output, args.rows, args.fraction, args.seed)
+    elif args.command == 'shuffle':
+        output = args.output or _default_output(args.input, "shuffled")
+        written = shuffle(args.input, output, args.seed, args.bucket_mb * 1024 * 1024)
+    else:
+        output = args.output or os.path.join("data", f"customers-{args.rows}.csv")
+        written = synthesize(output, args.rows, args.first_key, args.chunk_size, args.workers, args.seed)
+    print(f"Wrote {written} rows to {output} in {time.perf_counter() - start_time:.2f} seconds")
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
 import random
 from datetime import datetime, timedelta
+import numpy as np
+
+# Generated dates count back from this fixed day, so a seed gives the same data on any day
+REFERENCE_DATE = datetime(2025, 1, 1)
 
 # Data generation rules for each field
 FIELD_RULES = {
@@ -63,8 +67,8 @@ FIELD_RULES = {
     }
 }
 
-def generate_field_value(field_name, key, existing_data=None):
-    """Generate a value for a specific field based on its rules"""
+def generate_field_value(field_name, key, existing_data=None, reference_date=REFERENCE_DATE):
+    """Generate a value for a specific field based on its rules; dates count back from reference_date"""
     if field_name not in FIELD_RULES:
         return None
         
@@ -93,9 +97,9 @@ def generate_field_value(field_name, key, existing_data=None):
         return f"user{key}@example.com"
         
     elif field_type == 'date':
-        # Generate a random date within the last 5 years
+        # Generate a random date within the 5 years before reference_date
         days_ago = random.randint(0, 365 * 5)
-        date = datetime.now() - timedelta(days=days_ago)
+        date = reference_date - timedelta(days=days_ago)
         return date.strftime(rule['format'])
         
     elif field_type == 'url':
@@ -106,9 +110,82 @@ def generate_field_value(field_name, key, existing_data=None):
         
     return None
 
-def generate_record(key, existing_data=None):
+def generate_record(key, existing_data=None, reference_date=REFERENCE_DATE):
     """Generate a complete record with all fields"""
     record = {}
     for field_name in FIELD_RULES:
-        record[field_name] = generate_field_value(field_name, key, existing_data)
-    return record 
\ No newline at end of file
+        record[field_name] = generate_field_value(field_name, key, existing_data, reference_date)
+    return record
+
+def _join(*parts):
+    """Concatenate string constants and NumPy arrays element-wise"""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+def generate_column(field_name, keys, rng, reference_date=REFERENCE_DATE, key_text=None):
+    """Generate one field for every key at once, as a list
+    Args:
+        keys: Integer NumPy array of keys
+        rng: numpy.random.Generator used for the random fields
+        reference_date: Datetime the 'date' fields count back from
+        key_text: keys.astype(str), when the caller already has it
+    """
+    if field_name not in FIELD_RULES:
+        return [None] * len(keys)
+
+    rule = FIELD_RULES[field_name]
+    field_type = rule['type']
+    count = len(keys)
+    if key_text is None and field_type in ('string', 'email', 'url'):
+        key_text = keys.astype(str)
+
+    if field_type == 'key':
+        return keys.tolist()
+
+    elif field_type == 'string':
+        return _join(rule.get('prefix', ''), key_text).tolist()
+
+    elif field_type == 'phone':
+        country_code = rng.integers(1, 100, count).astype(str)
+        area_code = rng.integers(100, 1000, count).astype(str)
+        number = rng.integers(1000000, 10000000, count).astype(str)
+        return _join('+', country_code, '-', area_code, '-', number).tolist()
+
+    elif field_type == 'email':
+        # Matches generate_record, which has no name data to build the address from
+        return _join('user', key_text, '@example.com').tolist()
+
+    elif field_type == 'date':
+        # Random dates within the 5 years before reference_date
+        reference_day = np.datetime64(reference_date.date(), 'D')
+        dates = reference_day - rng.integers(0, 365 * 5 + 1, count).astype('timedelta64[D]')
+        if rule['format'] == '%Y-%m-%d':
+            return np.datetime_as_string(dates, unit='D').tolist()
+        return [date.strftime(rule['format']) for date in dates.astype(datetime)]
+
+    elif field_type == 'url':
+        return _join('https://www.company', key_text, '.com').tolist()
+
+    return [None] * count
+
+def generate_columns(keys, seed=None, reference_date=REFERENCE_DATE):
+    """Generate every field for a batch of keys, column by column
+    Args:
+        keys: Iterable of integer keys
+        seed: Integer seed or numpy.random.Generator, so batches are reproducible
+        reference_date: Datetime the 'date' fields count back from
+    Returns:
+        Dictionary of field name -> list of values, in FIELD_RULES order
+    """
+    keys = np.asarray(list(keys), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    key_text = keys.astype(str)
+    return {field_name: generate_column(field_name, keys, rng, reference_date, key_text)
+            for field_name in FIELD_RULES}
+
+def generate_records(keys, seed=None, reference_date=REFERENCE_DATE):
+    """Batch version of generate_record: one record dict per key, built from generated columns"""
+    columns = generate_columns(keys, seed, reference_date)
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
@@ -0,0 +1,113 @@
+import sys
+
+# Marks a deleted slot so positions of later records stay valid
+_TOMBSTONE = object()
+
+class IndexedArray:
+    """Array store with a key -> position hash index and tombstoned deletes
+
+    Keys are unique: inserting an existing key replaces its value. Deleted
+    slots are tombstoned instead of popped, and the arrays are compacted once
+    tombstones exceed compact_ratio of the slots.
+    """
+
+    def __init__(self, compact_ratio=0.25):
+        self.keys = []
+        self.values = []
+        self.index = {}
+        self.compact_ratio = compact_ratio
+        self.tombstones = 0
+        self.compactions = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def bulk_load(self, pairs):
+        """Replace the contents with (key, value) pairs, keeping the first of duplicate keys"""
+        self.keys = []
+        self.values = []
+        self.index = {}
+        self.tombstones = 0
+        for key, value in pairs:
+            if key not in self.index:
+                self.index[key] = len(self.keys)
+                self.keys.append(key)
+                self.values.append(value)
+
+    def insert_many(self, pairs):
+        """Append (key, value) pairs, keeping the first of duplicate keys like bulk_load"""
+        for key, value in pairs:
+            if key not in self.index:
+                self.index[key] = len(self.keys)
+                self.keys.append(key)
+                self.values.append(value)
+
+    def search(self, key):
+        i = self.index.get(key)
+        if i is None:
+            return None
+        return self.values[i]
+
+    def range(self, lo, hi):
+        """Yield (key, value) pairs with lo <= key <= hi, in slot order
+
+        The hash index cannot narrow a range, so every live slot is checked.
+        """
+        values = self.values
+        for key, i in self.index.items():
+            if lo <= key <= hi:
+                yield key, values[i]
+
+    def insert(self, key, value):
+        i = self.index.get(key)
+        if i is not None:
+            self.values[i] = value
+            return
+        self.index[key] = len(self.keys)
+        self.keys.append(key)
+        self.values.append(value)
+
+    def update(self, key, new_value):
+        """Update value for existing key"""
+        i = self.index.get(key)
+        if i is None:
+            return False
+        self.values[i] = new_value
+        return True
+
+    def delete(self, key):
+        """Delete key, returns True if it was found"""
+        i = self.index.pop(key, None)
+        if i is None:
+            return False
+        self.keys[i] = _TOMBSTONE
+        self.values[i] = None
+        self.tombstones += 1
+        if self.tombstones > self.compact_ratio * len(self.keys):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop tombstoned slots and rebuild the index"""
+        live = [i for i, key in enumerate(self.keys) if key is not _TOMBSTONE]
+        self.keys = [self.keys[i] for i in live]
+        self.values = [self.values[i] for i in live]
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.tombstones = 0
+        self.compactions += 1
+
+    def memory_usage(self):
+        """Bytes used by the hash index compared to the array slots it indexes"""
+        # Slot numbers from -5 to 256 are interpreter-cached, and an int object
+        # shared by several entries is only stored once
+        slots = {id(i): i for i in self.index.values() if not -5 <= i <= 256}
+        index_bytes = sys.getsizeof(self.index) + sum(sys.getsizeof(i) for i in slots.values())
+        array_bytes = sys.getsizeof(self.keys) + sys.getsizeof(self.values)
+        return {
+            "index_memory_bytes": index_bytes,
+            "array_memory_bytes": array_bytes,
+            "index_overhead_ratio": index_bytes / array_bytes if array_bytes else 0,
+            "live_records": len(self.index),
+            "tombstones": self.tombstones,
+            "compactions": self.compactions
+        }
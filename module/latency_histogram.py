@@ -0,0 +1,110 @@
+from array import array
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with log-linear buckets (HDR histogram style)
+
+    Latencies are recorded in whole nanoseconds. Values below
+    2**sub_bucket_bits get a bucket each; above that every power-of-two range
+    is split into 2**(sub_bucket_bits - 1) equal buckets, so a bucket is never
+    wider than 1/2**(sub_bucket_bits - 1) of the values in it (under 1.6% by
+    default). Values above highest_seconds land in the last bucket. Count,
+    total, min and max are kept exactly.
+
+    append() is an alias of record(), so a histogram can stand in for the
+    list of timings the benchmarks used to keep.
+    """
+
+    def __init__(self, highest_seconds=3600, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.highest = int(highest_seconds * 1e9)
+        self.counts = array('q', [0]) * (self._index(self.highest) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, nanoseconds):
+        shift = nanoseconds.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return nanoseconds
+        return shift * self.sub_bucket_half + (nanoseconds >> shift)
+
+    def _bucket_upper(self, index):
+        """Largest nanosecond value that falls in bucket index"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.sub_bucket_half - 1
+        return ((index - shift * self.sub_bucket_half + 1) << shift) - 1
+
+    def record(self, seconds):
+        nanoseconds = min(max(int(seconds * 1e9), 0), self.highest)
+        self.counts[self._index(nanoseconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    append = record
+
+    def extend(self, values):
+        for seconds in values:
+            self.record(seconds)
+
+    def merge(self, other):
+        """Add the recordings of another histogram with the same layout"""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def __len__(self):
+        return self.count
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, q):
+        """Latency in seconds at or below which q percent (0-100) of recordings fall"""
+        if not self.count:
+            return 0
+        if q >= 100:
+            return self.max
+        target = max(1, -(-q * self.count // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                # Bucket bounds can overshoot the exact extremes
+                return min(max(self._bucket_upper(index) / 1e9, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean, min, max and tail percentiles, all in seconds"""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.min or 0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p99_9": self.percentile(99.9),
+            "max": self.max or 0
+        }
+
+    def cdf(self):
+        """(latency in seconds, fraction of recordings at or below it) for every non-empty bucket"""
+        points = []
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                points.append((min(self._bucket_upper(index) / 1e9, self.max), seen / self.count))
+        return points
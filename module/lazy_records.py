@@ -0,0 +1,154 @@
+import csv
+import mmap
+import os
+import sys
+import threading
+from array import array
+
+# Boolean spellings pandas recognises, converted to int as _column_values does
+_BOOLEANS = {'True': 1, 'TRUE': 1, 'true': 1, 'False': 0, 'FALSE': 0, 'false': 0}
+
+# Empty cells are missing values: every converter returns None for them
+
+def _text_or_none(text):
+    return text if text else None
+
+def _bool_or_text(text):
+    if not text:
+        return None
+    return _BOOLEANS.get(text, text)
+
+def _int_or_text(text):
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+def _float_or_text(text):
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+_CONVERTERS = {bool: _bool_or_text, int: _int_or_text, float: _float_or_text, str: _text_or_none}
+
+def _value_kind(text):
+    """bool, int, float or str, whichever a non-empty cell parses as"""
+    if text in _BOOLEANS:
+        return bool
+    for kind in (int, float):
+        try:
+            kind(text)
+            return kind
+        except ValueError:
+            pass
+    return str
+
+class LazyRecordStore:
+    """Records left in a memory-mapped CSV file and decoded only when read
+
+    Structures hold the byte offset of each row's line instead of a record,
+    and get() parses that one line into a dict. Column types are inferred
+    from the first sample_rows rows. Records added after loading (inserts
+    and updates) are kept in memory and numbered from the file size up, so
+    their ids never collide with an offset. Quoted fields spanning several
+    lines are not supported.
+    """
+
+    def __init__(self, file_path, sample_rows=1000):
+        self.file_path = file_path
+        self.file = open(file_path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._line_end(0)
+        self.fields = self._parse_line(0, header_end, encoding='utf-8-sig')
+        self.data_start = header_end + 1
+        self.converters = self._infer_converters(sample_rows)
+        self.added = []
+        self.lock = threading.Lock()  # Ids of added records are handed out under the lock
+
+    def _line_end(self, offset):
+        end = self.mm.find(b'\n', offset)
+        return self.size if end == -1 else end
+
+    def _parse_line(self, start, end, encoding='utf-8'):
+        line = self.mm[start:end].rstrip(b'\r').decode(encoding)
+        return next(csv.reader([line]))
+
+    def _infer_converters(self, sample_rows):
+        """Converter per column for the type every non-empty sampled value parses as
+
+        Ints and floats mix to float, any other mix is text. Empty cells are
+        skipped, so a missing value doesn't turn a numeric column into text.
+        """
+        kinds = [None] * len(self.fields)
+        offset = self.data_start
+        for _ in range(sample_rows):
+            if offset >= self.size:
+                break
+            end = self._line_end(offset)
+            for i, text in enumerate(self._parse_line(offset, end)):
+                if not text or kinds[i] is str:
+                    continue
+                kind = _value_kind(text)
+                if kinds[i] is None or kinds[i] is kind:
+                    kinds[i] = kind
+                elif {kinds[i], kind} == {int, float}:
+                    kinds[i] = float
+                else:
+                    kinds[i] = str
+            offset = end + 1
+        return [_CONVERTERS[kind or str] for kind in kinds]
+
+    def scan(self):
+        """Key (first field) and line offset of every row, without decoding the other fields
+        Returns:
+            List of keys and an array('q') of offsets, in file order
+        """
+        convert = self.converters[0]
+        keys = []
+        offsets = array('q')
+        offset = self.data_start
+        self.mm.seek(offset)
+        # readline() on the map is the fastest way to step through lines from Python
+        for line in iter(self.mm.readline, b''):
+            comma = line.find(b',')
+            key = (line[:comma] if comma != -1 else line).rstrip(b'\r\n')
+            if key:  # Skip blank lines
+                keys.append(convert(key.decode().strip('"')))
+                offsets.append(offset)
+            offset += len(line)
+        return keys, offsets
+
+    def append(self, record):
+        """Keep a record added after loading in memory, returns its id"""
+        missing = [field for field in self.fields if field not in record]
+        if missing:
+            raise ValueError("Missing required fields in data")
+        with self.lock:
+            self.added.append(dict(record))
+            return self.size + len(self.added) - 1
+
+    def get(self, value):
+        """Decode the record at a line offset, or return a copy of an added record"""
+        if value >= self.size:
+            return dict(self.added[value - self.size])
+        row = self._parse_line(value, self._line_end(value))
+        return {field: convert(text) for field, convert, text in zip(self.fields, self.converters, row)}
+
+    def memory_usage(self):
+        """Bytes kept in memory for records, next to the size of the mapped file"""
+        added_bytes = sys.getsizeof(self.added) + sum(sys.getsizeof(record) for record in self.added)
+        return {
+            "file_bytes": self.size,
+            "added_records": len(self.added),
+            "added_bytes": added_bytes
+        }
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
@@ -0,0 +1,82 @@
+import sys
+import types
+
+# Objects never counted as part of a structure
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def deep_sizeof(obj, seen=None):
+    """Total bytes of obj and everything reachable from it, counting shared objects once
+
+    Follows dict, list, tuple and set contents and the attributes of objects
+    with __dict__ or __slots__. Pass the same seen set to several calls to
+    avoid counting objects already measured.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif not isinstance(current, (str, bytes, int, float, bool)):
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for cls in type(current).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    if hasattr(current, slot):
+                        stack.append(getattr(current, slot))
+    return total
+
+def array_memory(array_data):
+    """Deep size of the (key, record) array, split into list, entries, keys and payloads"""
+    seen = {id(array_data)}
+    entry_bytes = 0
+    key_bytes = 0
+    for entry in array_data:
+        seen.add(id(entry))
+        entry_bytes += sys.getsizeof(entry)
+        key_bytes += deep_sizeof(entry[0], seen)
+    payload_bytes = sum(deep_sizeof(entry[1], seen) for entry in array_data)
+    list_bytes = sys.getsizeof(array_data)
+    return {
+        "list_bytes": list_bytes,
+        "entry_bytes": entry_bytes,
+        "key_bytes": key_bytes,
+        "payload_bytes": payload_bytes,
+        "total_bytes": list_bytes + entry_bytes + key_bytes + payload_bytes
+    }
+
+def btree_memory(tree):
+    """Deep size of a BTree, split into nodes, key/value/child lists, keys and payloads"""
+    breakdown = {
+        "node_bytes": 0,
+        "key_list_bytes": 0,
+        "value_list_bytes": 0,
+        "child_list_bytes": 0,
+        "key_bytes": 0,
+        "payload_bytes": 0
+    }
+    seen = set()
+    nodes = [tree.root]
+    while nodes:
+        node = nodes.pop()
+        breakdown["node_bytes"] += sys.getsizeof(node)
+        breakdown["key_list_bytes"] += sys.getsizeof(node.keys)
+        breakdown["value_list_bytes"] += sys.getsizeof(node.values)
+        breakdown["child_list_bytes"] += sys.getsizeof(node.children)
+        for key in node.keys:
+            breakdown["key_bytes"] += deep_sizeof(key, seen)
+        for value in node.values:
+            breakdown["payload_bytes"] += deep_sizeof(value, seen)
+        nodes.extend(node.children)
+    breakdown["total_bytes"] = sum(breakdown.values())
+    return breakdown
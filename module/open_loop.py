@@ -0,0 +1,67 @@
+import random
+import time
+from module.latency_histogram import LatencyHistogram
+
+# Sleeps wake up to this much early and spin the rest, since time.sleep() overshoots
+_SLEEP_MARGIN = 0.002
+
+def arrival_offsets(rate, count, arrival='poisson', seed=0):
+    """Intended send times, in seconds from the start, of count operations at rate per second
+    Args:
+        arrival: 'poisson' for exponentially distributed gaps, 'constant' for even spacing
+    """
+    if arrival == 'constant':
+        return [i / rate for i in range(count)]
+    if arrival != 'poisson':
+        raise ValueError(f"Unknown arrival process: {arrival}")
+    rng = random.Random(seed)
+    offsets = []
+    offset = 0.0
+    for _ in range(count):
+        offsets.append(offset)
+        offset += rng.expovariate(rate)
+    return offsets
+
+class OpenLoopDriver:
+    """Issues operations on a fixed arrival schedule, whether or not earlier ones have finished
+
+    This is a single-threaded paced loop: it sleeps until each operation's
+    intended send time and runs the operation inline, like a single server
+    with a queue in front of it. Latency is measured from the intended send
+    time, so time spent waiting behind slower operations is counted instead
+    of silently delaying the next send.
+    """
+
+    def __init__(self, arrival='poisson', seed=0):
+        self.arrival = arrival
+        self.seed = seed
+
+    def run(self, requests, rate, time_limit=None):
+        """Issue requests at rate per second
+        Args:
+            requests: List of (function, args) tuples
+            time_limit: Stop issuing after this many seconds; the rest count as not completed
+        Returns:
+            Dictionary with a LatencyHistogram of completed requests, counts and elapsed time
+        """
+        offsets = arrival_offsets(rate, len(requests), self.arrival, self.seed)
+        latencies = LatencyHistogram()
+        start_time = time.perf_counter()
+        for (function, args), offset in zip(requests, offsets):
+            intended = start_time + offset
+            delay = intended - time.perf_counter()
+            if delay > _SLEEP_MARGIN:
+                time.sleep(delay - _SLEEP_MARGIN)
+            while time.perf_counter() < intended:
+                pass
+            if time_limit is not None and time.perf_counter() - start_time > time_limit:
+                break
+            function(*args)
+            latencies.append(time.perf_counter() - intended)
+
+        return {
+            "latencies": latencies,
+            "offered": len(requests),
+            "completed": latencies.count,
+            "elapsed_time": time.perf_counter() - start_time
+        }
@@ -0,0 +1,418 @@
+import mmap
+import os
+import pickle
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from module.btree import BTree
+
+_MAGIC = b'PBTREE01'
+# magic, page_size, t, root page, page count, heap offset, heap limit
+_HEADER = struct.Struct('<8sIIqqqq')
+# leaf flag, number of keys
+_NODE_HEADER = struct.Struct('<BH')
+# Bytes per key in a node page: key, value offset, value length, one child page id
+_BYTES_PER_KEY = 8 + 8 + 4 + 8
+
+class PagedNode:
+    __slots__ = ('page_id', 'leaf', 'keys', 'children', 'values', 'dirty')
+
+    def __init__(self, page_id, leaf=True):
+        self.page_id = page_id
+        self.leaf = leaf
+        self.keys = []
+        self.children = []  # Child page ids
+        self.values = []  # (file offset, length) of each pickled value
+        self.dirty = False
+
+class PagedBTree:
+    """B-tree kept in fixed-size pages of a single file, accessed through mmap
+
+    Page 0 holds the header; every other page is either a node or part of
+    the value heap where pickled values are appended. Decoded nodes are kept
+    in an LRU page cache of at most cache_pages entries, enforced between
+    operations, and dirty pages are written back when evicted or flushed.
+    Keys must be 64-bit integers. Space freed by deletes, merges and updates
+    is not reused.
+    """
+
+    def __init__(self, file_path, page_size=4096, cache_pages=1024, t=None):
+        self.file_path = file_path
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "page_reads": 0, "page_writes": 0}
+
+        if os.path.exists(file_path) and os.path.getsize(file_path) >= _HEADER.size:
+            self._file = open(file_path, 'r+b')
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            (magic, self.page_size, self.t, self.root, self.page_count,
+             self.heap_offset, self.heap_limit) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{file_path} is not a paged B-tree file")
+        else:
+            max_fit = (page_size - _NODE_HEADER.size - 8) // _BYTES_PER_KEY
+            if t is None:
+                t = (max_fit + 1) // 2
+            if 2 * t - 1 > max_fit:
+                raise ValueError(f"t={t} does not fit in {page_size}-byte pages (max t={(max_fit + 1) // 2})")
+            self.page_size = page_size
+            self.t = t
+            self._file = open(file_path, 'w+b')
+            self._file.truncate(page_size * 2)
+            self._mmap = mmap.mmap(self._file.fileno(), page_size * 2)
+            self.page_count = 1
+            self.heap_offset = 0
+            self.heap_limit = 0
+            self.root = self._new_node(True).page_id
+            self.flush()
+
+    # Page and cache management
+
+    def _ensure_size(self, size):
+        if size <= len(self._mmap):
+            return
+        new_size = max(size, len(self._mmap) * 2)
+        self._mmap.close()
+        self._file.truncate(new_size)
+        self._mmap = mmap.mmap(self._file.fileno(), new_size)
+
+    def _allocate_pages(self, count=1):
+        page_id = self.page_count
+        self.page_count += count
+        self._ensure_size(self.page_count * self.page_size)
+        return page_id
+
+    def _new_node(self, leaf):
+        node = PagedNode(self._allocate_pages(), leaf)
+        node.dirty = True
+        self.cache[node.page_id] = node
+        return node
+
+    def _node(self, page_id):
+        node = self.cache.get(page_id)
+        if node is not None:
+            self.cache.move_to_end(page_id)
+            self.stats["hits"] += 1
+            return node
+        self.stats["misses"] += 1
+        node = self._read_node(page_id)
+        self.cache[page_id] = node
+        return node
+
+    def _read_node(self, page_id):
+        offset = page_id * self.page_size
+        leaf, n = _NODE_HEADER.unpack_from(self._mmap, offset)
+        offset += _NODE_HEADER.size
+        node = PagedNode(page_id, bool(leaf))
+        fields = struct.unpack_from(f'<{n}q{n}q{n}I', self._mmap, offset)
+        node.keys = list(fields[:n])
+        node.values = list(zip(fields[n:2 * n], fields[2 * n:]))
+        if not node.leaf:
+            offset += n * 20
+            node.children = list(struct.unpack_from(f'<{n + 1}q', self._mmap, offset))
+        self.stats["page_reads"] += 1
+        return node
+
+    def _write_node(self, node):
+        n = len(node.keys)
+        offsets = [ref[0] for ref in node.values]
+        lengths = [ref[1] for ref in node.values]
+        children = node.children if not node.leaf else []
+        page = struct.pack(f'<BH{n}q{n}q{n}I{len(children)}q',
+                           int(node.leaf), n, *node.keys, *offsets, *lengths, *children)
+        start = node.page_id * self.page_size
+        self._mmap[start:start + len(page)] = page
+        node.dirty = False
+        self.stats["page_writes"] += 1
+
+    def _release(self):
+        """Evict least recently used pages down to the cache size, writing back dirty ones"""
+        while len(self.cache) > self.cache_pages:
+            _, node = self.cache.popitem(last=False)
+            if node.dirty:
+                self._write_node(node)
+            self.stats["evictions"] += 1
+
+    def _store_value(self, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if self.heap_offset + len(data) > self.heap_limit:
+            pages = max(1, -(-len(data) // self.page_size))
+            first_page = self._allocate_pages(pages)
+            self.heap_offset = first_page * self.page_size
+            self.heap_limit = (first_page + pages) * self.page_size
+        offset = self.heap_offset
+        self._mmap[offset:offset + len(data)] = data
+        self.heap_offset += len(data)
+        return offset, len(data)
+
+    def _load_value(self, ref):
+        offset, length = ref
+        return pickle.loads(self._mmap[offset:offset + length])
+
+    def flush(self):
+        """Write dirty pages and the header back to the file"""
+        for node in self.cache.values():
+            if node.dirty:
+                self._write_node(node)
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, self.page_size, self.t, self.root,
+                          self.page_count, self.heap_offset, self.heap_limit)
+        self._mmap.flush()
+
+    def drop_cache(self):
+        """Flush and empty the page cache, and ask the OS to drop the file's cached pages"""
+        self.flush()
+        self.cache.clear()
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(self._file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def close(self):
+        self.flush()
+        self._mmap.close()
+        self._file.close()
+
+    def cache_stats(self):
+        """Page cache counters and file size"""
+        stats = dict(self.stats)
+        stats.update({
+            "cache_pages": self.cache_pages,
+            "cached_pages": len(self.cache),
+            "page_size": self.page_size,
+            "page_count": self.page_count,
+            "file_bytes": self.page_count * self.page_size
+        })
+        return stats
+
+    # B-tree operations, mirroring BTree with nodes fetched through the page cache
+
+    def search(self, key):
+        try:
+            node = self._node(self.root)
+            while True:
+                i = bisect_left(node.keys, key)
+                if i < len(node.keys) and node.keys[i] == key:
+                    return self._load_value(node.values[i])
+                if node.leaf:
+                    return None
+                node = self._node(node.children[i])
+        finally:
+            self._release()
+
+    def update(self, key, new_value):
+        """Update value for existing key"""
+        try:
+            node = self._node(self.root)
+            while True:
+                i = bisect_left(node.keys, key)
+                if i < len(node.keys) and node.keys[i] == key:
+                    node.values[i] = self._store_value(new_value)
+                    node.dirty = True
+                    return True
+                if node.leaf:
+                    return False
+                node = self._node(node.children[i])
+        finally:
+            self._release()
+
+    def insert(self, key, value):
+        try:
+            max_keys = 2 * self.t - 1
+            node = self._node(self.root)
+            if len(node.keys) == max_keys:
+                new_root = self._new_node(False)
+                new_root.children.append(node.page_id)
+                self._split_child(new_root, 0)
+                self.root = new_root.page_id
+                node = new_root
+
+            while not node.leaf:
+                i = bisect_right(node.keys, key)
+                child = self._node(node.children[i])
+                if len(child.keys) == max_keys:
+                    self._split_child(node, i)
+                    if key > node.keys[i]:
+                        i += 1
+                    child = self._node(node.children[i])
+                node = child
+
+            i = bisect_right(node.keys, key)
+            node.keys.insert(i, key)
+            node.values.insert(i, self._store_value(value))
+            node.dirty = True
+        finally:
+            self._release()
+
+    def _split_child(self, parent, index):
+        t = self.t
+        child = self._node(parent.children[index])
+        new_node = self._new_node(child.leaf)
+
+        parent.children.insert(index + 1, new_node.page_id)
+        parent.keys.insert(index, child.keys[t - 1])
+        parent.values.insert(index, child.values[t - 1])
+
+        new_node.keys = child.keys[t:]
+        new_node.values = child.values[t:]
+        del child.keys[t - 1:]
+        del child.values[t - 1:]
+
+        if not child.leaf:
+            new_node.children = child.children[t:]
+            del child.children[t:]
+        parent.dirty = child.dirty = True
+
+    def delete(self, key):
+        """Delete key from the tree, returns True if it was found"""
+        try:
+            t = self.t
+            node = self._node(self.root)
+            found = False
+
+            while True:
+                keys = node.keys
+                i = bisect_left(keys, key)
+
+                if i < len(keys) and keys[i] == key:
+                    if node.leaf:
+                        del keys[i]
+                        del node.values[i]
+                        node.dirty = True
+                        found = True
+                        break
+
+                    left = self._node(node.children[i])
+                    right = self._node(node.children[i + 1])
+                    if len(left.keys) >= t:
+                        key, node.values[i] = self._get_predecessor(left)
+                        keys[i] = key
+                        node.dirty = True
+                        node = left
+                    elif len(right.keys) >= t:
+                        key, node.values[i] = self._get_successor(right)
+                        keys[i] = key
+                        node.dirty = True
+                        node = right
+                    else:
+                        self._merge(node, i)
+                        node = left
+                    continue
+
+                if node.leaf:
+                    break
+
+                if len(self._node(node.children[i]).keys) < t:
+                    self._fill(node, i)
+                    if i > len(keys):
+                        i -= 1
+                node = self._node(node.children[i])
+
+            root = self._node(self.root)
+            if len(root.keys) == 0 and not root.leaf:
+                self.root = root.children[0]
+            return found
+        finally:
+            self._release()
+
+    def _get_predecessor(self, node):
+        current = node
+        while not current.leaf:
+            current = self._node(current.children[-1])
+        return current.keys[-1], current.values[-1]
+
+    def _get_successor(self, node):
+        current = node
+        while not current.leaf:
+            current = self._node(current.children[0])
+        return current.keys[0], current.values[0]
+
+    def _fill(self, node, index):
+        if index != 0 and len(self._node(node.children[index - 1]).keys) >= self.t:
+            self._borrow_from_prev(node, index)
+        elif index != len(node.keys) and len(self._node(node.children[index + 1]).keys) >= self.t:
+            self._borrow_from_next(node, index)
+        else:
+            if index != len(node.keys):
+                self._merge(node, index)
+            else:
+                self._merge(node, index - 1)
+
+    def _borrow_from_prev(self, node, index):
+        child = self._node(node.children[index])
+        sibling = self._node(node.children[index - 1])
+
+        child.keys.insert(0, node.keys[index - 1])
+        child.values.insert(0, node.values[index - 1])
+
+        if not child.leaf:
+            child.children.insert(0, sibling.children.pop())
+
+        node.keys[index - 1] = sibling.keys.pop()
+        node.values[index - 1] = sibling.values.pop()
+        node.dirty = child.dirty = sibling.dirty = True
+
+    def _borrow_from_next(self, node, index):
+        child = self._node(node.children[index])
+        sibling = self._node(node.children[index + 1])
+
+        child.keys.append(node.keys[index])
+        child.values.append(node.values[index])
+
+        if not child.leaf:
+            child.children.append(sibling.children.pop(0))
+
+        node.keys[index] = sibling.keys.pop(0)
+        node.values[index] = sibling.values.pop(0)
+        node.dirty = child.dirty = sibling.dirty = True
+
+    def _merge(self, node, index):
+        child = self._node(node.children[index])
+        sibling = self._node(node.children[index + 1])
+
+        child.keys.append(node.keys[index])
+        child.values.append(node.values[index])
+
+        child.keys.extend(sibling.keys)
+        child.values.extend(sibling.values)
+
+        if not child.leaf:
+            child.children.extend(sibling.children)
+
+        del node.keys[index]
+        del node.values[index]
+        del node.children[index + 1]
+        node.dirty = child.dirty = True
+        # The sibling's page is no longer referenced
+        self.cache.pop(sibling.page_id, None)
+
+    def bulk_load(self, sorted_pairs, fill_factor=0.7):
+        """Replace the file contents with (key, value) pairs, built bottom-up
+
+        The tree shape comes from BTree.bulk_load; its nodes are then written
+        out level by level, followed by the values on the heap pages.
+        """
+        tree = BTree(t=self.t)
+        tree.bulk_load(sorted_pairs, fill_factor)
+
+        self.cache.clear()
+        self.page_count = 1
+        self.heap_offset = 0
+        self.heap_limit = 0
+
+        # Number the pages level by level so parents know their children's ids
+        levels = [[tree.root]]
+        while not levels[-1][0].leaf:
+            levels.append([child for node in levels[-1] for child in node.children])
+        page_ids = {}
+        for level in levels:
+            for node in level:
+                page_ids[id(node)] = self._allocate_pages()
+
+        for level in levels:
+            for node in level:
+                page = PagedNode(page_ids[id(node)], node.leaf)
+                page.keys = node.keys
+                page.values = [self._store_value(value) for value in node.values]
+                page.children = [page_ids[id(child)] for child in node.children]
+                self._write_node(page)
+
+        self.root = page_ids[id(tree.root)]
+        self.flush()
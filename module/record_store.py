@@ -0,0 +1,155 @@
+import sys
+import threading
+from array import array
+from module.memory_usage import deep_sizeof
+
+# Text columns with at most this share of distinct values in their first chunk are
+# interned, so repeated values share one string object. Mostly-unique columns
+# (ids, phones, emails) would gain nothing and pay for the lookups.
+POOL_MAX_DISTINCT_RATIO = 0.5
+
+class ColumnarRecordStore:
+    """Records stored column by column and addressed by integer row id
+
+    Integer and float columns are kept in typed arrays, text columns are
+    lists; in low-cardinality text columns repeated values share a single
+    interned string object. Records are
+    only built as dicts when read back with get(). Fields outside the
+    store's columns (e.g. the 'updated' flag set by benchmarks) are kept
+    per row in a sparse dict.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.columns = [[] for _ in self.fields]
+        self.pooled = [None] * len(self.fields)  # Per column: intern its strings? Decided on first text
+        self.extras = {}
+        self.rows = 0
+        self.lock = threading.Lock()  # Row ids are handed out under the lock
+
+    def __len__(self):
+        return self.rows
+
+    def extend_columns(self, columns):
+        """Append whole columns of converted values, returns the new row ids"""
+        first_row = self.rows
+        for i, values in enumerate(columns):
+            self.columns[i] = self._typed_column(i, values)
+        self.rows += len(columns[0]) if columns else 0
+        return range(first_row, self.rows)
+
+    def _typed_column(self, i, values):
+        existing = self.columns[i]
+        if isinstance(values, array):
+            # Already typed, e.g. a numeric column of the column cache
+            if not existing:
+                return values
+            if isinstance(existing, array) and existing.typecode == values.typecode:
+                existing.extend(values)
+                return existing
+            values = values.tolist()
+        if isinstance(existing, array) and existing:
+            # Later chunks of a streamed load keep the column typed when their values fit
+            if (existing.typecode == 'q' and all(type(v) is int for v in values)) or \
+               (existing.typecode == 'd' and all(type(v) is float for v in values)):
+                try:
+                    existing.extend(array(existing.typecode, values))
+                    return existing
+                except OverflowError:
+                    pass
+        if not existing and all(type(v) is int for v in values):
+            try:
+                return array('q', values)
+            except OverflowError:
+                pass
+        if not existing and all(type(v) is float for v in values):
+            return array('d', values)
+        if self.pooled[i] is None and values:
+            self.pooled[i] = len(set(values)) <= POOL_MAX_DISTINCT_RATIO * len(values)
+        if self.pooled[i]:
+            intern = sys.intern
+            values = [intern(v) if type(v) is str else v for v in values]
+        column = existing if isinstance(existing, list) else list(existing)
+        column.extend(values)
+        return column
+
+    def append(self, record):
+        """Store one record dict, returns its row id"""
+        missing = [field for field in self.fields if field not in record]
+        if missing:
+            raise ValueError("Missing required fields in data")
+
+        with self.lock:
+            row_id = self.rows
+            for i, field in enumerate(self.fields):
+                self._append_value(i, record[field])
+            extra = {k: v for k, v in record.items() if k not in self.fields}
+            if extra:
+                self.extras[row_id] = extra
+            self.rows += 1
+        return row_id
+
+    def _append_value(self, i, value):
+        column = self.columns[i]
+        if isinstance(column, array):
+            if (column.typecode == 'q' and type(value) is int) or \
+               (column.typecode == 'd' and type(value) is float):
+                try:
+                    column.append(value)
+                    return
+                except OverflowError:
+                    pass
+            # Value doesn't fit the typed column, fall back to a plain list
+            column = self.columns[i] = list(column)
+        if self.pooled[i] and type(value) is str:
+            value = sys.intern(value)
+        column.append(value)
+
+    def get(self, row_id):
+        """Materialize the record stored at row_id as a dict"""
+        record = {field: column[row_id] for field, column in zip(self.fields, self.columns)}
+        extra = self.extras.get(row_id)
+        if extra:
+            record.update(extra)
+        return record
+
+    def _list_value_bytes(self):
+        """Bytes of the objects held in list columns, each counted once"""
+        seen = set()
+        return sum(deep_sizeof(column, seen) - sys.getsizeof(column)
+                   for column in self.columns if not isinstance(column, array))
+
+    def dict_records_bytes(self, list_value_bytes=None):
+        """Bytes the same records take as one dict per row, as loaded without columnar storage
+
+        Counts every row's dict (extra fields included) and the values it
+        would hold: one int or float object per row for typed columns (small
+        ints are cached by Python and free), and the objects of list columns
+        once each, however many rows share them. Field names are not counted.
+        """
+        if not self.rows:
+            return 0
+        # A dict's size only depends on its keys, so rows without extras share one size
+        plain_size = sys.getsizeof(self.get(0) if 0 not in self.extras else dict.fromkeys(self.fields))
+        total = plain_size * (self.rows - len(self.extras))
+        total += sum(sys.getsizeof(self.get(row_id)) for row_id in self.extras)
+        for column in self.columns:
+            if isinstance(column, array):
+                total += sum(sys.getsizeof(v) for v in column if not (type(v) is int and -5 <= v <= 256))
+        return total + (self._list_value_bytes() if list_value_bytes is None else list_value_bytes)
+
+    def memory_usage(self):
+        """Measured bytes of the columns, string objects and extras (shared strings counted once),
+        next to the same records as dicts and the bytes saved"""
+        list_value_bytes = self._list_value_bytes()
+        columnar_bytes = (list_value_bytes + sys.getsizeof(self.columns) + deep_sizeof(self.extras)
+                          + sum(sys.getsizeof(column) for column in self.columns))
+        dict_bytes = self.dict_records_bytes(list_value_bytes)
+        return {
+            "rows": self.rows,
+            "columnar_bytes": columnar_bytes,
+            "dict_bytes": dict_bytes,
+            "saved_bytes": dict_bytes - columnar_bytes,
+            "saved_ratio": (dict_bytes - columnar_bytes) / dict_bytes if dict_bytes else 0,
+            "pooled_columns": [field for field, pooled in zip(self.fields, self.pooled) if pooled]
+        }
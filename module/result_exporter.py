@@ -3,6 +3,19 @@ import json
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
+from module.latency_histogram import LatencyHistogram
+
+# Display names used in plots for each result series
+STRUCTURE_LABELS = {
+    'array': 'Array',
+    'btree': 'B-tree',
+    'bplustree': 'B+ tree',
+    'sorted_array': 'Sorted Array',
+    'indexed_array': 'Hash-indexed Array',
+    'paged_btree_warm': 'Paged B-tree (warm)',
+    'paged_btree_cold': 'Paged B-tree (cold)',
+    'concurrent_btree': 'Concurrent B-tree'
+}
 
 class ResultExporter:
     def __init__(self):
@@ -18,26 +31,30 @@ class ResultExporter:
         os.makedirs(result_path)
         return result_path, timestamp
 
-    def _create_comparison_plot(self, results, dataset_name, mode, result_path):
-        """Create comparison plot for benchmark results"""
+    def _create_comparison_plot(self, results, dataset_name, mode, result_path, memory=None):
+        """Create comparison plot for benchmark results, with memory panels when measured"""
         # Prepare data for plotting
-        operations = ['Insert', 'Update', 'Delete', 'Search']
-        array_times = []
-        btree_times = []
-        
-        for op in operations:
-            op_lower = op.lower()
-            if op_lower in results['array'] and op_lower in results['btree']:
-                array_times.append(results['array'][op_lower]['average_time'])
-                btree_times.append(results['btree'][op_lower]['average_time'])
+        operations = ['Insert', 'Update', 'Delete', 'Search', 'Range']
+        operations = [op for op in operations if any(op.lower() in results[s] for s in results)]
+        structures = list(results)
 
-        # Create bar chart
+        # Create bar chart, one group per operation and one bar per structure
         x = np.arange(len(operations))
-        width = 0.35
+        width = 0.8 / max(len(structures), 1)
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        rects1 = ax.bar(x - width/2, array_times, width, label='Array')
-        rects2 = ax.bar(x + width/2, btree_times, width, label='B-tree')
+        if memory:
+            fig, (ax, ax_structures, ax_phases) = plt.subplots(
+                1, 3, figsize=(20, 6), gridspec_kw={'width_ratios': [2, 1, 1]})
+        else:
+            fig, ax = plt.subplots(figsize=(10, 6))
+        bar_groups = []
+        for i, structure in enumerate(structures):
+            # Operations a structure doesn't support are plotted as zero
+            times = [results[structure][op.lower()]['average_time'] if op.lower() in results[structure] else 0
+                     for op in operations]
+            offset = (i - (len(structures) - 1) / 2) * width
+            bar_groups.append(ax.bar(x + offset, times, width,
+                                     label=STRUCTURE_LABELS.get(structure, structure)))
 
         # Add labels and title
         ax.set_ylabel('Average Time (seconds)')
@@ -47,17 +64,25 @@ class ResultExporter:
         ax.legend()
 
         # Add value labels on top of bars
+        # (rotated once there are too many bars per group to fit them side by side)
+        rotation = 90 if len(structures) > 2 else 0
         def autolabel(rects):
             for rect in rects:
                 height = rect.get_height()
+                if height == 0:
+                    continue
                 ax.annotate(f'{height:.6f}',
                            xy=(rect.get_x() + rect.get_width()/2, height),
                            xytext=(0, 3),  # 3 points vertical offset
                            textcoords="offset points",
-                           ha='center', va='bottom')
+                           ha='center', va='bottom',
+                           fontsize='x-small', rotation=rotation)
 
-        autolabel(rects1)
-        autolabel(rects2)
+        for rects in bar_groups:
+            autolabel(rects)
+
+        if memory:
+            self._plot_memory(ax_structures, ax_phases, memory, structures)
 
         # Adjust layout and save
         plt.tight_layout()
@@ -67,44 +92,126 @@ class ResultExporter:
 
         return plot_filename
 
-    def export_benchmark_results(self, dataset_info, benchmark_config, results):
-        """Export benchmark results to a JSON file"""
+    def _create_cdf_plot(self, histograms, dataset_name, mode, result_path):
+        """Create latency CDF plot, one panel per operation and one line per structure"""
+        operations = ['Insert', 'Update', 'Delete', 'Search', 'Range']
+        operations = [op for op in operations if any(op.lower() in histograms[s] for s in histograms)]
+        fig, axes = plt.subplots(1, max(len(operations), 1), figsize=(4 * max(len(operations), 1), 4),
+                                 sharey=True, squeeze=False)
+        axes = axes[0]
+
+        for ax, operation in zip(axes, operations):
+            for structure, by_operation in histograms.items():
+                histogram = by_operation.get(operation.lower())
+                if not histogram:
+                    continue
+                latencies, fractions = zip(*histogram.cdf())
+                ax.step(latencies, fractions, where='post', label=STRUCTURE_LABELS.get(structure, structure))
+            ax.set_xscale('log')
+            ax.set_xlabel('Latency (seconds)')
+            ax.set_title(operation)
+            ax.grid(True, which='both', alpha=0.3)
+
+        axes[0].set_ylabel('Fraction of operations')
+        axes[0].legend(fontsize='x-small')
+        fig.suptitle(f'Latency CDF: {dataset_name} ({mode})')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "cdf_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def _plot_memory(self, ax_structures, ax_phases, memory, structures):
+        """Plot deep size per structure and tracemalloc peak per phase"""
+        sizes = memory.get("structures", {})
+        names = [s for s in structures if s in sizes]
+        # Same colour order as the latency bars
+        colors = [f"C{structures.index(s)}" for s in names]
+        ax_structures.bar(range(len(names)), [sizes[s]["total_bytes"] / 1024 / 1024 for s in names],
+                          color=colors)
+        ax_structures.set_xticks(range(len(names)))
+        ax_structures.set_xticklabels([STRUCTURE_LABELS.get(s, s) for s in names], rotation=30, ha='right')
+        ax_structures.set_ylabel('Deep size (MB)')
+        ax_structures.set_title('Structure memory after load')
+
+        phases = memory.get("phases", {})
+        ax_phases.bar(range(len(phases)), [p["peak_bytes"] / 1024 / 1024 for p in phases.values()],
+                      color='grey')
+        ax_phases.set_xticks(range(len(phases)))
+        ax_phases.set_xticklabels([phase.capitalize() for phase in phases])
+        ax_phases.set_ylabel('tracemalloc peak (MB)')
+        ax_phases.set_title('Peak traced memory per phase')
+
+    def export_benchmark_results(self, dataset_info, benchmark_config, results, structure_info=None,
+                                 memory_info=None, run_stats=None):
+        """Export benchmark results to a JSON file
+        Args:
+            benchmark_config: Run settings; an explicit "mode" overrides sequential/concurrent,
+                and keys beyond the standard ones are stored as given
+            structure_info: Optional per-structure details (e.g. memory usage) stored next to the timings
+            memory_info: Optional deep sizes per structure and tracemalloc peaks per phase
+            run_stats: Optional setup time, operation time and timer overhead of the run
+        """
+        mode = benchmark_config.get("mode") or ("concurrent" if benchmark_config["concurrent"] else "sequential")
+
         # Prepare the data structure
         export_data = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "dataset_info": {
                 "name": os.path.basename(dataset_info["file_path"]),
                 "size": dataset_info["size"],
-                "fields": dataset_info["fields"]
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
             },
             "benchmark_config": {
-                "mode": "concurrent" if benchmark_config["concurrent"] else "sequential",
+                "mode": mode,
                 "operations": benchmark_config["operations"],
-                "max_workers": benchmark_config.get("max_workers", 1)
+                "max_workers": benchmark_config.get("max_workers", 1),
+                "btree_impl": benchmark_config.get("btree_impl", "BTree"),
+                "btree_degree": benchmark_config.get("btree_degree", 3),
+                "columnar": benchmark_config.get("columnar", False),
+                "measure_memory": benchmark_config.get("measure_memory", False)
             },
-            "results": {
-                "array": {},
-                "btree": {}
-            }
+            "results": {structure: {} for structure in results},
+            "structure_info": structure_info or {},
+            "memory": memory_info or {},
+            "run_stats": run_stats or {}
         }
+        for key, value in benchmark_config.items():
+            if key != "concurrent":
+                export_data["benchmark_config"].setdefault(key, value)
 
-        # Process results for each structure
+        # Process results for each structure; plain lists of timings are binned first
+        histograms = {}
         for structure in results:
             for operation in results[structure]:
                 times = results[structure][operation]
+                if isinstance(times, list):
+                    histogram = LatencyHistogram()
+                    histogram.extend(times)
+                    times = histogram
                 if times:
+                    histograms.setdefault(structure, {})[operation] = times
+                    summary = times.summary()
                     export_data["results"][structure][operation] = {
-                        "average_time": sum(times) / len(times),
-                        "min_time": min(times),
-                        "max_time": max(times),
-                        "total_time": sum(times),
-                        "operations_per_second": len(times) / sum(times) if sum(times) > 0 else 0,
-                        "total_operations": len(times)
+                        "average_time": summary["mean"],
+                        "min_time": summary["min"],
+                        "max_time": summary["max"],
+                        "total_time": times.total,
+                        "operations_per_second": len(times) / times.total if times.total > 0 else 0,
+                        "total_operations": len(times),
+                        "p50_time": summary["p50"],
+                        "p90_time": summary["p90"],
+                        "p99_time": summary["p99"],
+                        "p99_9_time": summary["p99_9"],
+                        # (upper latency bound, cumulative fraction) per non-empty bucket
+                        "cdf": times.cdf()
                     }
 
         # Create result directory and save files
         dataset_name = os.path.basename(dataset_info["file_path"])
-        mode = "concurrent" if benchmark_config["concurrent"] else "sequential"
         result_path, timestamp = self._create_result_directory(dataset_name, mode)
         
         # Save JSON results
@@ -113,10 +220,424 @@ class ResultExporter:
             json.dump(export_data, f, indent=4)
 
         # Create and save comparison plot
-        plot_filename = self._create_comparison_plot(export_data["results"], dataset_name, mode, result_path)
+        plot_filename = self._create_comparison_plot(export_data["results"], dataset_name, mode, result_path,
+                                                     memory_info)
+        cdf_filename = self._create_cdf_plot(histograms, dataset_name, mode, result_path)
         print(f"\nResults saved in directory: {result_path}")
         print(f"- JSON results: {json_filename}")
         print(f"- Comparison plot: {plot_filename}")
+        print(f"- Latency CDF plot: {cdf_filename}")
+
+        return result_path
+
+    def _create_batch_plot(self, results, dataset_name, result_path):
+        """Create per-key cost vs batch size plot, one panel per operation"""
+        operations = ['search', 'insert', 'delete']
+        fig, axes = plt.subplots(1, len(operations), figsize=(15, 5), sharey=True)
+
+        for ax, operation in zip(axes, operations):
+            for structure in results:
+                per_key = results[structure][operation]
+                sizes = sorted(per_key, key=int)
+                ax.plot([int(size) for size in sizes], [per_key[size] for size in sizes],
+                        marker='o', label=STRUCTURE_LABELS.get(structure, structure))
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+            ax.set_xlabel('Batch size (keys)')
+            ax.set_title(operation.capitalize())
+            ax.grid(True, which='both', alpha=0.3)
+
+        axes[0].set_ylabel('Time per key (seconds)')
+        axes[0].legend()
+        fig.suptitle(f'Batch Operations: {dataset_name}')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "batch_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_batch_results(self, dataset_info, benchmark_config, results):
+        """Export batch benchmark results (seconds per key by batch size) to a JSON file"""
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dataset_info": {
+                "name": os.path.basename(dataset_info["file_path"]),
+                "size": dataset_info["size"],
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
+            },
+            "benchmark_config": {
+                "mode": "batch",
+                "operations": benchmark_config["operations"],
+                "batch_sizes": list(benchmark_config["batch_sizes"])
+            },
+            # JSON object keys must be strings, so batch sizes are stored as text
+            "results": {
+                structure: {
+                    operation: {str(size): per_key for size, per_key in by_size.items()}
+                    for operation, by_size in operations.items()
+                }
+                for structure, operations in results.items()
+            }
+        }
+
+        dataset_name = os.path.basename(dataset_info["file_path"])
+        result_path, timestamp = self._create_result_directory(dataset_name, "batch")
+
+        json_filename = os.path.join(result_path, "batch_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_batch_plot(export_data["results"], dataset_name, result_path)
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        print(f"- Batch plot: {plot_filename}")
+
+        return result_path
+
+    def _create_scaling_plot(self, results, dataset_name, result_path):
+        """Create throughput and speedup vs worker count plot"""
+        fig, (ax_throughput, ax_speedup) = plt.subplots(1, 2, figsize=(12, 5))
+
+        for structure, by_workers in results.items():
+            workers = sorted(by_workers, key=int)
+            label = STRUCTURE_LABELS.get(structure, structure)
+            ax_throughput.plot([int(w) for w in workers], [by_workers[w]["throughput"] for w in workers],
+                               marker='o', label=label)
+            ax_speedup.plot([int(w) for w in workers], [by_workers[w]["speedup"] for w in workers],
+                            marker='o', label=label)
+
+        ax_throughput.set_xlabel('Workers')
+        ax_throughput.set_ylabel('Throughput (operations per second)')
+        ax_throughput.set_title('Throughput')
+        ax_speedup.set_xlabel('Workers')
+        ax_speedup.set_ylabel('Speedup')
+        ax_speedup.set_title('Speedup over fewest workers')
+        for ax in (ax_throughput, ax_speedup):
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+        fig.suptitle(f'Worker Scaling: {dataset_name}')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "scaling_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_scaling_results(self, dataset_info, benchmark_config, results):
+        """Export worker scaling results (throughput by worker count) to a JSON file"""
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dataset_info": {
+                "name": os.path.basename(dataset_info["file_path"]),
+                "size": dataset_info["size"],
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
+            },
+            "benchmark_config": {
+                "mode": "scaling",
+                "operations": benchmark_config["operations"],
+                "worker_counts": list(benchmark_config["worker_counts"]),
+                "mix": benchmark_config.get("mix")
+            },
+            # JSON object keys must be strings, so worker counts are stored as text
+            "results": {
+                structure: {str(workers): point for workers, point in by_workers.items()}
+                for structure, by_workers in results.items()
+            }
+        }
+
+        dataset_name = os.path.basename(dataset_info["file_path"])
+        result_path, timestamp = self._create_result_directory(dataset_name, "scaling")
+
+        json_filename = os.path.join(result_path, "scaling_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_scaling_plot(export_data["results"], dataset_name, result_path)
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        print(f"- Scaling plot: {plot_filename}")
+
+        return result_path
+
+    def _create_sharding_plot(self, results, dataset_name, result_path):
+        """Create speedup vs shard count plot, one panel per structure"""
+        structures = list(results["sharded"])
+        fig, axes = plt.subplots(1, len(structures), figsize=(6 * len(structures), 5), sharey=True)
+        if len(structures) == 1:
+            axes = [axes]
+
+        for ax, structure in zip(axes, structures):
+            by_shards = results["sharded"][structure]
+            shards = sorted(by_shards, key=int)
+            for operation in by_shards[shards[0]]:
+                ax.plot([int(n) for n in shards], [by_shards[n][operation]["speedup"] for n in shards],
+                        marker='o', label=operation.capitalize())
+            ax.plot([int(n) for n in shards], [int(n) for n in shards], linestyle='--', color='gray',
+                    label='Linear scaling')
+            ax.set_xlabel('Shards (worker processes)')
+            ax.set_title(STRUCTURE_LABELS.get(structure, structure))
+            ax.grid(True, alpha=0.3)
+
+        axes[0].set_ylabel('Speedup over single process')
+        axes[0].legend()
+        fig.suptitle(f'Sharded Engine Scaling: {dataset_name}')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "sharding_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_sharding_results(self, dataset_info, benchmark_config, results):
+        """Export sharded engine results (throughput and efficiency by shard count) to a JSON file"""
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dataset_info": {
+                "name": os.path.basename(dataset_info["file_path"]),
+                "size": dataset_info["size"],
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
+            },
+            "benchmark_config": {
+                "mode": "sharded",
+                "operations": benchmark_config["operations"],
+                "shard_counts": list(benchmark_config["shard_counts"]),
+                "batch_size": benchmark_config["batch_size"]
+            },
+            "baseline": results["baseline"],
+            # JSON object keys must be strings, so shard counts are stored as text
+            "sharded": {
+                structure: {str(shards): point for shards, point in by_shards.items()}
+                for structure, by_shards in results["sharded"].items()
+            }
+        }
+
+        dataset_name = os.path.basename(dataset_info["file_path"])
+        result_path, timestamp = self._create_result_directory(dataset_name, "sharded")
+
+        json_filename = os.path.join(result_path, "sharding_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_sharding_plot(export_data, dataset_name, result_path)
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        print(f"- Sharding plot: {plot_filename}")
+
+        return result_path
+
+    def _create_open_loop_plot(self, results, dataset_name, result_path):
+        """Create latency and achieved rate vs offered rate plot"""
+        fig, (ax_latency, ax_rate) = plt.subplots(1, 2, figsize=(12, 5))
+
+        for structure, curve in results["curves"].items():
+            rates = [point["rate"] for point in curve]
+            label = STRUCTURE_LABELS.get(structure, structure)
+            line, = ax_latency.plot(rates, [point["p99_latency"] for point in curve], marker='o',
+                                    label=f'{label} p99')
+            ax_latency.plot(rates, [point["p50_latency"] for point in curve], marker='.', linestyle=':',
+                            color=line.get_color(), label=f'{label} p50')
+            ax_rate.plot(rates, [point["achieved_rate"] for point in curve], marker='o', label=label)
+
+        all_rates = sorted({point["rate"] for curve in results["curves"].values() for point in curve})
+        ax_rate.plot(all_rates, all_rates, linestyle='--', color='gray', label='Offered')
+
+        ax_latency.set_xscale('log')
+        ax_latency.set_yscale('log')
+        ax_latency.set_xlabel('Offered rate (operations per second)')
+        ax_latency.set_ylabel('Latency from intended send time (seconds)')
+        ax_latency.set_title('Latency')
+        ax_latency.legend(fontsize='x-small')
+        ax_rate.set_xscale('log')
+        ax_rate.set_yscale('log')
+        ax_rate.set_xlabel('Offered rate (operations per second)')
+        ax_rate.set_ylabel('Achieved rate (operations per second)')
+        ax_rate.set_title('Throughput')
+        ax_rate.legend(fontsize='x-small')
+        for ax in (ax_latency, ax_rate):
+            ax.grid(True, which='both', alpha=0.3)
+        fig.suptitle(f'Open-loop Load: {dataset_name}')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "open_loop_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_open_loop_results(self, dataset_info, benchmark_config, results):
+        """Export open-loop rate sweep results (latency percentiles by offered rate) to a JSON file"""
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dataset_info": {
+                "name": os.path.basename(dataset_info["file_path"]),
+                "size": dataset_info["size"],
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
+            },
+            "benchmark_config": {
+                "mode": "open_loop",
+                "rates": list(benchmark_config["rates"]),
+                "duration": benchmark_config["duration"],
+                "arrival": benchmark_config["arrival"],
+                "operation": benchmark_config["operation"]
+            },
+            "results": results["curves"],
+            "saturation": results["saturation"]
+        }
+
+        dataset_name = os.path.basename(dataset_info["file_path"])
+        result_path, timestamp = self._create_result_directory(dataset_name, "open_loop")
+
+        json_filename = os.path.join(result_path, "open_loop_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_open_loop_plot(results, dataset_name, result_path)
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        print(f"- Open-loop plot: {plot_filename}")
+
+        return result_path
+
+    def _create_degree_sweep_plot(self, sweep, dataset_name, result_path):
+        """Create latency, height and memory curves against the minimum degree"""
+        curve = sweep["curve"]
+        degrees = [point["t"] for point in curve]
+        fig, (ax_time, ax_height, ax_memory) = plt.subplots(1, 3, figsize=(15, 5))
+
+        for operation in ['search', 'insert', 'update', 'delete']:
+            ax_time.plot(degrees, [point[f"{operation}_time"] for point in curve],
+                         marker='o', label=operation.capitalize())
+        ax_time.plot(degrees, [point["weighted_time"] for point in curve],
+                     marker='s', linestyle='--', color='black', label='Weighted')
+        ax_time.axvline(sweep["recommended_t"], color='grey', linestyle=':')
+        ax_time.set_ylabel('Average Time (seconds)')
+        ax_time.set_title('Latency')
+        ax_time.legend()
+
+        ax_height.plot(degrees, [point["height"] for point in curve], marker='o')
+        ax_height.set_ylabel('Height (levels)')
+        ax_height.set_title('Tree height')
+
+        ax_memory.plot(degrees, [point["memory_bytes"] / 1024 / 1024 for point in curve], marker='o')
+        ax_memory.set_ylabel('Node memory (MB)')
+        ax_memory.set_title('Memory')
+
+        for ax in (ax_time, ax_height, ax_memory):
+            ax.set_xscale('log', base=2)
+            ax.set_xlabel('Minimum degree t')
+            ax.grid(True, alpha=0.3)
+        fig.suptitle(f'B-tree Degree Sweep: {dataset_name} (recommended t={sweep["recommended_t"]})')
+
+        plt.tight_layout()
+        plot_filename = os.path.join(result_path, "degree_sweep_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_degree_sweep_results(self, dataset_info, benchmark_config, sweep):
+        """Export B-tree degree sweep results to a JSON file"""
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dataset_info": {
+                "name": os.path.basename(dataset_info["file_path"]),
+                "size": dataset_info["size"],
+                "fields": dataset_info["fields"],
+                "load_stats": dataset_info.get("load_stats")
+            },
+            "benchmark_config": {
+                "mode": "degree_sweep",
+                "operations": benchmark_config["operations"],
+                "degrees": list(benchmark_config["degrees"])
+            },
+            "results": sweep
+        }
+
+        dataset_name = os.path.basename(dataset_info["file_path"])
+        result_path, timestamp = self._create_result_directory(dataset_name, "degree_sweep")
+
+        json_filename = os.path.join(result_path, "degree_sweep_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_degree_sweep_plot(sweep, dataset_name, result_path)
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        print(f"- Degree sweep plot: {plot_filename}")
+
+        return result_path
+
+    def _create_matrix_plot(self, cells, result_path):
+        """Mean latency per cell with confidence interval error bars, one panel per operation"""
+        operations = ['search', 'insert', 'update', 'delete', 'range']
+        operations = [op for op in operations
+                      if any(op in by_operation for cell in cells for by_operation in cell["results"].values())]
+        structures = []
+        for cell in cells:
+            structures.extend(s for s in cell["results"] if s not in structures)
+        labels = [cell["label"] for cell in cells]
+
+        fig, axes = plt.subplots(len(operations), 1, figsize=(max(8, 1.5 * len(cells) * len(structures)),
+                                                             4 * len(operations)), squeeze=False)
+        width = 0.8 / max(1, len(structures))
+        x = np.arange(len(cells))
+        for ax, operation in zip(axes[:, 0], operations):
+            for i, structure in enumerate(structures):
+                means = []
+                errors = []
+                for cell in cells:
+                    stats = cell["results"].get(structure, {}).get(operation, {}).get("mean_time")
+                    means.append(stats["mean"] * 1e6 if stats else 0)
+                    errors.append((stats["ci_high"] - stats["mean"]) * 1e6 if stats else 0)
+                ax.bar(x + (i - (len(structures) - 1) / 2) * width, means, width, yerr=errors, capsize=3,
+                       label=STRUCTURE_LABELS.get(structure, structure))
+            ax.set_ylabel('Mean time (microseconds)')
+            ax.set_title(f'{operation.capitalize()} ({cells[0]["confidence"]:.0%} confidence intervals)')
+            ax.set_xticks(x)
+            ax.set_xticklabels(labels, rotation=30, ha='right', fontsize=8)
+            ax.grid(True, axis='y', alpha=0.3)
+            ax.legend()
+        fig.suptitle('Scenario Matrix')
+
+        plt.tight_layout(rect=(0, 0, 1, 0.98))
+        plot_filename = os.path.join(result_path, "matrix_plot.png")
+        plt.savefig(plot_filename)
+        plt.close()
+
+        return plot_filename
+
+    def export_matrix_results(self, matrix_config, cells):
+        """Export a scenario matrix (repeated trials per cell, with summary statistics) to one JSON file
+        Args:
+            matrix_config: The matrix dimensions and repeat count the cells were run with
+            cells: One dict per cell: its settings, a label, and per structure and operation
+                the mean/stddev/confidence interval of each metric over its trials
+        """
+        export_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "benchmark_config": dict(matrix_config, mode="matrix"),
+            "cells": cells
+        }
+
+        result_path, timestamp = self._create_result_directory("matrix", "report")
+
+        json_filename = os.path.join(result_path, "matrix_results.json")
+        with open(json_filename, 'w') as f:
+            json.dump(export_data, f, indent=4)
+
+        plot_filename = self._create_matrix_plot(cells, result_path) if cells else None
+        print(f"\nResults saved in directory: {result_path}")
+        print(f"- JSON results: {json_filename}")
+        if plot_filename:
+            print(f"- Matrix plot: {plot_filename}")
 
         return result_path
 
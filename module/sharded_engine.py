@@ -0,0 +1,127 @@
+import gc
+import multiprocessing
+from module.btree import BTree
+
+class ArrayShard:
+    """Unsorted (key, value) array with linear-scan operations, as in DataStructureComparison"""
+
+    def __init__(self):
+        self.array_data = []
+
+    def search(self, key):
+        for k, v in self.array_data:
+            if k == key:
+                return v
+        return None
+
+    def insert(self, key, value):
+        self.array_data.append((key, value))
+
+    def update(self, key, new_value):
+        for i, (k, _) in enumerate(self.array_data):
+            if k == key:
+                self.array_data[i] = (key, new_value)
+                return True
+        return False
+
+    def delete(self, key):
+        for i, (k, _) in enumerate(self.array_data):
+            if k == key:
+                self.array_data.pop(i)
+                return True
+        return False
+
+def _shard_worker(connection, btree_degree):
+    """Serve one shard: load, batch and stop messages arriving on connection"""
+    # With fork the router's whole heap is inherited; keep the collector from rescanning it
+    gc.freeze()
+    structures = {'btree': BTree(t=btree_degree), 'array': ArrayShard()}
+    while True:
+        message = connection.recv()
+        command = message[0]
+        if command == 'stop':
+            break
+        if command == 'load':
+            pairs = message[1]
+            structures['array'].array_data.extend(pairs)
+            structures['btree'].bulk_load(pairs)
+            connection.send(len(pairs))
+        elif command == 'batch':
+            structure = structures[message[1]]
+            connection.send([getattr(structure, operation)(*args) for operation, *args in message[2]])
+    connection.close()
+
+class ShardedEngine:
+    """Key space split across worker processes, each owning a BTree and an array shard
+
+    The calling process acts as the router: it hashes each key to a shard,
+    sends every shard its part of a batch over a pipe, then gathers the
+    results back into request order. Shards work on their batches in
+    parallel, so CPU-bound operations are not serialized by the GIL.
+    """
+
+    def __init__(self, shards=4, btree_degree=3):
+        self.shards = shards
+        self.connections = []
+        self.processes = []
+        for _ in range(shards):
+            router_end, worker_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(worker_end, btree_degree), daemon=True)
+            process.start()
+            worker_end.close()
+            self.connections.append(router_end)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def shard_of(self, key):
+        return hash(key) % self.shards
+
+    def load(self, pairs):
+        """Distribute (key, value) pairs to their shards, returns the number of pairs per shard"""
+        parts = [[] for _ in range(self.shards)]
+        for pair in pairs:
+            parts[self.shard_of(pair[0])].append(pair)
+        for connection, part in zip(self.connections, parts):
+            connection.send(('load', part))
+        return [connection.recv() for connection in self.connections]
+
+    def execute(self, structure, operations, batch_size=100):
+        """Run operations on the named structure ('btree' or 'array') of their keys' shards
+        Args:
+            operations: List of (operation, key, *args) tuples, e.g. ('insert', key, value)
+            batch_size: Number of operations routed per round trip
+        Returns:
+            The result of each operation, in input order
+        """
+        results = [None] * len(operations)
+        for start in range(0, len(operations), batch_size):
+            batches = [[] for _ in range(self.shards)]
+            positions = [[] for _ in range(self.shards)]
+            for position in range(start, min(start + batch_size, len(operations))):
+                operation = operations[position]
+                shard = self.shard_of(operation[1])
+                batches[shard].append(operation)
+                positions[shard].append(position)
+
+            # Send every shard its batch before waiting on any, so they run in parallel
+            busy = [shard for shard in range(self.shards) if batches[shard]]
+            for shard in busy:
+                self.connections[shard].send(('batch', structure, batches[shard]))
+            for shard in busy:
+                for position, result in zip(positions[shard], self.connections[shard].recv()):
+                    results[position] = result
+        return results
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(('stop',))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
@@ -0,0 +1,81 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+class SortedArray:
+    """Parallel key/value arrays kept in key order, searched with binary search"""
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def bulk_load(self, pairs):
+        """Replace the contents with (key, value) pairs, sorting them if needed"""
+        keys = []
+        values = []
+        for key, value in pairs:
+            keys.append(key)
+            values.append(value)
+
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = [keys[i] for i in order]
+            values = [values[i] for i in order]
+
+        self.keys = keys
+        self.values = values
+
+    def insert_many(self, pairs):
+        """Insert (key, value) pairs with one merge instead of shifting the arrays per key
+
+        Pairs whose keys all follow the current last key are simply appended.
+        """
+        pairs = sorted(pairs, key=itemgetter(0))
+        if not pairs:
+            return
+        if self.keys and pairs[0][0] < self.keys[-1]:
+            # Existing pairs come first among equal keys, as with insert()
+            pairs = list(heapq.merge(zip(self.keys, self.values), pairs, key=itemgetter(0)))
+            self.keys = []
+            self.values = []
+        self.keys.extend(key for key, _ in pairs)
+        self.values.extend(value for _, value in pairs)
+
+    def search(self, key):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.values[i]
+        return None
+
+    def range(self, lo, hi):
+        """Yield (key, value) pairs with lo <= key <= hi in key order"""
+        keys = self.keys
+        values = self.values
+        for i in range(bisect_left(keys, lo), bisect_right(keys, hi)):
+            yield keys[i], values[i]
+
+    def insert(self, key, value):
+        """Insert keeping key order, shifting the tail of both arrays"""
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.values.insert(i, value)
+
+    def update(self, key, new_value):
+        """Update value for existing key"""
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            self.values[i] = new_value
+            return True
+        return False
+
+    def delete(self, key):
+        """Delete key, returns True if it was found"""
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+            del self.values[i]
+            return True
+        return False
@@ -0,0 +1,149 @@
+import random
+from bisect import bisect_left
+
+# Operation mixes, modelled on the YCSB core workloads (A, B, C and E)
+WORKLOADS = {
+    'update_heavy': {'search': 0.5, 'update': 0.5},
+    'read_mostly': {'search': 0.95, 'update': 0.05},
+    'read_only': {'search': 1.0},
+    'scan_heavy': {'range': 0.95, 'insert': 0.05}
+}
+
+_FNV_OFFSET_BASIS_64 = 0xCBF29CE484222325
+_FNV_PRIME_64 = 1099511628211
+
+def _fnv_hash64(value):
+    """FNV-1a hash of a non-negative integer, used to scatter zipfian ranks over the key space"""
+    h = _FNV_OFFSET_BASIS_64
+    for _ in range(8):
+        h ^= value & 0xFF
+        h = (h * _FNV_PRIME_64) & 0xFFFFFFFFFFFFFFFF
+        value >>= 8
+    return h
+
+class UniformChooser:
+    """Every key equally likely"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def next(self, count):
+        return self.rng.randrange(count)
+
+class ZipfianChooser:
+    """Zipfian popularity over the first n keys (Gray et al.'s generator, as in YCSB)
+
+    Rank 0 is the most popular. With scrambled=True ranks are hashed over
+    the key space so the popular keys are not all neighbours.
+    """
+
+    def __init__(self, n, rng, theta=0.99, scrambled=True):
+        self.n = n
+        self.rng = rng
+        self.theta = theta
+        self.scrambled = scrambled
+        self.zetan = sum(1 / i ** theta for i in range(1, n + 1))
+        zeta2 = 1 + 0.5 ** theta
+        self.alpha = 1 / (1 - theta)
+        self.eta = (1 - (2 / n) ** (1 - theta)) / (1 - zeta2 / self.zetan) if n > 2 else 1
+        self.half_pow_theta = 0.5 ** theta
+
+    def rank(self):
+        u = self.rng.random()
+        uz = u * self.zetan
+        if uz < 1:
+            return 0
+        if uz < 1 + self.half_pow_theta:
+            return 1
+        return min(self.n - 1, int(self.n * (self.eta * u - self.eta + 1) ** self.alpha))
+
+    def next(self, count):
+        rank = self.rank()
+        if self.scrambled:
+            return _fnv_hash64(rank) % min(self.n, count)
+        return min(rank, count - 1)
+
+class LatestChooser:
+    """Recently inserted keys are the most popular (zipfian over recency)"""
+
+    def __init__(self, n, rng, theta=0.99):
+        self.zipfian = ZipfianChooser(n, rng, theta, scrambled=False)
+
+    def next(self, count):
+        return max(0, count - 1 - self.zipfian.rank())
+
+class HotspotChooser:
+    """hot_op_fraction of requests go to the first hot_set_fraction of the keys"""
+
+    def __init__(self, rng, hot_set_fraction=0.2, hot_op_fraction=0.8):
+        self.rng = rng
+        self.hot_set_fraction = hot_set_fraction
+        self.hot_op_fraction = hot_op_fraction
+
+    def next(self, count):
+        hot_count = max(1, int(count * self.hot_set_fraction))
+        if self.rng.random() < self.hot_op_fraction or hot_count == count:
+            return self.rng.randrange(hot_count)
+        return self.rng.randrange(hot_count, count)
+
+KEY_CHOOSERS = {
+    'uniform': UniformChooser,
+    'zipfian': ZipfianChooser,
+    'latest': LatestChooser,
+    'hotspot': HotspotChooser
+}
+
+# Choosers that precompute over the initial key count take it as their first argument
+_SIZED_CHOOSERS = (ZipfianChooser, LatestChooser)
+
+def generate_workload(keys, workload='read_mostly', distribution='zipfian', operations=1000, seed=0,
+                      max_scan_length=100):
+    """Build a reproducible mixed operation stream over keys
+    Args:
+        keys: Existing keys, in insertion order (the order 'latest' counts recency in)
+        workload: Name from WORKLOADS, or a dict of operation -> share
+        distribution: Key chooser name from KEY_CHOOSERS
+        operations: Length of the stream
+        seed: Seed for operation choice, key choice and scan lengths
+        max_scan_length: Scans cover 1 to this many consecutive keys
+    Returns:
+        List of ('search', key), ('update', key), ('delete', key), ('insert', key)
+        and ('range', lo, hi) tuples. Inserted keys are new integers above the
+        largest existing key and become choosable by later operations; deleted
+        keys are no longer chosen.
+    """
+    mix = WORKLOADS[workload] if isinstance(workload, str) else workload
+    if distribution not in KEY_CHOOSERS:
+        raise ValueError(f"Unknown key distribution: {distribution}")
+    if not keys:
+        raise ValueError("No keys to choose from")
+
+    rng = random.Random(seed)
+    chooser_class = KEY_CHOOSERS[distribution]
+    chooser = chooser_class(len(keys), rng) if chooser_class in _SIZED_CHOOSERS else chooser_class(rng)
+    keys = list(keys)
+    sorted_keys = sorted(keys)
+    next_key = sorted_keys[-1] + 1
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=operations)
+
+    stream = []
+    for kind in kinds:
+        if kind == 'insert':
+            stream.append(('insert', next_key))
+            keys.append(next_key)
+            sorted_keys.append(next_key)  # Larger than every existing key, so order is kept
+            next_key += 1
+        elif not keys:
+            raise ValueError("The workload deleted every key")
+        elif kind == 'delete':
+            key = keys.pop(chooser.next(len(keys)))
+            del sorted_keys[bisect_left(sorted_keys, key)]
+            stream.append(('delete', key))
+        elif kind == 'range':
+            lo = keys[chooser.next(len(keys))]
+            i = bisect_left(sorted_keys, lo)
+            hi = sorted_keys[min(len(sorted_keys) - 1, i + rng.randint(1, max_scan_length) - 1)]
+            stream.append(('range', lo, hi))
+        else:
+            stream.append((kind, keys[chooser.next(len(keys))]))
+    return stream
@@ -0,0 +1,171 @@
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import time
+from main import run_comparison
+from module.btree import BTree
+from module.concurrent_btree import ConcurrentBTree
+from module.legacy_btree import LegacyBTree
+from module.result_exporter import ResultExporter
+
+BTREE_CLASSES = {
+    'BTree': BTree,
+    'ConcurrentBTree': ConcurrentBTree,
+    'LegacyBTree': LegacyBTree
+}
+
+DEFAULT_MATRIX = {
+    "datasets": ["data/customers-1000.csv"],
+    "modes": ["sequential", "concurrent"],
+    "workers": [4],
+    "operations": [1000],
+    "btree": ["BTree"],
+    "structures": None,  # None reports every structure
+    "repeats": 5
+}
+
+# Two-sided 95% Student t critical values for 1 to 30 degrees of freedom
+_T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+CONFIDENCE = 0.95
+
+def summarize(values):
+    """Mean, sample standard deviation and 95% confidence interval of the mean"""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return {"mean": mean, "stddev": 0.0, "ci_low": mean, "ci_high": mean, "values": values}
+    stddev = statistics.stdev(values)
+    df = len(values) - 1
+    t = _T_95[df - 1] if df <= len(_T_95) else 1.96
+    half_width = t * stddev / math.sqrt(len(values))
+    return {"mean": mean, "stddev": stddev, "ci_low": mean - half_width, "ci_high": mean + half_width,
+            "values": values}
+
+def matrix_cells(matrix):
+    """Every combination of the matrix dimensions; sequential cells ignore the worker counts"""
+    cells = []
+    for dataset, mode, operations, btree in itertools.product(matrix["datasets"], matrix["modes"],
+                                                                matrix["operations"], matrix["btree"]):
+        if mode not in ("sequential", "concurrent"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if btree not in BTREE_CLASSES:
+            raise ValueError(f"Unknown B-tree implementation: {btree}")
+        for workers in (matrix["workers"] if mode == "concurrent" else [1]):
+            cells.append({
+                "dataset": dataset,
+                "mode": mode,
+                "workers": workers,
+                "operations": operations,
+                "btree_impl": btree
+            })
+    return cells
+
+def run_trial(cell, quiet=True):
+    """One run_comparison in the calling process, reduced to per-operation metrics"""
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        results = run_comparison(cell["dataset"], cell["operations"], cell["mode"] == "concurrent",
+                                 cell["workers"], BTREE_CLASSES[cell["btree_impl"]], export=False)
+    metrics = {}
+    for structure, by_operation in results.items():
+        for operation, times in by_operation.items():
+            if times:
+                metrics.setdefault(structure, {})[operation] = {
+                    "mean_time": times.mean(),
+                    "p99_time": times.percentile(99),
+                    "throughput": len(times) / times.total if times.total > 0 else 0
+                }
+    return metrics
+
+def run_matrix(matrix, quiet=True):
+    """Run every cell matrix["repeats"] times, each trial in a fresh process
+    Returns:
+        List of cells with summary statistics per structure, operation and metric
+    """
+    cells = matrix_cells(matrix)
+    structures = matrix.get("structures")
+    context = multiprocessing.get_context('spawn')
+    total = len(cells) * matrix["repeats"]
+    done = 0
+    start_time = time.perf_counter()
+
+    print(f"\nRunning scenario matrix: {len(cells)} cells x {matrix['repeats']} trials")
+    print("=" * 50)
+    for cell in cells:
+        cell["label"] = (f"{os.path.basename(cell['dataset'])} {cell['mode']} w{cell['workers']} "
+                         f"n{cell['operations']} {cell['btree_impl']}")
+        trials = []
+        for trial in range(matrix["repeats"]):
+            # One trial per process, one process at a time, so trials share no heap, caches or GC state
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                trials.append(executor.submit(run_trial, cell, quiet).result())
+            done += 1
+            print(f"Progress: {done}/{total} trials ({cell['label']}, trial {trial + 1}) "
+                  f"{time.perf_counter() - start_time:.1f} s elapsed")
+
+        cell["trials"] = len(trials)
+        cell["confidence"] = CONFIDENCE
+        cell["results"] = {}
+        for structure in trials[0]:
+            if structures and structure not in structures:
+                continue
+            for operation in trials[0][structure]:
+                cell["results"].setdefault(structure, {})[operation] = {
+                    metric: summarize([trial[structure][operation][metric] for trial in trials])
+                    for metric in trials[0][structure][operation]
+                }
+    return cells
+
+def print_summary(cells):
+    print("\nScenario matrix summary (mean time per operation, 95% CI):")
+    print("=" * 50)
+    for cell in cells:
+        print(f"\n{cell['label']}:")
+        for structure, by_operation in cell["results"].items():
+            for operation, metrics in by_operation.items():
+                stats = metrics["mean_time"]
+                print(f"  {structure} {operation}: {stats['mean'] * 1e6:.2f} us "
+                      f"+/- {stats['stddev'] * 1e6:.2f} "
+                      f"[{stats['ci_low'] * 1e6:.2f}, {stats['ci_high'] * 1e6:.2f}]")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a matrix of benchmark scenarios without prompts")
+    parser.add_argument('--config', help="JSON file with any of: " + ", ".join(DEFAULT_MATRIX))
+    parser.add_argument('--datasets', nargs='+')
+    parser.add_argument('--modes', nargs='+', choices=['sequential', 'concurrent'])
+    parser.add_argument('--workers', nargs='+', type=int)
+    parser.add_argument('--operations', nargs='+', type=int)
+    parser.add_argument('--btree', nargs='+', choices=list(BTREE_CLASSES))
+    parser.add_argument('--structures', nargs='+', help="Only report these structures")
+    parser.add_argument('--repeats', type=int)
+    parser.add_argument('--verbose', action='store_true', help="Show the output of every trial")
+    args = parser.parse_args(argv)
+
+    matrix = dict(DEFAULT_MATRIX)
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+        unknown = set(config) - set(DEFAULT_MATRIX)
+        if unknown:
+            raise ValueError(f"Unknown matrix settings: {', '.join(sorted(unknown))}")
+        matrix.update(config)
+    for key in DEFAULT_MATRIX:
+        if getattr(args, key) is not None:
+            matrix[key] = getattr(args, key)
+    if matrix["repeats"] < 1:
+        raise ValueError("repeats must be at least 1")
+
+    cells = run_matrix(matrix, quiet=not args.verbose)
+    print_summary(cells)
+    ResultExporter().export_matrix_results(matrix, cells)
+
+if __name__ == '__main__':
+    main()
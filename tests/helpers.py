@@ -0,0 +1,99 @@
+"""Operation generator and structural checks shared by the fuzz tests"""
+
+def check_btree(root, t, children=lambda node: node.children):
+    """Assert the B-tree invariants below root and return its keys in order
+
+    Every node holds sorted keys within the bounds set by its parent, at most
+    2t-1 of them and at least t-1 outside the root, internal nodes have one
+    child more than keys, and all leaves are at the same depth.
+    children maps a node to its child nodes, for trees storing page ids.
+    """
+    keys = []
+    leaf_depths = set()
+
+    def walk(node, depth, lower, upper, is_root):
+        assert len(node.keys) == len(node.values)
+        assert len(node.keys) <= 2 * t - 1
+        if not is_root:
+            assert len(node.keys) >= t - 1
+        assert node.keys == sorted(node.keys)
+        assert all((lower is None or key > lower) and (upper is None or key < upper) for key in node.keys)
+        if node.leaf:
+            assert not node.children
+            leaf_depths.add(depth)
+            keys.extend(node.keys)
+            return
+        nodes = children(node)
+        assert len(nodes) == len(node.keys) + 1
+        bounds = [lower] + node.keys + [upper]
+        for i, child in enumerate(nodes):
+            walk(child, depth + 1, bounds[i], bounds[i + 1], False)
+            if i < len(node.keys):
+                keys.append(node.keys[i])
+
+    walk(root, 0, None, None, True)
+    assert len(leaf_depths) <= 1
+    assert keys == sorted(set(keys))
+    return keys
+
+def check_bplustree(tree):
+    """Assert the B+ tree invariants and return its keys in order
+
+    Internal nodes only hold separators: keys under children[i] are below
+    keys[i] and keys under children[i + 1] are at least keys[i]. Leaves are
+    all at the same depth and their next links visit every key in order.
+    """
+    t = tree.t
+    leaves = []
+
+    def walk(node, depth, lower, upper, is_root):
+        assert len(node.keys) <= 2 * t - 1
+        if not is_root:
+            assert len(node.keys) >= t - 1
+        assert node.keys == sorted(node.keys)
+        assert all((lower is None or key >= lower) and (upper is None or key < upper) for key in node.keys)
+        if node.leaf:
+            assert len(node.keys) == len(node.values)
+            leaves.append((depth, node))
+            return
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [lower] + node.keys + [upper]
+        for i, child in enumerate(node.children):
+            walk(child, depth + 1, bounds[i], bounds[i + 1], False)
+
+    walk(tree.root, 0, None, None, True)
+    assert len({depth for depth, _ in leaves}) == 1
+    for (_, leaf), (_, following) in zip(leaves, leaves[1:]):
+        assert leaf.next is following
+    assert leaves[-1][1].next is None
+    keys = [key for _, leaf in leaves for key in leaf.keys]
+    assert keys == sorted(set(keys))
+    return keys
+
+def fuzz(tree, reference, rng, steps, keys, check=None, check_every=100):
+    """Apply random searches, inserts, updates and deletes to tree and to a dict reference
+
+    Keys are drawn from the keys sequence, so with a small enough one most
+    deletes and updates hit existing keys and some miss. Inserts only use absent keys, as the trees
+    keep duplicates. check(tree) runs every check_every steps.
+    """
+    for step in range(steps):
+        key = rng.choice(keys)
+        roll = rng.random()
+        if roll < 0.4:
+            if key not in reference:
+                value = rng.random()
+                tree.insert(key, value)
+                reference[key] = value
+        elif roll < 0.6:
+            value = rng.random()
+            assert tree.update(key, value) == (key in reference)
+            if key in reference:
+                reference[key] = value
+        elif roll < 0.85:
+            assert tree.delete(key) == (key in reference)
+            reference.pop(key, None)
+        else:
+            assert tree.search(key) == reference.get(key)
+        if check is not None and step % check_every == 0:
+            check(tree)
@@ -0,0 +1,27 @@
+import random
+import pytest
+from module.bplustree import BPlusTree
+from tests.helpers import check_bplustree, fuzz
+
+@pytest.mark.parametrize("t", [2, 3, 5])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_dict(t, seed):
+    rng = random.Random(seed)
+    tree = BPlusTree(t=t)
+    reference = {}
+    fuzz(tree, reference, rng, 4000, range(500), check_bplustree)
+    assert check_bplustree(tree) == sorted(reference)
+    assert list(tree.range_scan()) == sorted(reference.items())
+    for key in range(500):
+        assert tree.search(key) == reference.get(key)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bulk_load_then_fuzz(seed):
+    rng = random.Random(seed)
+    pairs = [(key, rng.random()) for key in rng.sample(range(1000), 600)]
+    tree = BPlusTree(t=3)
+    tree.bulk_load(pairs)
+    reference = dict(pairs)
+    assert check_bplustree(tree) == sorted(reference)
+    fuzz(tree, reference, rng, 3000, range(1000), check_bplustree)
+    assert list(tree.range_scan(100, 400)) == sorted((k, v) for k, v in reference.items() if 100 <= k <= 400)
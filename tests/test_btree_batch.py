@@ -0,0 +1,26 @@
+import random
+import pytest
+from module.btree import BTree
+from tests.helpers import check_btree
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_operations_match_dict(seed):
+    rng = random.Random(seed)
+    pairs = [(key, rng.random()) for key in rng.sample(range(2000), 800)]
+    tree = BTree(t=3)
+    tree.bulk_load(sorted(pairs))
+    reference = dict(pairs)
+    check_btree(tree.root, tree.t)
+    for _ in range(20):
+        new_pairs = [(key, rng.random()) for key in rng.sample(range(2000), 100) if key not in reference]
+        tree.insert_many(new_pairs)
+        reference.update(new_pairs)
+        check_btree(tree.root, tree.t)
+        doomed = rng.sample(range(2000), 100)
+        assert tree.delete_many(doomed) == sum(key in reference for key in doomed)
+        for key in doomed:
+            reference.pop(key, None)
+        check_btree(tree.root, tree.t)
+        probe = rng.sample(range(2000), 100)
+        assert tree.search_many(probe) == [reference.get(key) for key in probe]
+    assert list(tree.items()) == sorted(reference.items())
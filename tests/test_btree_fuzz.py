@@ -0,0 +1,18 @@
+import random
+import pytest
+from module.btree import BTree
+from tests.helpers import check_btree, fuzz
+
+def check(tree):
+    check_btree(tree.root, tree.t)
+
+@pytest.mark.parametrize("t", [2, 3, 5])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_dict(t, seed):
+    rng = random.Random(seed)
+    tree = BTree(t=t)
+    reference = {}
+    fuzz(tree, reference, rng, 4000, range(500), check)
+    assert check_btree(tree.root, t) == sorted(reference)
+    for key in range(500):
+        assert tree.search(key) == reference.get(key)
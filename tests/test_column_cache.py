@@ -0,0 +1,51 @@
+import os
+from array import array
+import numpy as np
+from module.column_cache import read_column_cache, read_column_meta, typed_array, write_column_cache
+
+FIELDS = ["Index", "Score", "Name", "Mixed", "Huge"]
+COLUMNS = [
+    [3, 1, 2],
+    [0.5, float('nan'), 2.25],
+    ["ann", "", "émile"],
+    [1, "two", None],
+    [2 ** 70, 1, 2]
+]
+
+def test_round_trip(tmp_path):
+    directory = str(tmp_path / "data.columns")
+    write_column_cache(directory, FIELDS, COLUMNS, {"checksum": "abc"})
+    meta, columns = read_column_cache(directory)
+    assert meta["checksum"] == "abc"
+    assert meta["data_columns"] == FIELDS
+    assert meta["kinds"] == ['int64', 'float64', 'text', 'object', 'object']
+    assert meta == read_column_meta(directory)
+    assert columns[0].tolist() == COLUMNS[0]
+    assert np.isnan(columns[1][1]) and columns[1][[0, 2]].tolist() == [0.5, 2.25]
+    assert columns[2:] == COLUMNS[2:]
+    assert not os.path.exists(directory + ".tmp")
+
+def test_numeric_columns_are_memory_mapped(tmp_path):
+    directory = str(tmp_path / "data.columns")
+    write_column_cache(directory, FIELDS[:2], COLUMNS[:2])
+    _, columns = read_column_cache(directory)
+    for column in columns:
+        assert isinstance(column, np.memmap) and not column.flags.writeable
+    keys = typed_array(columns[0])
+    assert keys == array('q', COLUMNS[0])
+    assert typed_array(columns[1]).typecode == 'd'
+
+def test_rewrite_replaces_cache(tmp_path):
+    directory = str(tmp_path / "data.columns")
+    write_column_cache(directory, FIELDS[:1], [[1, 2]])
+    write_column_cache(directory, ["Name"], [["a"]])
+    meta, columns = read_column_cache(directory)
+    assert meta["data_columns"] == ["Name"] and columns == [["a"]]
+    assert sorted(os.listdir(directory)) == ["0.utf8", "meta.json"]
+
+def test_empty_columns(tmp_path):
+    directory = str(tmp_path / "data.columns")
+    write_column_cache(directory, ["Index", "Name"], [[], []])
+    meta, columns = read_column_cache(directory)
+    assert meta["rows"] == 0
+    assert [len(column) for column in columns] == [0, 0]
@@ -0,0 +1,46 @@
+import random
+import threading
+import pytest
+from module.concurrent_btree import ConcurrentBTree
+from tests.helpers import check_btree, fuzz
+
+def check(tree):
+    check_btree(tree.root, tree.t)
+
+@pytest.mark.parametrize("t", [2, 3, 5])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_dict(t, seed):
+    rng = random.Random(seed)
+    tree = ConcurrentBTree(t=t)
+    reference = {}
+    fuzz(tree, reference, rng, 4000, range(500), check)
+    assert check_btree(tree.root, t) == sorted(reference)
+    assert list(tree.items()) == sorted(reference.items())
+
+@pytest.mark.parametrize("seed", range(3))
+def test_threads_match_dict(seed):
+    """Threads fuzz disjoint key sets, each against its own dict"""
+    tree = ConcurrentBTree(t=2)
+    threads = 8
+    references = [{} for _ in range(threads)]
+    errors = []
+
+    def worker(index):
+        rng = random.Random(seed * threads + index)
+        try:
+            fuzz(tree, references[index], rng, 3000, range(index, 200 * threads, threads))
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert not errors
+    expected = {}
+    for reference in references:
+        expected.update(reference)
+    assert check_btree(tree.root, tree.t) == sorted(expected)
+    assert list(tree.items()) == sorted(expected.items())
@@ -0,0 +1,62 @@
+import csv
+import pytest
+from module.csv_cutter import head, main, sample, shuffle, synthesize
+from module.data_config import FIELD_RULES
+
+HEADER = b"Index,Name\n"
+ROWS = [f"{i},name_{i}\n".encode() for i in range(1, 201)]
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(HEADER + b"".join(ROWS))
+    return str(path)
+
+def lines(path):
+    with open(path, 'rb') as f:
+        return f.readlines()
+
+def test_head(csv_path, tmp_path):
+    output = str(tmp_path / "head.csv")
+    assert head(csv_path, output, 10) == 10
+    assert lines(output) == [HEADER] + ROWS[:10]
+    assert head(csv_path, output, 1000) == 200
+
+def test_sample_rows_keeps_file_order(csv_path, tmp_path):
+    output = str(tmp_path / "sample.csv")
+    assert sample(csv_path, output, rows=50, seed=1) == 50
+    sampled = lines(output)
+    assert sampled[0] == HEADER
+    assert sorted(sampled[1:], key=ROWS.index) == sampled[1:]
+    assert set(sampled[1:]) <= set(ROWS)
+    sample(csv_path, str(tmp_path / "again.csv"), rows=50, seed=1)
+    assert lines(str(tmp_path / "again.csv")) == sampled
+
+def test_sample_fraction(csv_path, tmp_path):
+    output = str(tmp_path / "sample.csv")
+    written = sample(csv_path, output, fraction=0.5, seed=0)
+    assert 60 < written < 140 and len(lines(output)) == written + 1
+    with pytest.raises(ValueError):
+        sample(csv_path, output)
+
+def test_shuffle_is_a_permutation(csv_path, tmp_path):
+    output = str(tmp_path / "shuffled.csv")
+    # A tiny bucket size spreads the rows over several bucket files
+    assert shuffle(csv_path, output, seed=2, bucket_bytes=512) == 200
+    shuffled = lines(output)
+    assert shuffled[0] == HEADER
+    assert sorted(shuffled[1:]) == sorted(ROWS) and shuffled[1:] != ROWS
+
+def test_synthesize_is_reproducible_and_sorted(tmp_path):
+    outputs = [str(tmp_path / f"synth-{workers}.csv") for workers in (1, 3)]
+    for output, workers in zip(outputs, (1, 3)):
+        assert synthesize(output, 2500, first_key=11, chunk_size=300, workers=workers, seed=5) == 2500
+    assert lines(outputs[0]) == lines(outputs[1])
+    with open(outputs[0], newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(FIELD_RULES)
+    assert [int(row[0]) for row in rows[1:]] == list(range(11, 2511))
+
+def test_command_line_default_output(csv_path, tmp_path):
+    main(['head', csv_path, '-n', '5'])
+    assert lines(str(tmp_path / "data-head5.csv")) == [HEADER] + ROWS[:5]
@@ -0,0 +1,47 @@
+import random
+from datetime import datetime, timedelta
+import numpy as np
+from module.data_config import (FIELD_RULES, REFERENCE_DATE, generate_column, generate_columns, generate_record,
+                                generate_records)
+
+def dates(records):
+    return [datetime.strptime(record['Subscription Date'], '%Y-%m-%d') for record in records]
+
+def test_same_seed_same_records():
+    keys = range(1, 501)
+    assert generate_records(keys, seed=3) == generate_records(keys, seed=3)
+    assert generate_records(keys, seed=3) != generate_records(keys, seed=4)
+
+def test_generator_continues_its_sequence():
+    rng = np.random.default_rng(0)
+    first = generate_records([1, 2], rng)
+    second = generate_records([1, 2], rng)
+    assert first != second
+    rng = np.random.default_rng(0)
+    assert generate_records([1, 2], rng) == first
+
+def test_records_have_every_field():
+    records = generate_records([7, 8], seed=0)
+    assert [list(record) for record in records] == [list(FIELD_RULES)] * 2
+    assert records[0]['Index'] == 7
+    assert records[1]['First Name'] == 'firstname_8'
+    assert records[1]['Email'] == 'user8@example.com'
+    assert records[0]['Phone 1'].startswith('+')
+
+def test_dates_count_back_from_reference_date():
+    for records in (generate_records(range(2000), seed=0),
+                    [generate_record(key) for key in range(200)]):
+        assert all(REFERENCE_DATE - timedelta(days=365 * 5) <= date <= REFERENCE_DATE for date in dates(records))
+    reference_date = datetime(2020, 6, 1)
+    records = generate_records(range(2000), seed=0, reference_date=reference_date)
+    assert max(dates(records)) <= reference_date
+    random.seed(0)
+    assert dates([generate_record(1, reference_date=reference_date)])[0] <= reference_date
+
+def test_columns_match_column_generator():
+    keys = np.arange(10, 20, dtype=np.int64)
+    columns = generate_columns(keys, seed=1)
+    rng = np.random.default_rng(1)
+    for field_name in FIELD_RULES:
+        assert generate_column(field_name, keys, rng) == columns[field_name]
+    assert generate_column('Unknown', keys, rng) == [None] * 10
@@ -0,0 +1,25 @@
+import random
+import sys
+from module.indexed_array import IndexedArray
+
+def test_matches_dict_through_deletes_and_compaction():
+    rng = random.Random(3)
+    array, reference = IndexedArray(compact_ratio=0.2), {}
+    for _ in range(3000):
+        key = rng.randrange(500)
+        if rng.random() < 0.4:
+            assert array.delete(key) == (reference.pop(key, None) is not None)
+        else:
+            array.insert(key, key * 2)
+            reference[key] = key * 2
+    assert array.compactions > 0
+    assert len(array) == len(reference)
+    assert all(array.search(key) == value for key, value in reference.items())
+    assert sorted(array.range(100, 200)) == sorted((k, v) for k, v in reference.items() if 100 <= k <= 200)
+
+def test_memory_usage_skips_cached_slot_numbers():
+    array = IndexedArray()
+    array.bulk_load((key, None) for key in range(257))
+    assert array.memory_usage()["index_memory_bytes"] == sys.getsizeof(array.index)
+    array.insert(257, None)
+    assert array.memory_usage()["index_memory_bytes"] == sys.getsizeof(array.index) + sys.getsizeof(257)
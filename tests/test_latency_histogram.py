@@ -0,0 +1,67 @@
+import math
+import random
+import pytest
+from module.latency_histogram import LatencyHistogram
+
+def test_bucket_bounds_contain_their_values():
+    histogram = LatencyHistogram(highest_seconds=1)
+    rng = random.Random(0)
+    values = list(range(300)) + [rng.randrange(10 ** 9) for _ in range(5000)]
+    for nanoseconds in values:
+        index = histogram._index(nanoseconds)
+        assert histogram._bucket_upper(index) >= nanoseconds
+        assert index == 0 or histogram._bucket_upper(index - 1) < nanoseconds
+
+def test_bucket_width_is_bounded():
+    histogram = LatencyHistogram(highest_seconds=1)
+    limit = 1 / histogram.sub_bucket_half
+    for index in range(histogram.sub_bucket_count, len(histogram.counts)):
+        lower = histogram._bucket_upper(index - 1) + 1
+        assert (histogram._bucket_upper(index) - lower + 1) / lower <= limit
+
+@pytest.mark.parametrize("seed", range(3))
+def test_percentiles_within_bucket_error(seed):
+    rng = random.Random(seed)
+    values = [rng.lognormvariate(-11, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    histogram.extend(values)
+    ordered = sorted(values)
+    for q in (1, 50, 90, 99, 99.9):
+        exact = ordered[math.ceil(q * len(ordered) / 100) - 1]
+        # Within one bucket width of the exact value, plus a nanosecond of rounding
+        assert abs(histogram.percentile(q) - exact) <= exact / histogram.sub_bucket_half + 1e-9
+    assert histogram.percentile(100) == max(values)
+    assert histogram.count == len(values)
+    assert histogram.mean() == pytest.approx(sum(values) / len(values))
+
+def test_extremes_and_empty():
+    histogram = LatencyHistogram(highest_seconds=1)
+    assert histogram.percentile(50) == 0
+    assert histogram.summary()["max"] == 0
+    histogram.extend([0.0, 5.0])
+    # Values above highest_seconds fall in the last bucket but min and max stay exact
+    assert histogram.counts[-1] == 1
+    assert histogram.min == 0.0
+    assert histogram.max == 5.0
+    assert histogram.percentile(100) == 5.0
+
+def test_merge_matches_recording_everything():
+    rng = random.Random(1)
+    values = [rng.expovariate(1e5) for _ in range(5000)]
+    merged = LatencyHistogram()
+    for part in (values[:1000], values[1000:]):
+        histogram = LatencyHistogram()
+        histogram.extend(part)
+        merged.merge(histogram)
+    whole = LatencyHistogram()
+    whole.extend(values)
+    assert merged.counts == whole.counts
+    assert (merged.count, merged.min, merged.max) == (whole.count, whole.min, whole.max)
+    assert merged.summary() == pytest.approx(whole.summary())
+
+def test_cdf_is_monotonic_and_ends_at_one():
+    histogram = LatencyHistogram()
+    histogram.extend([1e-6, 2e-6, 2e-6, 1e-3])
+    points = histogram.cdf()
+    assert [fraction for _, fraction in points] == [0.25, 0.75, 1.0]
+    assert all(a[0] < b[0] for a, b in zip(points, points[1:]))
@@ -0,0 +1,62 @@
+import pytest
+from module.comparison import DataStructureComparison
+from module.lazy_records import LazyRecordStore
+
+CSV = (
+    '﻿Index,Score,Active,Name,Rate\r\n'
+    '1,10,True,"Smith, Ann",1\r\n'
+    '2,,False,,2.5\r\n'
+    '\r\n'
+    '3,30,true,c,\r\n'
+)
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(CSV.encode('utf-8'))
+    return str(path)
+
+def test_scan_and_get(csv_path):
+    store = LazyRecordStore(csv_path)
+    keys, offsets = store.scan()
+    assert store.fields == ["Index", "Score", "Active", "Name", "Rate"]
+    assert keys == [1, 2, 3]
+    assert [store.get(offset) for offset in offsets] == [
+        {"Index": 1, "Score": 10, "Active": 1, "Name": "Smith, Ann", "Rate": 1.0},
+        # Empty cells are missing values and keep the column's type
+        {"Index": 2, "Score": None, "Active": 0, "Name": None, "Rate": 2.5},
+        {"Index": 3, "Score": 30, "Active": 1, "Name": "c", "Rate": None}
+    ]
+    store.close()
+
+def test_mixed_columns_become_text(tmp_path):
+    path = tmp_path / "mixed.csv"
+    path.write_text("Index,Code\n1,7\n2,A7\n")
+    store = LazyRecordStore(str(path))
+    _, offsets = store.scan()
+    assert [store.get(offset)["Code"] for offset in offsets] == ["7", "A7"]
+    store.close()
+
+def test_appended_records_do_not_collide_with_offsets(csv_path):
+    store = LazyRecordStore(csv_path)
+    _, offsets = store.scan()
+    record = {"Index": 4, "Score": 40, "Active": 0, "Name": "d", "Rate": 0.5}
+    row_id = store.append(record)
+    assert row_id >= store.size > max(offsets)
+    assert store.get(row_id) == record
+    assert store.get(row_id) is not store.get(row_id)
+    with pytest.raises(ValueError):
+        store.append({"Index": 5})
+    assert store.memory_usage()["added_records"] == 1
+    store.close()
+
+def test_comparison_close_releases_the_map(csv_path):
+    with DataStructureComparison(lazy=True) as comparison:
+        comparison.load_data(csv_path)
+        store = comparison.record_store
+        assert comparison.read_record(comparison.btree.search(2))["Rate"] == 2.5
+        # Loading again maps the file anew and releases the earlier map
+        comparison.load_data(csv_path)
+        assert store.mm.closed
+        store = comparison.record_store
+    assert store.mm.closed and store.file.closed
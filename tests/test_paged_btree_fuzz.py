@@ -0,0 +1,57 @@
+import random
+import pytest
+from module.paged_btree import PagedBTree
+from tests.helpers import check_btree, fuzz
+
+def contents(tree):
+    """Check the tree's invariants and return its (key, value) pairs in key order"""
+    pairs = []
+
+    def collect(node):
+        if node.leaf:
+            pairs.extend(zip(node.keys, (tree._load_value(ref) for ref in node.values)))
+            return
+        children = [tree._node(page_id) for page_id in node.children]
+        for i, child in enumerate(children):
+            collect(child)
+            if i < len(node.keys):
+                pairs.append((node.keys[i], tree._load_value(node.values[i])))
+
+    try:
+        root = tree._node(tree.root)
+        keys = check_btree(root, tree.t, lambda node: [tree._node(page_id) for page_id in node.children])
+        collect(root)
+    finally:
+        tree._release()
+    assert [key for key, _ in pairs] == keys
+    return pairs
+
+@pytest.mark.parametrize("t", [2, 4])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_dict_across_reopen(tmp_path, t, seed):
+    rng = random.Random(seed)
+    file_path = str(tmp_path / "tree.pbt")
+    reference = {}
+    # A small page cache forces evictions and write-backs during the run
+    tree = PagedBTree(file_path, page_size=256, cache_pages=8, t=t)
+    for _ in range(4):
+        fuzz(tree, reference, rng, 1000, range(400), contents)
+        assert contents(tree) == sorted(reference.items())
+        tree.close()
+        tree = PagedBTree(file_path, cache_pages=8)
+        assert tree.t == t
+        assert contents(tree) == sorted(reference.items())
+    for key in range(400):
+        assert tree.search(key) == reference.get(key)
+    tree.close()
+
+def test_bulk_load_then_reopen(tmp_path):
+    rng = random.Random(0)
+    file_path = str(tmp_path / "tree.pbt")
+    pairs = [(key, {"name": f"customer_{key}"}) for key in rng.sample(range(5000), 2000)]
+    tree = PagedBTree(file_path, page_size=512, cache_pages=16)
+    tree.bulk_load(sorted(pairs))
+    tree.close()
+    tree = PagedBTree(file_path, cache_pages=16)
+    assert contents(tree) == sorted(pairs)
+    tree.close()
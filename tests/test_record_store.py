@@ -0,0 +1,55 @@
+from array import array
+import pytest
+from module.record_store import ColumnarRecordStore
+
+FIELDS = ["Index", "Score", "City", "Email"]
+
+def columns(first, rows):
+    keys = list(range(first, first + rows))
+    return [keys, [key / 2 for key in keys], [f"city_{key % 3}" for key in keys],
+            [f"user{key}@example.com" for key in keys]]
+
+def test_typed_columns_and_round_trip():
+    store = ColumnarRecordStore(FIELDS)
+    assert list(store.extend_columns(columns(0, 100))) == list(range(100))
+    assert isinstance(store.columns[0], array) and store.columns[0].typecode == 'q'
+    assert isinstance(store.columns[1], array) and store.columns[1].typecode == 'd'
+    assert store.get(42) == {"Index": 42, "Score": 21.0, "City": "city_0", "Email": "user42@example.com"}
+
+def test_later_chunks_stay_typed_or_fall_back_to_lists():
+    store = ColumnarRecordStore(FIELDS)
+    store.extend_columns(columns(0, 10))
+    store.extend_columns(columns(10, 10))
+    assert store.columns[0].typecode == 'q' and len(store) == 20
+    chunk = columns(20, 2)
+    chunk[0] = [20, "not a number"]
+    store.extend_columns(chunk)
+    assert isinstance(store.columns[0], list)
+    assert [store.get(row)["Index"] for row in (0, 19, 20, 21)] == [0, 19, 20, "not a number"]
+
+def test_append_keeps_extras_per_row():
+    store = ColumnarRecordStore(FIELDS)
+    store.extend_columns(columns(0, 10))
+    record = dict(store.get(3), updated=True)
+    row_id = store.append(record)
+    assert row_id == 10
+    assert store.get(row_id) == record
+    assert "updated" not in store.get(3)
+    assert store.extras == {10: {"updated": True}}
+    # A value that doesn't fit a typed column turns it into a list
+    store.append(dict(record, Score="n/a"))
+    assert isinstance(store.columns[1], list) and store.get(11)["Score"] == "n/a"
+
+def test_missing_fields_rejected():
+    store = ColumnarRecordStore(FIELDS)
+    with pytest.raises(ValueError):
+        store.append({"Index": 1})
+
+def test_low_cardinality_columns_are_interned():
+    store = ColumnarRecordStore(FIELDS)
+    store.extend_columns(columns(0, 100))
+    cities = store.columns[2]
+    assert cities[0] is cities[3]
+    usage = store.memory_usage()
+    assert usage["pooled_columns"] == ["City"]
+    assert usage["saved_bytes"] == usage["dict_bytes"] - usage["columnar_bytes"] > 0
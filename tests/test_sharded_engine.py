@@ -0,0 +1,46 @@
+import random
+import pytest
+from module.sharded_engine import ShardedEngine
+
+@pytest.fixture
+def engine():
+    with ShardedEngine(shards=3, btree_degree=3) as engine:
+        yield engine
+
+def test_load_routes_each_key_to_its_shard(engine):
+    pairs = [(key, f"value_{key}") for key in range(300)]
+    counts = engine.load(pairs)
+    assert counts == [sum(engine.shard_of(key) == shard for key, _ in pairs) for shard in range(3)]
+    # Every key is found on the shard it hashes to
+    results = engine.execute('btree', [('search', key) for key, _ in pairs], batch_size=7)
+    assert results == [value for _, value in pairs]
+
+@pytest.mark.parametrize("structure", ['btree', 'array'])
+def test_mixed_operations_match_dict(engine, structure):
+    rng = random.Random(0)
+    reference = {key: f"value_{key}" for key in range(300)}
+    engine.load(list(reference.items()))
+    operations = []
+    expected = []
+    for _ in range(2000):
+        key = rng.randrange(400)
+        roll = rng.random()
+        if roll < 0.3:
+            operations.append(('search', key))
+            expected.append(reference.get(key))
+        elif roll < 0.5 and key not in reference:
+            operations.append(('insert', key, key))
+            expected.append(None)
+            reference[key] = key
+        elif roll < 0.8:
+            operations.append(('update', key, -key))
+            expected.append(key in reference)
+            if key in reference:
+                reference[key] = -key
+        else:
+            operations.append(('delete', key))
+            expected.append(key in reference)
+            reference.pop(key, None)
+    assert engine.execute(structure, operations, batch_size=50) == expected
+    assert engine.execute(structure, [('search', key) for key in range(400)]) == \
+        [reference.get(key) for key in range(400)]
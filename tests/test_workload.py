@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+import pytest
+from module.workload import KEY_CHOOSERS, WORKLOADS, HotspotChooser, ZipfianChooser, generate_workload
+
+KEYS = list(range(100, 1100))
+
+@pytest.mark.parametrize("distribution", list(KEY_CHOOSERS))
+@pytest.mark.parametrize("workload", list(WORKLOADS))
+def test_same_seed_same_stream(workload, distribution):
+    stream = generate_workload(KEYS, workload, distribution, 2000, seed=7)
+    assert stream == generate_workload(KEYS, workload, distribution, 2000, seed=7)
+    assert stream != generate_workload(KEYS, workload, distribution, 2000, seed=8)
+
+@pytest.mark.parametrize("distribution", list(KEY_CHOOSERS))
+def test_operations_only_target_live_keys(distribution):
+    mix = {'search': 0.3, 'update': 0.2, 'insert': 0.2, 'delete': 0.2, 'range': 0.1}
+    stream = generate_workload(KEYS, mix, distribution, 3000, seed=1)
+    live = set(KEYS)
+    for operation in stream:
+        kind, key = operation[0], operation[1]
+        if kind == 'insert':
+            assert key not in live and key > max(KEYS)
+            live.add(key)
+        else:
+            assert key in live
+            if kind == 'delete':
+                live.remove(key)
+            elif kind == 'range':
+                assert operation[2] in live and key <= operation[2]
+    assert set(Counter(operation[0] for operation in stream)) == set(mix)
+
+def test_mix_shares():
+    stream = generate_workload(KEYS, 'read_mostly', 'uniform', 20000, seed=0)
+    updates = sum(kind == 'update' for kind, _ in stream)
+    assert 0.04 < updates / len(stream) < 0.06
+
+def test_zipfian_is_skewed():
+    chooser = ZipfianChooser(1000, random.Random(0), scrambled=False)
+    counts = Counter(chooser.next(1000) for _ in range(20000))
+    assert counts[0] > counts[1] > counts[10] > counts[100]
+    assert all(0 <= index < 1000 for index in counts)
+
+def test_hotspot_share():
+    chooser = HotspotChooser(random.Random(0))
+    picks = [chooser.next(1000) for _ in range(20000)]
+    assert 0.78 < sum(pick < 200 for pick in picks) / len(picks) < 0.82
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        generate_workload(KEYS, distribution='unknown')
+    with pytest.raises(ValueError):
+        generate_workload([])
+    with pytest.raises(ValueError):
+        generate_workload([1, 2], {'delete': 1.0}, 'uniform', 3)